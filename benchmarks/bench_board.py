@@ -0,0 +1,82 @@
+"""Benchmark rendering the board pages, with and without the render caches.
+
+Each page is requested through Dash's HTTP endpoint, as a browser would
+when navigating, so the timings include serializing the response.
+
+Usage:
+    python benchmarks/bench_board.py                 # 1k and 5k tasks
+    python benchmarks/bench_board.py --sizes 500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_storage import make_document  # noqa: E402
+
+from todo import board  # noqa: E402
+from todo.live import ProjectStore  # noqa: E402
+
+PAGES = ["/", "/statistics", "/task/PROJ-001"]
+
+
+def page_request(pathname: str, limits: dict = None) -> dict:
+    """The callback request Dash sends when the URL changes to `pathname`"""
+    return {
+        "output": "page-content.children",
+        "outputs": {"id": "page-content", "property": "children"},
+        "inputs": [{"id": "url", "property": "pathname", "value": pathname}],
+        "state": [
+            {"id": "repeat-filter", "property": "value", "value": []},
+            {"id": "board-limits", "property": "data", "value": limits},
+        ],
+        "changedPropIds": ["url.pathname"],
+    }
+
+
+def render(client, pathname: str) -> float:
+    started = time.perf_counter()
+    response = client.post("/_dash-update-component", json=page_request(pathname))
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.data[:200]
+    return elapsed
+
+
+def measure(tasks, cached: bool, visits: int):
+    """(first, mean of the next visits) seconds per page, alternating between pages"""
+    sizes = (board.CARD_CACHE_SIZE, board.PAGE_CACHE_SIZE)
+    if not cached:
+        board.CARD_CACHE_SIZE = board.PAGE_CACHE_SIZE = 0
+    try:
+        client = board.create_app(ProjectStore(tasks)).server.test_client()
+    finally:
+        board.CARD_CACHE_SIZE, board.PAGE_CACHE_SIZE = sizes
+    client.get("/")
+    first = {page: render(client, page) for page in PAGES}
+    again = {page: 0.0 for page in PAGES}
+    for _ in range(visits):
+        for page in PAGES:
+            again[page] += render(client, page) / visits
+    return first, again
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 5_000])
+    arg_parser.add_argument("--visits", type=int, default=3, help="Visits of each page after the first")
+    args = arg_parser.parse_args()
+
+    print(f"{'tasks':>6}  {'page':<15} {'uncached':>9} {'first':>9} {'again':>9}")
+    for size in args.sizes:
+        tasks = make_document(size)["tasks"]
+        _, uncached = measure(tasks, cached=False, visits=args.visits)
+        first, again = measure(tasks, cached=True, visits=args.visits)
+        for page in PAGES:
+            print(f"{size:>6}  {page:<15} {uncached[page]:>8.3f}s {first[page]:>8.3f}s {again[page]:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
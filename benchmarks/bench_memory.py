@@ -0,0 +1,54 @@
+"""Benchmark the memory held by a loaded project: task dicts vs the compact model.
+
+Usage:
+    python benchmarks/bench_memory.py                 # 1k, 10k and 50k tasks
+    python benchmarks/bench_memory.py --sizes 1000 5000
+"""
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_storage import best_of, make_document  # noqa: E402
+
+from todo import model, storage  # noqa: E402
+
+
+def held(build):
+    """(result, bytes allocated by build() and still held once it returns)"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = arg_parser.parse_args()
+
+    print(f"{'tasks':>8} {'sessions':>9} {'dicts':>9} {'model':>9} {'saved':>6} {'convert':>9}")
+    for size in args.sizes:
+        # Loaded from YAML, as the board gets them, so that strings are not shared the way make_document() shares them
+        text = storage.serialize(make_document(size))
+        tasks, dict_bytes = held(lambda: storage.parse(text)["tasks"])
+        # The dicts are dropped once converted: only the model is held
+        compact, model_bytes = held(lambda: model.load_tasks(storage.parse(text)["tasks"]))
+        assert model.dump_tasks(compact) == tasks
+        sessions = sum(len(task["work_sessions"]) for task in tasks)
+        convert = best_of(1, lambda: model.load_tasks(tasks))
+        print(
+            f"{size:>8} {sessions:>9} {dict_bytes / 1e6:>7.1f}MB {model_bytes / 1e6:>7.1f}MB"
+            f" {1 - model_bytes / dict_bytes:>6.0%} {convert:>8.3f}s"
+        )
+        del tasks, compact
+
+if __name__ == "__main__":
+    main()
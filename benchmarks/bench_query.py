@@ -0,0 +1,59 @@
+"""Benchmark `todo list --sort`: comparing parsed dates at every step against precomputed keys and top-k selection.
+
+Usage:
+    python benchmarks/bench_query.py                 # 1k, 10k and 100k tasks
+    python benchmarks/bench_query.py --sizes 5000
+"""
+
+import argparse
+import sys
+from functools import cmp_to_key
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_storage import best_of, make_document  # noqa: E402
+from dateutil import parser  # noqa: E402
+
+from todo import query  # noqa: E402
+
+PRIORITY_ORDER = {"high": 0, "medium": 1, "low": 2}
+
+
+def compare(first: dict, second: dict) -> int:
+    """The naive comparison: due dates are parsed again at every comparison"""
+    first_due = parser.parse(first["due_date"]) if first.get("due_date") else None
+    second_due = parser.parse(second["due_date"]) if second.get("due_date") else None
+    if first_due != second_due:
+        if first_due is None or second_due is None:
+            return -1 if second_due is None else 1
+        return -1 if first_due < second_due else 1
+    return PRIORITY_ORDER[first["priority"]] - PRIORITY_ORDER[second["priority"]]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    arg_parser.add_argument("--limit", type=int, default=20, help="Page size of the limited query")
+    arg_parser.add_argument(
+        "--naive-max", type=int, default=10_000, help="Largest size to run the (very slow) naive sort on"
+    )
+    args = arg_parser.parse_args()
+
+    fields = query.parse_sort("due,priority")
+    print(f"{'tasks':>8}  {'naive sort':>11}  {'keyed sort':>11}  {'top-k':>9}")
+    for size in args.sizes:
+        tasks = make_document(size)["tasks"]
+        naive = None
+        if size <= args.naive_max:
+            naive = best_of(1, lambda: sorted(tasks, key=cmp_to_key(compare))[:args.limit])
+        keyed = best_of(args.repeat, lambda: query.select(tasks, fields))
+        top = best_of(args.repeat, lambda: query.select(tasks, fields, args.limit))
+        assert query.select(tasks, fields, args.limit) == query.select(tasks, fields)[:args.limit]
+        naive_text = f"{naive * 1000:>9.1f}ms" if naive is not None else f"{'-':>11}"
+        print(f"{size:>8}  {naive_text}  {keyed * 1000:>9.1f}ms  {top * 1000:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
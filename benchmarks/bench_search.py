@@ -0,0 +1,112 @@
+"""Benchmark `todo search`: scanning every task against the inverted and trigram indexes.
+
+Tasks get Zipf-distributed text drawn from a few thousand words, so that,
+as in real notes, a handful of words are everywhere and most are rare.
+
+Usage:
+    python benchmarks/bench_search.py                 # 1k, 10k and 100k tasks
+    python benchmarks/bench_search.py --sizes 5000
+"""
+
+import argparse
+import itertools
+import pickle
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_storage import best_of, make_document  # noqa: E402
+
+from todo import search, trigram  # noqa: E402
+
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "to", "vi", "de", "po", "qua", "zen"]
+VOCABULARY = ["".join(parts) for parts in itertools.product(SYLLABLES, repeat=3)]
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choices(VOCABULARY, weights=WEIGHTS, k=count))
+
+
+def make_notes_document(size: int) -> dict:
+    """make_document() with realistic titles, descriptions and multi-year notes"""
+    rng = random.Random(size)
+    document = make_document(size)
+    for task in document["tasks"]:
+        task["title"] = words(rng, 6)
+        task["description"] = words(rng, 30)
+        task["notes"] = [words(rng, 25) for _ in range(rng.randint(0, 8))]
+    return document
+
+
+def substring_scan(document: dict, query: str) -> list:
+    """The search done before the index: every field of every task, on every query"""
+    query = query.lower()
+    return [
+        task for task in document["tasks"]
+        if query in (task.get("title") or "").lower()
+        or query in (task.get("description") or "").lower()
+        or any(query in (note or "").lower() for note in task.get("notes", []))
+    ]
+
+
+def fuzzy_scan(document: dict, query: str) -> list:
+    """Fuzzy search without an index: every word of every task is compared with the query"""
+    words = search.tokenize(query)
+    matches = []
+    for task in document["tasks"]:
+        task_words = set(search.tokenize(task["title"]) + search.tokenize(task["description"]))
+        for note in task["notes"]:
+            task_words.update(search.tokenize(note))
+        score = sum(max((trigram.similarity(w, t) for t in task_words), default=0) for w in words) / len(words)
+        if score >= trigram.THRESHOLD:
+            matches.append((score, task["task_id"]))
+    return sorted(matches, reverse=True)[:20]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    args = arg_parser.parse_args()
+
+    queries = [
+        VOCABULARY[3],                                    # very common word
+        VOCABULARY[200],                                  # average word
+        f"{VOCABULARY[40]} {VOCABULARY[900]}",            # two words
+        f'"{VOCABULARY[0]} {VOCABULARY[1]}"',             # phrase of common words
+        VOCABULARY[1000][:4] + "*",                       # prefix
+    ]
+    print(f"{'tasks':>8}  {'build':>8} {'load':>8}  {'query':<16} {'scan':>9} {'index':>9}")
+    for size in args.sizes:
+        document = make_notes_document(size)
+        tasks = {task["task_id"]: task for task in document["tasks"]}
+        build = best_of(1, lambda: search.INDEX.build(document))
+        state = search.INDEX.build(document)
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        load = best_of(args.repeat, lambda: pickle.loads(data))
+        for query in queries:
+            scan = best_of(args.repeat, lambda: substring_scan(document, query.strip('"*')))
+            indexed = best_of(args.repeat, lambda: search.search(state, query, 20, tasks.get))
+            print(
+                f"{size:>8}  {build:>7.3f}s {load:>7.3f}s  {query:<16} "
+                f"{scan * 1000:>7.2f}ms {indexed * 1000:>7.2f}ms"
+            )
+        build = best_of(1, lambda: trigram.INDEX.build(document))
+        state = trigram.INDEX.build(document)
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        load = best_of(args.repeat, lambda: pickle.loads(data))
+        query = VOCABULARY[300][:-1] + " " + VOCABULARY[20][1:]  # two typos
+        scan = best_of(1, lambda: fuzzy_scan(document, query))
+        indexed = best_of(args.repeat, lambda: trigram.fuzzy_search(state, query, 20))
+        label = f"~{query}"
+        print(
+            f"{size:>8}  {build:>7.3f}s {load:>7.3f}s  {label:<16} "
+            f"{scan * 1000:>7.2f}ms {indexed * 1000:>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the statistics of `todo status`: per-task loop against the columns index.
+
+Usage:
+    python benchmarks/bench_status.py                 # 1k, 10k and 100k tasks
+    python benchmarks/bench_status.py --sizes 5000
+"""
+
+import argparse
+import pickle
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_storage import best_of, make_document  # noqa: E402
+
+from todo import columns, stats  # noqa: E402
+
+
+def loop_stats(todos: dict) -> dict:
+    """The per-task loop `todo status` ran before the columnar engine"""
+    result = dict.fromkeys(
+        ["completed_tasks", "pending_tasks", "high_priority", "medium_priority", "low_priority",
+         "overdue_tasks", "due_today", "no_due_date", "total_work_time", "completed_work_time",
+         "pending_work_time", "interrupted_sessions", "total_sessions"],
+        0,
+    )
+    result["total_tasks"] = len(todos["tasks"])
+    now = datetime.now()
+    for task in todos["tasks"]:
+        if task.get("completed"):
+            result["completed_tasks"] += 1
+        elif task.get("status") == "cancelled":
+            continue
+        else:
+            result["pending_tasks"] += 1
+        result[f"{task['priority']}_priority"] += 1
+        if task.get("due_date"):
+            due_date = datetime.fromisoformat(task["due_date"])
+            if due_date.date() == now.date():
+                result["due_today"] += 1
+            elif due_date < now:
+                result["overdue_tasks"] += 1
+        else:
+            result["no_due_date"] += 1
+        if "work_sessions" in task:
+            worked = sum(session["duration"] for session in task["work_sessions"])
+            result["total_work_time"] += worked
+            if task.get("completed"):
+                result["completed_work_time"] += worked
+            else:
+                result["pending_work_time"] += worked
+            result["total_sessions"] += len(task["work_sessions"])
+            result["interrupted_sessions"] += sum(1 for s in task["work_sessions"] if s.get("interrupted", False))
+    return result
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    args = arg_parser.parse_args()
+
+    print(
+        f"{'tasks':>8}  {'loop':>9}  {'build':>9} {'load':>9} {'counters':>9} {'recount':>9} {'by type/tag/week':>17}"
+    )
+    for size in args.sizes:
+        document = make_document(size)
+        state = columns.INDEX.build(document)
+        assert stats.summarize(state) == loop_stats(document)
+        assert columns.summary(state) == loop_stats(document)
+        loop = best_of(args.repeat, lambda: loop_stats(document))
+        build = best_of(1, lambda: columns.INDEX.build(document))
+        data = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        load = best_of(args.repeat, lambda: pickle.loads(data))
+        counters = best_of(args.repeat, lambda: columns.summary(state))
+        recount = best_of(args.repeat, lambda: stats.summarize(state))
+        breakdowns = best_of(args.repeat, lambda: (stats.by_type(state), stats.by_tag(state), stats.by_week(state)))
+        print(
+            f"{size:>8}  {loop * 1000:>7.1f}ms  {build * 1000:>7.1f}ms {load * 1000:>7.1f}ms "
+            f"{counters * 1000:>7.2f}ms {recount * 1000:>7.1f}ms {breakdowns * 1000:>15.1f}ms"
+        )
+
+if __name__ == "__main__":
+    main()
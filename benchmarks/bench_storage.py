@@ -0,0 +1,89 @@
+"""Benchmark loading and saving todo.yaml with the pure-Python and libyaml codecs.
+
+Usage:
+    python benchmarks/bench_storage.py                 # 1k, 10k and 100k tasks
+    python benchmarks/bench_storage.py --sizes 1000 5000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import yaml
+
+from todo import storage
+
+WORDS = "fix update refactor parser board cache review deploy docs test release api".split()
+
+
+def make_document(size: int) -> dict:
+    """Build a project with `size` tasks shaped like long-lived real projects"""
+    rng = random.Random(size)
+    start = datetime(2022, 1, 1)
+    tasks = []
+    for number in range(1, size + 1):
+        created = start + timedelta(hours=rng.randint(0, 24 * 900))
+        tasks.append({
+            "task_id": f"PROJ-{number:03d}",
+            "title": " ".join(rng.choices(WORDS, k=5)),
+            "description": " ".join(rng.choices(WORDS, k=20)),
+            "type": rng.choice(["feature", "bugfix", "docs", "test", "refactor", "chore"]),
+            "priority": rng.choice(["low", "medium", "high"]),
+            "created_at": created.isoformat(),
+            "due_date": (created + timedelta(days=14)).isoformat() if rng.random() < 0.5 else None,
+            "completed": rng.random() < 0.4,
+            "work_sessions": [
+                {
+                    "started_at": (created + timedelta(days=day)).isoformat(),
+                    "duration": 25,
+                    "interrupted": rng.random() < 0.2,
+                }
+                for day in range(rng.randint(0, 6))
+            ],
+            "notes": [" ".join(rng.choices(WORDS, k=12)) for _ in range(rng.randint(0, 3))],
+            "tags": rng.sample(WORDS, k=2),
+            "status": "pending",
+            "status_history": [{"status": "pending", "timestamp": created.isoformat()}],
+            "repeat": None,
+        })
+    return {
+        "project": {"name": "Bench", "description": "Benchmark", "prefix": "PROJ", "next_task_number": size + 1},
+        "tasks": tasks,
+    }
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    args = arg_parser.parse_args()
+
+    codecs = [("pure-python", storage.PURE_LOADER, storage.PURE_DUMPER)]
+    if yaml.__with_libyaml__:
+        codecs.append(("libyaml", storage.LOADER, storage.DUMPER))
+    else:
+        print("PyYAML was built without libyaml: only the pure-Python codec is measured")
+
+    print(f"{'tasks':>8}  {'codec':<12} {'size':>9} {'load':>9} {'save':>9}")
+    for size in args.sizes:
+        document = make_document(size)
+        text = storage.serialize(document, dumper=storage.PURE_DUMPER)
+        repeat = args.repeat if size <= 10_000 else 1
+        for name, loader, dumper in codecs:
+            load = best_of(repeat, lambda: storage.parse(text, loader=loader))
+            save = best_of(repeat, lambda: storage.serialize(document, dumper=dumper))
+            print(f"{size:>8}  {name:<12} {len(text) / 1e6:>7.1f}MB {load:>8.3f}s {save:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
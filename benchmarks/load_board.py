@@ -0,0 +1,137 @@
+"""Load-test the board: requests per second for the board, statistics and task pages.
+
+Each page is requested as a browser does when navigating to it (a POST to
+Dash's callback endpoint), by `--concurrency` clients over keep-alive
+connections, for `--duration` seconds per page.
+
+Without --url, the board of a generated project (--tasks) is served on a
+free port by the production server of `todo board --serve`, with
+--workers threads. With --url, an already running board is measured:
+
+    todo board --serve --workers 16 --no-browser &
+    python benchmarks/load_board.py --url http://127.0.0.1:8050 --task-id PROJ-001
+
+Usage:
+    python benchmarks/load_board.py                          # 5k tasks, 8 threads, 8 clients
+    python benchmarks/load_board.py --tasks 1000 --workers 4 --concurrency 16 --duration 10
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_board import page_request  # noqa: E402
+from bench_storage import make_document  # noqa: E402
+
+
+def wait_ready(host: str, port: int, timeout: float = 30.0):
+    """Wait until /readyz answers 200"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            connection = http.client.HTTPConnection(host, port, timeout=5)
+            connection.request("GET", "/readyz")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise SystemExit(f"The board at {host}:{port} is not ready")
+        time.sleep(0.2)
+
+
+def client(host: str, port: int, body: bytes, until: float, latencies: list, errors: list):
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    headers = {"Content-Type": "application/json"}
+    while time.monotonic() < until:
+        started = time.perf_counter()
+        try:
+            connection.request("POST", "/_dash-update-component", body, headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=60)
+            continue
+        if response.status == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(response.status)
+    connection.close()
+
+
+def load(host: str, port: int, pathname: str, concurrency: int, duration: float):
+    """(requests per second, median and 95th percentile latency in seconds, errors) for one page"""
+    body = json.dumps(page_request(pathname)).encode()
+    latencies, errors = [], []
+    started = time.monotonic()
+    threads = [
+        threading.Thread(target=client, args=(host, port, body, started + duration, latencies, errors))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    latencies.sort()
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else float("nan")
+
+    return len(latencies) / elapsed, percentile(0.5), percentile(0.95), len(errors)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--url", help="A running board to measure, e.g. http://127.0.0.1:8050")
+    arg_parser.add_argument("--tasks", type=int, default=5_000, help="Tasks of the generated project (without --url)")
+    arg_parser.add_argument("--workers", type=int, default=8, help="Server threads (without --url)")
+    arg_parser.add_argument("--task-id", default="PROJ-001", help="Task whose page is measured")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    arg_parser.add_argument("--duration", type=float, default=5.0, help="Seconds per page")
+    args = arg_parser.parse_args()
+
+    server = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        from todo import board
+        from todo.live import ProjectStore
+
+        app = board.create_app(ProjectStore(make_document(args.tasks)["tasks"]))
+        server = board.make_server(app, "127.0.0.1", 0, args.workers)
+        # Waitress warns whenever requests wait for a thread, which they do here by design
+        logging.getLogger("waitress.queue").setLevel(logging.ERROR)
+        threading.Thread(target=server.run, daemon=True).start()
+        host, port = "127.0.0.1", server.effective_port
+    wait_ready(host, port)
+
+    print(f"{'page':<15} {'req/s':>8} {'p50':>9} {'p95':>9} {'errors':>7}")
+    try:
+        for pathname in ["/", "/statistics", f"/task/{args.task_id}"]:
+            # One request first, so the page is measured as visitors after the first see it
+            warm_up = http.client.HTTPConnection(host, port, timeout=60)
+            warm_up.request("POST", "/_dash-update-component", json.dumps(page_request(pathname)),
+                            {"Content-Type": "application/json"})
+            warm_up.getresponse().read()
+            warm_up.close()
+            rate, p50, p95, errors = load(host, port, pathname, args.concurrency, args.duration)
+            print(f"{pathname:<15} {rate:>8.1f} {p50 * 1000:>7.1f}ms {p95 * 1000:>7.1f}ms {errors:>7}")
+    finally:
+        if server is not None:
+            server.close()
+
+
+if __name__ == "__main__":
+    main()
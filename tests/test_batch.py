@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import storage
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+ADD_INPUT = "Batch Task\nDesc\nfeature\nhigh\n\n\n\n\n"
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    yield temp_dir
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def init_project(*options):
+    runner.invoke(app, ["init", *options], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input=ADD_INPUT)
+
+
+def test_batch_applies_all_operations_with_one_save(monkeypatch):
+    init_project()
+    saves = []
+    save_document = storage.save_document
+    monkeypatch.setattr(storage, "save_document", lambda *args: saves.append(args) or save_document(*args))
+    ops = "\n".join([
+        "# set up the task",
+        "update status PX-001 doing",
+        'todo note add PX-001 "Started it"',
+        "update tag add PX-001 infra",
+        json.dumps({"args": ["add"], "input": "Second\n\nbugfix\nlow\n\n\n\n\n"}),
+        json.dumps(["complete", "px-002"]),
+    ])
+    result = runner.invoke(app, ["batch"], input=ops)
+    assert result.exit_code == 0, result.stdout
+    assert "Applied 5 operations" in result.stdout
+    assert len(saves) == 1
+    first, second = load_todos()["tasks"]
+    assert first["status"] == "doing"
+    assert first["notes"] == ["Started it"]
+    assert first["tags"] == ["infra"]
+    assert second["completed"] is True
+
+
+def test_batch_rolls_back_on_failure():
+    init_project()
+    before = Path("todo.yaml").read_bytes()
+    Path("ops.txt").write_text("complete PX-001\ncomplete PX-404\nnote add PX-001 never\n")
+    result = runner.invoke(app, ["batch", "ops.txt"])
+    assert result.exit_code == 1
+    assert "failed" in result.stdout
+    assert "skipped" in result.stdout
+    assert "rolled back" in result.stdout
+    assert Path("todo.yaml").read_bytes() == before
+
+
+def test_batch_on_sqlite_backend_saves_at_the_end():
+    init_project("--backend", "sqlite")
+    result = runner.invoke(app, ["batch"], input="complete PX-001\nupdate priority PX-001 low\nadd\n")
+    assert result.exit_code == 1
+    task = load_todos()["tasks"][0]
+    assert task["completed"] is False
+    assert task["priority"] == "high"
+
+
+def test_batch_refuses_long_running_and_rewriting_commands():
+    init_project()
+    before = Path("todo.yaml").read_bytes()
+    for command in ["compact", "daemon start"]:
+        Path("ops.txt").write_text(f"{command}\n")
+        result = runner.invoke(app, ["batch", "ops.txt"])
+        assert result.exit_code == 1
+        assert "cannot be used in a batch" in result.stdout
+    assert Path("todo.yaml").read_bytes() == before
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes
+from todo.cli import app
+from todo.live import ProjectStore
+from todo.lru import LRUCache
+
+runner = CliRunner()
+
+board = pytest.importorskip("todo.board")
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def render(client, pathname, limits=None):
+    response = client.post("/_dash-update-component", json={
+        "output": "page-content.children",
+        "outputs": {"id": "page-content", "property": "children"},
+        "inputs": [{"id": "url", "property": "pathname", "value": pathname}],
+        "state": [
+            {"id": "repeat-filter", "property": "value", "value": []},
+            {"id": "board-limits", "property": "data", "value": limits},
+        ],
+        "changedPropIds": ["url.pathname"],
+    })
+    assert response.status_code == 200
+    return response.get_data(as_text=True)
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None and len(cache) == 2
+    cache.prune(lambda key, value: value != 3)
+    assert cache.get("c") is None and cache.get("a") == 1
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_pages_are_cached_until_tasks_change(monkeypatch):
+    runner.invoke(app, ["init", "--journal"], input="Proj\nDesc\nPX\n")
+    for title in ["First", "Second"]:
+        runner.invoke(app, ["add"], input=f"{title}\n\nfeature\nhigh\n\n\n\n\n")
+    made = []
+    monkeypatch.setattr(board.dbc, "Card", lambda *args, **kwargs: made.append(1) or board.html.Div(*args))
+    store = ProjectStore.open(Path("todo.yaml"))
+    client = board.create_app(store).server.test_client()
+
+    page = render(client, "/")
+    assert "First" in page and "Second" in page
+    cards = len(made)
+    statistics = render(client, "/statistics")
+    assert render(client, "/") == page and render(client, "/statistics") == statistics
+    # The statistics cards were built once, and only the summary card of the board again
+    assert len(made) == cards + 5 + 1
+
+    runner.invoke(app, ["update", "title", "PX-002", "Renamed"])
+    store.refresh()
+    made.clear()
+    page = render(client, "/")
+    assert "Renamed" in page and "First" in page
+    assert len(made) == 2  # the summary and the renamed task's card
+    render(client, "/statistics")
+    assert len(made) == 2 + 5
+    store.stop()
+
+
+def test_columns_show_a_page_of_cards():
+    store = ProjectStore([
+        {"task_id": f"PX-{n:03d}", "title": f"Task {n}", "type": "feature", "priority": "medium",
+         "status": "pending", "completed": n > 120, "created_at": "2024-01-01 09:00"}
+        for n in range(1, 131)
+    ])
+    client = board.create_app(store).server.test_client()
+    page = render(client, "/")
+    assert "Pending (120)" in page and "Completed (10)" in page
+    assert "Task 50" in page and "Task 51" not in page and "Task 125" not in page
+    assert "Load more (70 more)" in page
+
+    limits = {"Pending": 100, "Doing": 50, "Completed": 50, "Cancelled": 0}
+    page = render(client, "/", limits)
+    assert "Task 100" in page and "Task 101" not in page and "Task 125" in page
+    assert "Load more (20 more)" in page
+
+
+def test_health_and_readiness():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="First\n\nfeature\nhigh\n\n\n\n\n")
+    # Not loaded yet, as when the project was locked at startup
+    store = ProjectStore([], Path("todo.yaml"))
+    client = board.create_app(store).server.test_client()
+    assert client.get("/healthz").get_json() == {"status": "ok"}
+    assert client.get("/readyz").status_code == 503
+    store.refresh()
+    response = client.get("/readyz")
+    assert response.status_code == 200 and response.get_json()["tasks"] == 1
+    store.stop()
@@ -1,5 +1,7 @@
 import os
 import shutil
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
@@ -99,3 +101,29 @@ def test_save_and_load_empty_todos(temp_todo_dir):
     loaded = load_todos()
     assert loaded["project"]["name"] == ""
     assert loaded["tasks"] == []
+
+def test_cli_import_skips_heavy_modules():
+    """Test that importing the CLI does not load Dash, Plotly, pandas, dateparser, SQLite or the indexes"""
+    code = (
+        "import sys, todo.cli; "
+        "print(','.join(m for m in ('dash', 'plotly', 'pandas', 'dateparser', 'sqlite3', 'todo.indexes')"
+        " if m in sys.modules))"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+def test_status_reads_counters_without_numpy(temp_todo_dir):
+    """Test that status only loads NumPy for --by and --verify"""
+    save_todos({"project": {"name": "Proj", "description": "", "prefix": "PX", "next_task_number": 1}, "tasks": []})
+    code = (
+        "import sys; from typer.testing import CliRunner; from todo.cli import app; "
+        "result = CliRunner().invoke(app, sys.argv[1:]); "
+        "print(result.exit_code, 'numpy' in sys.modules)"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent), TODO_NO_DAEMON="1")
+    for arguments, expected in [(["status"], "0 False"), (["status", "--by", "type"], "0 True")]:
+        result = subprocess.run([sys.executable, "-c", code, *arguments], capture_output=True, text=True, env=env)
+        assert result.stdout.strip().splitlines()[-1] == expected, result.stderr
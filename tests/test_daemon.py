@@ -0,0 +1,113 @@
+import io
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import client, daemon
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+ADD_INPUT = "Daemon Task\nDesc\nfeature\nhigh\n\n\n\n\n"
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input=ADD_INPUT)
+    yield temp_dir
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def test_daemon_runs_commands_and_saves_changes():
+    server = daemon.Daemon(Path("todo.yaml"))
+    response = server.handle({"argv": ["note", "add", "px-001", "From the daemon"]})
+    assert response["exit_code"] == 0
+    assert "Added new note" in response["output"]
+    assert load_todos()["tasks"][0]["notes"] == ["From the daemon"]
+
+    response = server.handle({"argv": ["complete", "PX-404"]})
+    assert response["exit_code"] == 1
+    assert "not found" in response["output"]
+
+
+def test_daemon_reloads_after_external_edit():
+    server = daemon.Daemon(Path("todo.yaml"))
+    server.handle({"argv": ["list"]})
+    runner.invoke(app, ["update", "title", "PX-001", "Edited elsewhere"])
+    response = server.handle({"argv": ["show", "PX-001"]})
+    assert "Edited elsewhere" in response["output"]
+
+
+def test_daemon_hands_interactive_commands_back_to_the_client():
+    server = daemon.Daemon(Path("todo.yaml"))
+    assert server.handle({"argv": ["workon", "PX-001"]}) == {"retry_local": True}
+    # add prompts for its fields: without answers it must run locally
+    assert server.handle({"argv": ["add"]}) == {"retry_local": True}
+    assert len(load_todos()["tasks"]) == 1
+
+
+def test_client_leaves_stdin_to_commands_that_read_it(monkeypatch):
+    os.makedirs(".todo", exist_ok=True)
+    open(client.SOCKET_PATH, "w").close()
+    monkeypatch.delenv("TODO_NO_DAEMON", raising=False)
+    monkeypatch.setattr(sys, "argv", ["todo", "complete", "PX-001"])
+    monkeypatch.setattr(sys, "stdin", io.StringIO("PX-002\nPX-003\n"))
+    sent = []
+    monkeypatch.setattr(client, "request", lambda message: sent.append(message) or {"output": "", "exit_code": 0})
+    with pytest.raises(SystemExit):
+        client.main()
+    # A loop reading ids from the same stdin still gets the next ones
+    assert "stdin" not in sent[0] and sys.stdin.read() == "PX-002\nPX-003\n"
+
+    # A command handed back runs here, with the stdin untouched
+    sys.stdin.seek(0)
+    read = []
+    monkeypatch.setattr(client, "request", lambda message: {"retry_local": True})
+    monkeypatch.setattr(client, "run_local", lambda: read.append(sys.stdin.read()))
+    client.main()
+    assert read == ["PX-002\nPX-003\n"]
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+def test_client_talks_to_daemon_over_socket():
+    server = daemon.Daemon(Path("todo.yaml"))
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon.ping(Path("todo.yaml")):
+            break
+        time.sleep(0.02)
+    response = client.request({"argv": ["show", "PX-001"]})
+    assert response["exit_code"] == 0
+    assert "Daemon Task" in response["output"]
+    assert daemon.stop(Path("todo.yaml"))
+    thread.join(timeout=5)
+    assert not daemon.socket_file(Path("todo.yaml")).exists()
+
+
+def test_client_import_is_light():
+    root = Path(__file__).resolve().parent.parent
+    code = "import sys, todo.client; print(','.join(m for m in ('typer', 'rich', 'yaml') if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(root)},
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
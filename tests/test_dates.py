@@ -0,0 +1,16 @@
+from datetime import date, datetime
+
+from todo import dates
+
+
+def test_parse_timestamps():
+    assert dates.parse("2025-06-11T23:59:59") == datetime(2025, 6, 11, 23, 59, 59)
+    assert dates.parse("2025-06-11T08:30:00.250000") == datetime(2025, 6, 11, 8, 30, 0, 250000)
+    # Not ISO: the generic parser takes over
+    assert dates.parse("June 11, 2025 5pm") == datetime(2025, 6, 11, 17, 0)
+    assert dates.parse(date(2025, 6, 11)) == datetime(2025, 6, 11)
+    assert dates.parse("not a date") is None
+    assert dates.parse("") is None and dates.parse(None) is None
+    task = {"due_date": "2025-06-11T23:59:59", "created_at": None}
+    assert dates.field(task, "due_date") is dates.field(task, "due_date")
+    assert dates.field(task, "created_at") is None
@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import filters, indexes, sqlite_store
+from todo.cli import app
+
+runner = CliRunner()
+
+NOW = datetime(2025, 6, 11, 12, 0)
+
+TASKS = [
+    {"task_id": "PX-001", "title": "Deploy API", "type": "bugfix", "priority": "high", "completed": False,
+     "status": "doing", "due_date": "2025-06-11T23:59:59", "created_at": "2025-06-01T09:00:00",
+     "tags": ["ops", "api"], "notes": ["a"], "work_sessions": [{"duration": 100}, {"duration": 30}]},
+    {"task_id": "PX-002", "title": "Write tests", "type": "test", "priority": "medium", "completed": True,
+     "status": "completed", "due_date": "2025-06-20T23:59:59", "created_at": "2025-05-01T09:00:00",
+     "tags": ["api"], "notes": [], "work_sessions": [{"duration": 45}]},
+    {"task_id": "PX-003", "title": "Docs", "type": "docs", "priority": "low", "completed": False,
+     "status": "cancelled", "due_date": None, "created_at": "2025-06-10T09:00:00",
+     "tags": [], "notes": [], "work_sessions": []},
+    {"task_id": "PX-004", "title": "Refactor parser", "type": "refactor", "priority": "high", "completed": False,
+     "status": "pending", "due_date": "2025-06-01T23:59:59", "created_at": None,
+     "tags": ["blocked"], "notes": ["b", "c"], "work_sessions": [{"duration": 20}]},
+]
+
+EXPRESSIONS = {
+    "priority=high and due<+7d and type in (bugfix,test) and worked>2h": ["PX-001"],
+    "priority>=medium": ["PX-001", "PX-002", "PX-004"],
+    "due=today": ["PX-001"],
+    "due!=today": ["PX-002", "PX-004"],
+    "due=none or created<2025-06-01": ["PX-002", "PX-003"],
+    "due in (2025-06-01, 2025-06-20)": ["PX-002", "PX-004"],
+    "created>=-2d": ["PX-003"],
+    "tag=api and not tag=ops": ["PX-002"],
+    "tag!=api": ["PX-003", "PX-004"],
+    "tag in (ops, blocked) or title~'write'": ["PX-001", "PX-002", "PX-004"],
+    "status in (doing, pending)": ["PX-001", "PX-004"],
+    "title!~docs and notes>=1 and sessions=1": ["PX-004"],
+    "id=px-003 or (worked<=45 and worked>0)": ["PX-002", "PX-003", "PX-004"],
+    "not (priority=low or due<today)": ["PX-001", "PX-002"],
+}
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def test_predicate_and_sql_agree():
+    database = Path("todo.db")
+    sqlite_store.save(database, {"project": {}, "tasks": TASKS})
+    for expression, expected in EXPRESSIONS.items():
+        tree = filters.parse(expression)
+        check = filters.predicate(tree, NOW)
+        assert [task["task_id"] for task in TASKS if check(task)] == expected, expression
+        condition, params = filters.to_sql(tree, NOW)
+        found = sqlite_store.query_tasks(database, where=condition, where_params=params)
+        assert [task["task_id"] for task in found] == expected, expression
+
+
+def test_parse_errors_and_tag_planning():
+    for expression in ["size>3", "priority=urgent", "worked>2x", "due<someday", "tag=a and", "(tag=a", "tag<a"]:
+        with pytest.raises(ValueError):
+            filters.parse(expression)
+    query, rest = filters.tag_query(filters.parse("tag=api and not tag=ops and worked>1h"))
+    assert query == "(api) & !(ops)"
+    assert rest == ("cmp", "worked", ">", ["1h"])
+    assert filters.tag_query(filters.parse("tag=api or worked>1h")) == (
+        None, filters.parse("tag=api or worked>1h")
+    )
+
+
+@pytest.mark.parametrize("backend", ["yaml", "sqlite"])
+def test_list_where_command(backend):
+    runner.invoke(app, ["init", "--backend", backend], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="Deploy\n\nbugfix\nhigh\n\n\nops, api\n\n")
+    runner.invoke(app, ["add"], input="Docs\n\ndocs\nlow\n\n\napi\n\n")
+    runner.invoke(app, ["add"], input="Tests\n\ntest\nhigh\n\n\n\n\n")
+    result = runner.invoke(app, ["list", "--where", "tag=api and priority=high", "--format", "csv"])
+    assert [line.split(",")[0] for line in result.stdout.splitlines()] == ["task_id", "PX-001"]
+    result = runner.invoke(app, ["list", "--where", "priority=high", "--tag", "!ops", "--format", "csv"])
+    assert [line.split(",")[0] for line in result.stdout.splitlines()] == ["task_id", "PX-003"]
+    runner.invoke(app, ["complete", "PX-003"])
+    result = runner.invoke(app, ["list", "-w", "priority=high and not tag=ops"])
+    assert "No tasks found" in result.stdout
+    result = runner.invoke(app, ["list", "-a", "-w", "priority=high and not tag=ops"])
+    assert "PX-003" in result.stdout
+    result = runner.invoke(app, ["list", "--where", "priority=urgent"])
+    assert result.exit_code == 1
+    assert "Invalid filter" in result.stdout
+
+
+def test_dates_compare_as_moments_on_both_backends():
+    """Dates alone, other separators and timezones are normalized by the SQL condition too"""
+    due_dates = ["2025-06-11T20:30:00-05:00", "2025-06-11", "2025-06-11 08:00:00", "2025-06-11T23:30:00+02:00",
+                 "not a date", None]
+    tasks = [
+        {"task_id": f"PX-{number:03d}", "title": "Task", "type": "feature", "priority": "low", "completed": False,
+         "status": "pending", "due_date": due_date, "created_at": None, "tags": [], "notes": [], "work_sessions": []}
+        for number, due_date in enumerate(due_dates, 1)
+    ]
+    database = Path("todo.db")
+    sqlite_store.save(database, {"project": {}, "tasks": tasks})
+    expressions = {
+        "due=2025-06-12": ["PX-001"],
+        "due=today": ["PX-002", "PX-003", "PX-004"],
+        "due<now": ["PX-002", "PX-003"],
+        "due>=+9h": ["PX-001", "PX-004"],
+        "due=none": ["PX-005", "PX-006"],
+    }
+    for expression, expected in expressions.items():
+        tree = filters.parse(expression)
+        check = filters.predicate(tree, NOW)
+        assert [task["task_id"] for task in tasks if check(task)] == expected, expression
+        condition, params = filters.to_sql(tree, NOW)
+        found = sqlite_store.query_tasks(database, where=condition, where_params=params)
+        assert [task["task_id"] for task in found] == expected, expression
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import journal, storage
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+ADD_INPUT = "Journal Task\nDesc\nfeature\nhigh\n\n\n\n\n"
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    yield temp_dir
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def init_journal_project():
+    runner.invoke(app, ["init", "--journal"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input=ADD_INPUT)
+
+
+def test_journal_mode_appends_instead_of_rewriting():
+    init_journal_project()
+    before = Path("todo.yaml").read_bytes()
+    result = runner.invoke(app, ["note", "add", "PX-001", "First note"])
+    assert result.exit_code == 0
+    runner.invoke(app, ["update", "priority", "PX-001", "low"])
+    assert Path("todo.yaml").read_bytes() == before
+    assert len(journal.read_records(Path("todo.journal"))) == 4
+    task = load_todos()["tasks"][0]
+    assert task["notes"] == ["First note"]
+    assert task["priority"] == "low"
+
+
+def test_compact_folds_journal_into_yaml():
+    init_journal_project()
+    runner.invoke(app, ["note", "add", "PX-001", "Folded note"])
+    result = runner.invoke(app, ["compact"])
+    assert result.exit_code == 0
+    assert not Path("todo.journal").exists()
+    assert "Folded note" in Path("todo.yaml").read_text()
+    assert load_todos()["tasks"][0]["notes"] == ["Folded note"]
+
+
+def test_interrupted_compaction_is_not_replayed_twice():
+    init_journal_project()
+    runner.invoke(app, ["note", "add", "PX-001", "Only once"])
+    todos = load_todos()
+    # Simulate a crash after todo.yaml was rewritten but before the journal was removed
+    data = storage.serialize(todos).encode("utf-8")
+    journal.mark_compacted(Path("todo.journal"), storage._digest(data))
+    Path("todo.yaml").write_bytes(data)
+    assert load_todos()["tasks"][0]["notes"] == ["Only once"]
+
+
+def test_append_after_interrupted_compaction():
+    init_journal_project()
+    runner.invoke(app, ["note", "add", "PX-001", "Only once"])
+    data = storage.serialize(load_todos()).encode("utf-8")
+    journal.mark_compacted(Path("todo.journal"), storage._digest(data))
+    Path("todo.yaml").write_bytes(data)
+    # The journal was left behind: the next change is appended after the marker
+    runner.invoke(app, ["add"], input=ADD_INPUT)
+    runner.invoke(app, ["note", "add", "PX-002", "Later"])
+    tasks = load_todos()["tasks"]
+    assert [task["task_id"] for task in tasks] == ["PX-001", "PX-002"]
+    assert tasks[0]["notes"] == ["Only once"] and tasks[1]["notes"] == ["Later"]
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, watch
+from todo.cli import app, load_todos
+from todo.live import ProjectStore
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def add(title):
+    runner.invoke(app, ["add"], input=f"{title}\n\nfeature\nhigh\n\n\n\n\n")
+
+
+def same_as_files(store):
+    return [task.to_dict() for task in store.tasks] == load_todos()["tasks"]
+
+
+def test_journal_changes_are_applied_incrementally():
+    runner.invoke(app, ["init", "--journal"], input="Proj\nDesc\nPX\n")
+    add("First")
+    add("Second")
+    store = ProjectStore.open(Path("todo.yaml"))
+    assert store.reloads == 1 and [task.title for task in store.tasks] == ["First", "Second"]
+    assert store.get("px-002").title == "Second"
+    assert not store.refresh()
+
+    runner.invoke(app, ["note", "add", "PX-001", "a note"])
+    runner.invoke(app, ["update", "status", "PX-002", "doing"])
+    add("Third")
+    assert store.refresh()
+    assert store.reloads == 1
+    assert store.get("PX-001").notes == ["a note"] and store.get("PX-002").status == "doing"
+    assert store.view.revision("PX-003") == store.version
+    runner.invoke(app, ["delete", "PX-001"], input="y\n")
+    assert store.refresh() and store.get("PX-001") is None
+    assert same_as_files(store)
+
+    # Compaction rewrites todo.yaml: reloaded, unchanged tasks keep their object and revision
+    runner.invoke(app, ["compact"])
+    revision = store.view.revision("PX-003")
+    third = store.get("PX-003")
+    store.refresh()
+    assert store.reloads == 2
+    assert store.get("PX-003") is third and store.view.revision("PX-003") == revision
+    assert same_as_files(store)
+
+
+def test_rewrites_reload_only_changed_tasks():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add("First")
+    add("Second")
+    store = ProjectStore.open(Path("todo.yaml"))
+    first = store.get("PX-001")
+    runner.invoke(app, ["update", "priority", "PX-002", "low"])
+    assert store.refresh()
+    assert store.get("PX-001") is first and store.view.revision("PX-001") == 1
+    assert store.get("PX-002").priority == "low" and store.view.revision("PX-002") == store.version == 2
+    assert same_as_files(store)
+
+
+def test_notifier_wakes_up_on_changes():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    notifier = watch.Notifier(watch.project_files(Path("todo.yaml")), interval=0.05)
+    try:
+        assert not notifier.wait(timeout=0.1)
+        Path("unrelated.txt").write_text("ignored")
+        assert not notifier.wait(timeout=0.1)
+        add("First")
+        assert notifier.wait(timeout=2)
+    finally:
+        notifier.close()
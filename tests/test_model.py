@@ -0,0 +1,63 @@
+from array import array
+
+from todo import model
+
+
+def sample_task():
+    return {
+        "task_id": "PROJ-001",
+        "title": "Write docs",
+        "type": "docs",
+        "priority": "high",
+        "created_at": "2025-06-01T09:00:00",
+        "due_date": None,
+        "completed": False,
+        "work_sessions": [
+            {"started_at": "2025-06-02T10:00:00", "duration": 25, "interrupted": False},
+            {"started_at": "2025-06-03T10:00:00.500000", "duration": 40, "interrupted": True},
+            # Edited by hand: kept as is
+            {"started_at": "June 4, 2025", "duration": "15", "interrupted": False},
+        ],
+        "notes": ["first draft"],
+        "tags": ["docs", "api"],
+        "status": "doing",
+        "status_history": [
+            {"status": "pending", "timestamp": "2025-06-01T09:00:00"},
+            {"status": "doing", "timestamp": "2025-06-02T10:00:00", "by": "cli"},
+            {"timestamp": "2025-06-02T10:00:00", "status": "doing"},
+        ],
+        "repeat": None,
+        "custom": {"kept": True},
+    }
+
+
+def test_task_round_trip():
+    data = sample_task()
+    task = model.Task.from_dict(data)
+    assert task.to_dict() == data
+    assert list(task.to_dict()) == list(data)
+    # Regular sessions are packed into arrays, the hand-edited one is not
+    sessions = task.work_sessions
+    assert sessions.start.typecode == "q" and isinstance(sessions.duration, array)
+    assert list(sessions.duration) == [25, 40, 0]
+    assert list(sessions.irregular) == [2]
+    assert sessions.total_duration() == 80 and sessions.interrupted_count() == 1
+    assert [session.started_at for session in sessions] == [
+        "2025-06-02T10:00:00", "2025-06-03T10:00:00.500000", "June 4, 2025",
+    ]
+    assert isinstance(task.status_history[1], model.StatusChange)
+    assert task.status_history[1].extra == {"by": "cli"}
+    assert isinstance(task.status_history[2], dict)
+
+
+def test_task_reads_like_a_dict():
+    data = sample_task()
+    task = model.Task.from_dict(data)
+    assert task["title"] == "Write docs" and task.title == "Write docs"
+    assert task.get("description") is None and "description" not in task
+    assert task.get("custom") == {"kept": True}
+    assert task["work_sessions"] == data["work_sessions"]
+    assert task.state == "doing"
+    # Strings that repeat across tasks are shared
+    other = model.Task.from_dict(dict(data, type="".join(["do", "cs"])))
+    assert other.type is task.type and other.layout is task.layout
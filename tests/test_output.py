@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, output
+from todo.cli import app
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="Deploy api\n\nfeature\nhigh\n\n\nops, api\n\n")
+    runner.invoke(app, ["add"], input="Write docs\n\ndocs\nlow\n\n\n\n\n")
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def test_list_formats():
+    result = runner.invoke(app, ["list", "--format", "ndjson"])
+    assert result.exit_code == 0
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [record["task_id"] for record in records] == ["PX-001", "PX-002"]
+    assert list(records[0]) == output.TASK_FIELDS
+    assert records[0]["tags"] == ["api", "ops"]
+
+    result = runner.invoke(app, ["list", "--format", "json"])
+    assert json.loads(result.stdout) == records
+
+    result = runner.invoke(app, ["list", "--format", "tsv", "--tag", "ops"])
+    rows = list(csv.DictReader(io.StringIO(result.stdout), delimiter="\t"))
+    assert [(row["task_id"], row["tags"], row["completed"]) for row in rows] == [("PX-001", "api,ops", "false")]
+
+    runner.invoke(app, ["complete", "PX-001"])
+    result = runner.invoke(app, ["list", "--format", "json"])
+    assert [record["task_id"] for record in json.loads(result.stdout)] == ["PX-002"]
+    result = runner.invoke(app, ["list", "--format", "xml"])
+    assert result.exit_code == 1
+    assert "Unknown format" in result.stdout
+
+
+def test_search_tag_tasks_and_status_formats():
+    result = runner.invoke(app, ["search", "deploy", "--format", "csv"])
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert [row["task_id"] for row in rows] == ["PX-001"]
+    assert float(rows[0]["score"]) > 0
+
+    result = runner.invoke(app, ["tag-tasks", "nothing", "--format", "json"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == []
+
+    result = runner.invoke(app, ["status", "--format", "json", "--by", "type"])
+    stats = json.loads(result.stdout)
+    assert stats["total_tasks"] == 2 and stats["high_priority"] == 1
+    assert [row["name"] for row in stats["by_type"]] == ["docs", "feature"]
+    result = runner.invoke(app, ["status", "--format", "csv", "--by", "type"])
+    assert result.exit_code == 1
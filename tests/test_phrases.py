@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, phrases
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+BASE = datetime(2025, 6, 11, 23, 59, 59)  # a Wednesday
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def test_fast_path_matches_dateparser():
+    dateparser = pytest.importorskip("dateparser")
+    for phrase in ["Tomorrow", " in 2  days", "in a week", "in 1 month", "3 months ago", "next week",
+                   "day after tomorrow", "in 2 hours", "2025-07-01"]:
+        assert phrases.compile_phrase(phrases.normalize(phrase)) is not None, phrase
+        expected = dateparser.parse(phrase, settings={"RELATIVE_BASE": BASE})
+        assert phrases.parse_date(phrase, BASE) == expected, phrase
+    # Not understood by dateparser: the coming weekday
+    assert phrases.parse_date("next friday", BASE) == datetime(2025, 6, 13, 23, 59, 59)
+    assert phrases.parse_date("next wednesday", BASE) == datetime(2025, 6, 18, 23, 59, 59)
+    assert phrases.compile_phrase("june 5") is None
+    assert phrases.parse_date("", BASE) is None
+
+
+def test_repeat_rules():
+    assert phrases.compile_rule("Every 2 weeks") == {"rule": "Every 2 weeks", "unit": "weeks", "interval": 2}
+    assert phrases.compile_rule("every monday") == {"rule": "every monday", "weekday": "monday", "interval": 1}
+    assert phrases.compile_rule("in 3 days") is None and phrases.compile_rule(None) is None
+    monthly = phrases.compile_rule("monthly")
+    assert phrases.advance(monthly, datetime(2025, 1, 31)) == datetime(2025, 2, 28)
+    assert phrases.advance(phrases.compile_rule("every other friday"), BASE) == datetime(2025, 6, 20, 23, 59, 59)
+    # A stored recurrence is only used while it matches the rule
+    task = {"repeat": "every day", "recurrence": monthly}
+    assert phrases.next_due(task, BASE) == datetime(2025, 6, 12, 23, 59, 59)
+
+
+@pytest.mark.parametrize("backend", ["yaml", "sqlite"])
+def test_completing_a_repeating_task(backend):
+    runner.invoke(app, ["init", "--backend", backend], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="Standup\n\nchore\nlow\n2025-06-11\n\n\nevery week\n")
+    task = load_todos()["tasks"][0]
+    assert task["due_date"] == "2025-06-11T23:59:59"
+    assert task["recurrence"] == {"rule": "every week", "unit": "weeks", "interval": 1}
+    result = runner.invoke(app, ["update", "status", "PX-001", "completed"])
+    assert "Next due date set to 2025-06-18" in result.stdout
+    task = load_todos()["tasks"][0]
+    assert task["due_date"] == "2025-06-18T23:59:59"
+    assert task["status"] == "pending" and task["completed"] is False
+    runner.invoke(app, ["update", "repeat", "PX-001", "every 2 months"])
+    runner.invoke(app, ["update", "status", "PX-001", "completed"])
+    task = load_todos()["tasks"][0]
+    assert task["recurrence"]["interval"] == 2
+    assert task["due_date"] == "2025-08-18T23:59:59"
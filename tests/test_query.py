@@ -0,0 +1,92 @@
+import os
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, query, storage
+from todo.cli import app
+
+runner = CliRunner()
+
+TASKS = [
+    {"task_id": "PX-001", "title": "b", "priority": "low", "due_date": "2025-06-03T23:59:59",
+     "created_at": "2025-05-01T10:00:00"},
+    {"task_id": "PX-002", "title": "a", "priority": "high", "due_date": None, "created_at": "2025-05-03T10:00:00"},
+    {"task_id": "PX-010", "title": "c", "priority": "high", "due_date": "2025-06-01T23:59:59",
+     "created_at": "2025-05-02T10:00:00"},
+    {"task_id": "PX-003", "title": "d", "priority": "medium", "due_date": "June 2, 2025"},
+]
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def ids(tasks):
+    return [task["task_id"] for task in tasks]
+
+
+def test_sort_and_page():
+    assert ids(query.select(TASKS, query.parse_sort("due"))) == ["PX-010", "PX-003", "PX-001", "PX-002"]
+    # Tasks without a value come last in both directions
+    assert ids(query.select(TASKS, query.parse_sort("-due"))) == ["PX-001", "PX-003", "PX-010", "PX-002"]
+    assert ids(query.select(TASKS, query.parse_sort("priority,-created"))) == ["PX-002", "PX-010", "PX-003", "PX-001"]
+    assert ids(query.select(TASKS, query.parse_sort("-id"), limit=2, offset=1)) == ["PX-003", "PX-002"]
+    assert ids(query.select(iter(TASKS), None, limit=2, offset=1)) == ["PX-002", "PX-010"]
+    assert query.page_bounds(None, None, 3) == (query.PAGE_SIZE, 2 * query.PAGE_SIZE)
+    with pytest.raises(ValueError):
+        query.parse_sort("due,size")
+    with pytest.raises(ValueError):
+        query.page_bounds(10, 5, 2)
+
+
+def test_top_k_matches_full_sort():
+    rng = random.Random(7)
+    tasks = [
+        {"task_id": f"PX-{n:03d}", "priority": rng.choice(["high", "medium", "low", None]),
+         "due_date": rng.choice([None, f"2025-06-{rng.randint(1, 28):02d}T23:59:59"])}
+        for n in range(300)
+    ]
+    fields = query.parse_sort("priority,-due")
+    everything = query.select(tasks, fields)
+    for limit, offset in [(1, 0), (10, 0), (10, 25), (50, 280)]:
+        assert query.select(tasks, fields, limit, offset) == everything[offset:offset + limit]
+
+
+def test_list_paging_command():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    for title in ("One", "Two", "Three"):
+        runner.invoke(app, ["add"], input=f"{title}\n\nfeature\nmedium\n\n\n\n\n")
+    result = runner.invoke(app, ["list", "--sort", "-id", "--limit", "2", "--format", "csv"])
+    assert [line.split(",")[0] for line in result.stdout.splitlines()] == ["task_id", "PX-003", "PX-002"]
+    result = runner.invoke(app, ["list", "--limit", "2", "--page", "2"])
+    assert "PX-003" in result.stdout and "PX-001" not in result.stdout
+    assert "Showing 3-3 of 3 tasks" in result.stdout
+    result = runner.invoke(app, ["list", "--sort", "size"])
+    assert result.exit_code == 1
+    assert "Invalid sort" in result.stdout
+
+
+def test_list_loads_the_project_once(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="One\n\nfeature\nmedium\n\n\n\n\n")
+    loads = []
+    load_document = storage.load_document
+    monkeypatch.setattr(storage, "load_document", lambda path: loads.append(path) or load_document(path))
+    for args in (["list"], ["list", "--tag", "missing"]):
+        loads.clear()
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0 and len(loads) == 1
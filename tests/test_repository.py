@@ -0,0 +1,32 @@
+from todo.repository import TaskRepository
+
+
+def make_repo():
+    return TaskRepository({
+        "project": {},
+        "tasks": [
+            {"task_id": "PX-001", "title": "First"},
+            {"task_id": "PX-002", "title": "Second"},
+            {"task_id": "px-001", "title": "Duplicate"},
+        ],
+    })
+
+
+def test_get_is_case_insensitive_and_first_match_wins():
+    repo = make_repo()
+    assert repo.get("px-001")["title"] == "First"
+    assert repo.get("PX-002")["title"] == "Second"
+    assert repo.get("PX-999") is None
+    assert "Px-002" in repo
+
+
+def test_add_and_delete_keep_index_in_sync():
+    repo = make_repo()
+    repo.add({"task_id": "PX-003", "title": "Third"})
+    assert repo.get("px-003")["title"] == "Third"
+    assert repo.delete("PX-001")["title"] == "First"
+    # Every task with the id is removed, like the old list filter
+    assert [t["task_id"] for t in repo] == ["PX-002", "PX-003"]
+    assert repo.get("PX-001") is None
+    assert repo.delete("PX-001") is None
+    assert len(repo.todos["tasks"]) == 2
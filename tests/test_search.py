@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, search
+from todo.cli import app
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def add_task(title, description="", note="", tags=""):
+    runner.invoke(app, ["add"], input=f"{title}\n{description}\nfeature\nmedium\n\n{note}\n{tags}\n\n")
+
+
+def make_state(*tasks):
+    tasks = [dict(task_id=f"PX-{i:03d}", **task) for i, task in enumerate(tasks, 1)]
+    by_id = {task["task_id"]: task for task in tasks}
+    return search.INDEX.build({"tasks": tasks}), by_id.get
+
+
+def test_ranking_prefers_title_matches():
+    state, _ = make_state(
+        {"title": "Write docs", "description": "deploy the docs site", "notes": []},
+        {"title": "Deploy pipeline", "description": "", "notes": ["check logs"]},
+    )
+    assert [task_id for task_id, _ in search.search(state, "deploy")] == ["PX-002", "PX-001"]
+    assert search.search(state, "deploy docs")[0][0] == "PX-001"
+    assert search.search(state, "DEPLOY", limit=1)[0][0] == "PX-002"
+    assert search.search(state, "missing") == []
+
+
+def test_phrase_and_prefix_queries():
+    state, get_task = make_state(
+        {"title": "Release notes"},
+        {"title": "Notes on release", "tags": ["releasing"]},
+        {"title": "Plan", "notes": ["draft release", "notes later"]},
+    )
+    assert [t for t, _ in search.search(state, '"release notes"', get_task=get_task)] == ["PX-001"]
+    assert [t for t, _ in search.search(state, '"notes later" plan', get_task=get_task)] == ["PX-003"]
+    assert search.search(state, '"draft notes"', get_task=get_task) == []
+    assert {t for t, _ in search.search(state, "releas*")} == {"PX-001", "PX-002", "PX-003"}
+
+
+def test_index_is_updated_incrementally(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add_task("Fix parser", note="crash on empty input")
+    result = runner.invoke(app, ["search", "crash"])
+    assert "PX-001" in result.stdout
+    assert indexes.index_file(Path("todo.yaml"), search.INDEX).exists()
+
+    def no_rebuild(todos):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(search.INDEX, "build", no_rebuild)
+    add_task("Speed up board", tags="perf")
+    runner.invoke(app, ["note", "add", "PX-001", "segfault in tokenizer"])
+    runner.invoke(app, ["update", "title", "PX-001", "Fix lexer"])
+    indexes.clear_memory()  # force reading the persisted index
+    assert "PX-001" in runner.invoke(app, ["search", "segfault"]).stdout
+    assert "PX-002" in runner.invoke(app, ["search", "perf"]).stdout
+    assert "No tasks found" in runner.invoke(app, ["search", "parser"]).stdout
+
+
+def test_external_edit_rebuilds_index():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add_task("Original title")
+    runner.invoke(app, ["search", "original"])
+    text = Path("todo.yaml").read_text().replace("Original title", "Renamed by hand")
+    Path("todo.yaml").write_text(text)
+    result = runner.invoke(app, ["search", "renamed"])
+    assert "PX-001" in result.stdout
+
+
+def test_paged_results_show_the_total():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    for title in ["Deploy api", "Deploy board", "Deploy docs"]:
+        add_task(title)
+    result = runner.invoke(app, ["search", "deploy", "--limit", "2", "--page", "2"])
+    assert "Showing 3-3 of 3 tasks" in result.stdout
+    result = runner.invoke(app, ["search", "deploy", "--limit", "2"])
+    assert "Showing 1-2 of 3 tasks" in result.stdout
+    assert "Showing" not in runner.invoke(app, ["search", "deploy"]).stdout
@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, storage
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+snapshot = pytest.importorskip("todo.snapshot")
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def add(title):
+    runner.invoke(app, ["add"], input=f"{title}\n\nfeature\nhigh\n\n\n\n\n")
+
+
+def test_export_rewrites_only_changed_pages():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    for title in ["First", "Second", "Third"]:
+        add(title)
+    runner.invoke(app, ["note", "add", "PX-001", "<script>alert(1)</script>"])
+    result = runner.invoke(app, ["board", "--export", "out"])
+    assert result.exit_code == 0 and "5 pages written" in result.output
+
+    board_page = Path("out/index.html").read_text()
+    assert "Pending (3)" in board_page and 'href="task/PX-002.html"' in board_page
+    assert "<details open" in board_page
+    details = Path("out/task/PX-001.html").read_text()
+    assert 'href="../index.html"' in details and "&lt;script&gt;alert(1)&lt;/script&gt;" in details
+    assert Path("out/statistics.html").read_text().count("data-figure=") == 4
+
+    result = runner.invoke(app, ["board", "--export", "out"])
+    assert "0 pages written, 5 unchanged" in result.output
+
+    runner.invoke(app, ["update", "title", "PX-002", "Renamed"])
+    runner.invoke(app, ["delete", "PX-003"], input="y\n")
+    result = runner.invoke(app, ["board", "--export", "out"])
+    # The renamed task, the board and the statistics; the deleted task's page is gone
+    assert "3 pages written, 1 unchanged, 1 removed" in result.output
+    assert "Renamed" in Path("out/task/PX-002.html").read_text()
+    assert not Path("out/task/PX-003.html").exists()
+
+
+def test_worker_pool_renders_the_same_pages(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    for title in ["First", "Second", "Third"]:
+        add(title)
+    tasks = load_todos()["tasks"]
+    snapshot.export_board(tasks, Path("serial"), workers=1)
+    monkeypatch.setattr(snapshot, "POOL_THRESHOLD", 1)
+    snapshot.export_board(tasks, Path("pool"), workers=2)
+    for name in ["PX-001", "PX-002", "PX-003"]:
+        assert Path(f"pool/task/{name}.html").read_text() == Path(f"serial/task/{name}.html").read_text()
+
+
+def test_export_removes_only_task_pages():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add("First")
+    runner.invoke(app, ["board", "--export", "out"])
+    Path("keep.txt").write_text("outside")
+    Path("out/notes.txt").write_text("inside")
+    manifest = json.loads(Path("out/manifest.json").read_text())
+    for name in ["../keep.txt", "task/../../keep.txt", "notes.txt", "task/%2E%2E.html"]:
+        manifest["pages"][name] = "0"
+    Path("out/manifest.json").write_text(json.dumps(manifest))
+    result = runner.invoke(app, ["board", "--export", "out"])
+    assert "0 removed" in result.output
+    assert Path("keep.txt").exists() and Path("out/notes.txt").exists()
+
+
+def test_interrupted_export_leaves_the_previous_pages(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add("First")
+    runner.invoke(app, ["board", "--export", "out"])
+    page = Path("out/task/PX-001.html").read_text()
+    runner.invoke(app, ["update", "title", "PX-001", "Renamed"])
+
+    def interrupt(source, target):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(snapshot.os, "replace", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        snapshot.export_board(load_todos()["tasks"], Path("out"), workers=1)
+    assert Path("out/task/PX-001.html").read_text() == page
+
+
+@pytest.mark.skipif(storage.fcntl is None, reason="advisory locks are tested on POSIX")
+def test_export_reads_under_the_project_lock():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add("First")
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent), TODO_NO_DAEMON="1")
+    command = [sys.executable, "-m", "todo.cli", "--lock-timeout", "0.2", "board", "--export", "out"]
+    with storage.lock(Path("todo.yaml").resolve()):
+        result = subprocess.run(command, capture_output=True, text=True, env=env)
+    assert result.returncode == 1
+    assert "locked by another todo process" in result.stdout
+    assert not Path("out").exists()
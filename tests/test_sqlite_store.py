@@ -0,0 +1,117 @@
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import columns, sqlite_store, storage
+from todo.cli import app, calculate_project_stats, load_todos
+
+runner = CliRunner()
+
+ADD_INPUT = "SQL Task\nStored in sqlite\nbugfix\nhigh\n\nfirst note\nbackend, db\n\n"
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    yield temp_dir
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def init_sqlite_project():
+    runner.invoke(app, ["init", "--backend", "sqlite"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input=ADD_INPUT)
+    runner.invoke(app, ["add"], input="Other\n\nfeature\nlow\n\n\n\n\n")
+
+
+def test_init_sqlite_creates_database():
+    init_sqlite_project()
+    assert Path("todo.db").exists()
+    assert not Path("todo.yaml").exists()
+    todos = load_todos()
+    assert todos["project"]["next_task_number"] == 3
+    task = todos["tasks"][0]
+    assert task["task_id"] == "PX-001"
+    assert task["notes"] == ["first note"]
+    assert task["tags"] == ["backend", "db"]
+    assert task["completed"] is False
+
+
+def test_incremental_changes_are_applied():
+    init_sqlite_project()
+    runner.invoke(app, ["note", "add", "px-001", "second note"])
+    runner.invoke(app, ["update", "status", "PX-001", "doing"])
+    runner.invoke(app, ["delete", "PX-002"], input="y\n")
+    todos = load_todos()
+    assert [t["task_id"] for t in todos["tasks"]] == ["PX-001"]
+    task = todos["tasks"][0]
+    assert task["notes"] == ["first note", "second note"]
+    assert task["status"] == "doing"
+    assert [h["status"] for h in task["status_history"]] == ["pending", "doing"]
+
+
+def test_queries_run_in_sql():
+    init_sqlite_project()
+    result = runner.invoke(app, ["complete", "px-002"])
+    assert "marked as complete" in result.stdout
+    db = Path("todo.db")
+    assert [t["task_id"] for t in sqlite_store.query_tasks(db, include_closed=False)] == ["PX-001"]
+    assert [t["task_id"] for t in sqlite_store.query_tasks(db, tag="db")] == ["PX-001"]
+    assert [t["task_id"] for t in sqlite_store.get_tasks(db, ["px-002", "PX-404", "PX-001"])] == ["PX-002", "PX-001"]
+    assert sqlite_store.project_stats(db) == calculate_project_stats(load_todos())
+    result = runner.invoke(app, ["list"])
+    assert "PX-001" in result.stdout and "PX-002" not in result.stdout
+
+
+def test_status_aggregates_in_sql(monkeypatch):
+    init_sqlite_project()
+    runner.invoke(app, ["complete", "px-002"])
+    expected = calculate_project_stats(load_todos())
+
+    def no_full_load(path):
+        raise AssertionError("status loaded every task")
+
+    monkeypatch.setattr(storage, "load_document", no_full_load)
+    result = runner.invoke(app, ["status", "--format", "json"])
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == expected
+    assert "Completion Rate" in runner.invoke(app, ["status"]).stdout
+
+
+def test_sql_stats_skip_unknown_priorities():
+    tasks = [
+        {"task_id": f"PX-00{number}", "title": "Task", "type": "feature", "priority": priority,
+         "completed": False, "status": "pending", "tags": [], "notes": [], "work_sessions": []}
+        for number, priority in enumerate(["high", None, "urgent"], 1)
+    ]
+    todos = {"project": {}, "tasks": tasks}
+    sqlite_store.save(Path("todo.db"), todos)
+    stats = sqlite_store.project_stats(Path("todo.db"))
+    expected = columns.summary(columns.INDEX.build(todos))
+    assert list(stats.items()) == list(expected.items())
+    assert stats["high_priority"] == 1
+
+
+def test_migrate_round_trip():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input=ADD_INPUT)
+    runner.invoke(app, ["checklist", "add", "Ship it"])
+    original = Path("todo.yaml").read_text()
+
+    result = runner.invoke(app, ["migrate", "--to", "sqlite"])
+    assert result.exit_code == 0
+    assert storage.backend(Path("todo.yaml")) == "sqlite"
+    assert Path("todo.yaml.bak").exists()
+
+    result = runner.invoke(app, ["migrate", "--to", "yaml"])
+    assert result.exit_code == 0
+    assert storage.backend(Path("todo.yaml")) == "yaml"
+    assert Path("todo.yaml").read_text() == original
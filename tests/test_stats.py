@@ -0,0 +1,159 @@
+import copy
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import columns, indexes, journal, stats
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+NOW = datetime(2025, 6, 11, 12, 0)  # a Wednesday
+
+TASKS = [
+    {
+        "task_id": "PX-001", "type": "feature", "priority": "high", "completed": True,
+        "due_date": "2025-06-01T23:59:59", "tags": ["api", "api"],
+        "work_sessions": [
+            {"started_at": "2025-06-09T09:00:00.123456", "duration": 25, "interrupted": False},
+            {"started_at": "2025-06-02T09:00:00", "duration": 10, "interrupted": True},
+        ],
+    },
+    {
+        "task_id": "PX-002", "type": "bugfix", "priority": "low", "completed": False,
+        "due_date": "2025-06-11T23:59:59", "tags": ["api"],
+        "work_sessions": [{"started_at": "2025-06-15T22:00:00", "duration": 5, "interrupted": True}],
+    },
+    {
+        "task_id": "PX-003", "type": "feature", "priority": "high", "completed": False,
+        "status": "cancelled", "due_date": "2025-01-01T00:00:00",
+        "work_sessions": [{"started_at": "2025-06-10T09:00:00", "duration": 60}],
+    },
+    {"task_id": "PX-004", "type": "feature", "priority": "medium", "completed": False, "due_date": ""},
+    {"task_id": "PX-005", "type": "docs", "priority": "medium", "completed": False, "due_date": "2025-05-01T00:00:00"},
+]
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def test_summary_counts():
+    assert stats.summarize(columns.INDEX.build({"tasks": TASKS}), NOW) == {
+        "total_tasks": 5,
+        "completed_tasks": 1,
+        "pending_tasks": 3,
+        "high_priority": 1,
+        "medium_priority": 2,
+        "low_priority": 1,
+        "overdue_tasks": 2,
+        "due_today": 1,
+        "no_due_date": 1,
+        "total_work_time": 40,
+        "completed_work_time": 35,
+        "pending_work_time": 5,
+        "interrupted_sessions": 2,
+        "total_sessions": 3,
+    }
+    assert stats.summarize(columns.INDEX.build({"tasks": []}), NOW)["total_tasks"] == 0
+
+
+def test_breakdowns():
+    state = columns.INDEX.build({"tasks": TASKS})
+    feature, *others = stats.by_type(state)
+    assert feature == {"name": "feature", "tasks": 3, "open": 1, "completed": 1, "cancelled": 1, "work_time": 95}
+    assert [row["name"] for row in others] == ["bugfix", "docs"]
+    assert stats.by_tag(state) == [
+        {"name": "api", "tasks": 2, "open": 1, "completed": 1, "cancelled": 0, "work_time": 40}
+    ]
+    assert stats.by_week(state) == [
+        {"week": date(2025, 6, 2), "sessions": 1, "interrupted": 1, "work_time": 10},
+        {"week": date(2025, 6, 9), "sessions": 3, "interrupted": 1, "work_time": 90},
+    ]
+    assert len(stats.by_week(state, weeks=1)) == 1
+
+
+def test_status_breakdowns_command():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="Task\n\nbugfix\nhigh\n\n\nops\n\n")
+    result = runner.invoke(app, ["status", "--by", "type", "--by", "tag", "--by", "week"])
+    assert result.exit_code == 0
+    assert "By Type" in result.stdout and "bugfix" in result.stdout
+    assert "By Tag" in result.stdout and "ops" in result.stdout
+    assert "No work sessions yet" in result.stdout
+    result = runner.invoke(app, ["status", "--by", "month"])
+    assert result.exit_code == 1
+    assert "Unknown breakdown" in result.stdout
+
+
+def test_columns_follow_changes(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    for title in ("One", "Two", "Three"):
+        runner.invoke(app, ["add"], input=f"{title}\n\nfeature\nmedium\n\n\nops\n\n")
+    runner.invoke(app, ["status"])
+    assert indexes.index_file(Path("todo.yaml"), columns.INDEX).exists()
+
+    def no_rebuild(todos):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(columns.INDEX, "build", no_rebuild)
+    runner.invoke(app, ["complete", "PX-001"])
+    runner.invoke(app, ["cancel", "PX-002"])
+    runner.invoke(app, ["update", "priority", "PX-003", "high"])
+    runner.invoke(app, ["update", "type", "PX-003", "bugfix"])
+    runner.invoke(app, ["update", "tag", "add", "PX-003", "infra"])
+    runner.invoke(app, ["delete", "PX-001"], input="y\n")
+    indexes.clear_memory()  # force reading the persisted index
+    state = indexes.get(columns.INDEX, Path("todo.yaml"))
+    assert stats.summarize(state) == stats.summarize(columns.ColumnsIndex().build(load_todos()))
+    assert columns.summary(state) == stats.summarize(state)
+    assert [(row["name"], row["tasks"]) for row in stats.by_tag(state)] == [("ops", 2), ("infra", 1)]
+    assert [(row["name"], row["tasks"]) for row in stats.by_type(state)] == [("bugfix", 1), ("feature", 1)]
+
+
+def test_counters_follow_records():
+    state = columns.INDEX.build({"tasks": copy.deepcopy(TASKS[:3])})
+    records = [
+        {"op": "add", "task": TASKS[3]},
+        {"op": "add", "task": TASKS[4]},
+        {"op": "set", "task_id": "PX-002", "values": {"completed": True, "due_date": "2025-06-12T10:00:00"}},
+        {"op": "set", "task_id": "PX-003", "values": {"status": "todo", "priority": "low"}},
+        {"op": "set", "task_id": "PX-004", "values": {"status": "cancelled"}},
+        {"op": "append", "task_id": "PX-005", "field": "work_sessions",
+         "values": [{"started_at": "2025-06-11T08:00:00", "duration": 30, "interrupted": True}]},
+        {"op": "delete", "task_id": "PX-001"},
+    ]
+    columns.INDEX.apply(state, None, records)
+    recounted = columns.INDEX.build(journal.replay({"tasks": copy.deepcopy(TASKS[:3])}, records))
+    assert columns.summary(state, NOW) == stats.summarize(recounted, NOW)
+    assert columns.summary(state, NOW)["pending_work_time"] == 90
+
+
+def test_status_verify():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    runner.invoke(app, ["add"], input="Task\n\nbugfix\nhigh\n\n\nops\n\n")
+    result = runner.invoke(app, ["status", "--verify"])
+    assert result.exit_code == 0
+    assert "Statistics verified" in result.stdout
+
+    state = indexes.get(columns.INDEX, Path("todo.yaml"))
+    state["counters"]["high_priority"] += 2
+    result = runner.invoke(app, ["status", "--verify"])
+    assert result.exit_code == 1
+    assert "high_priority" in result.stdout and "drifted" in result.stdout
+    result = runner.invoke(app, ["status", "--verify"])
+    assert result.exit_code == 0
@@ -0,0 +1,120 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from todo import storage
+
+
+@pytest.fixture
+def todo_file():
+    """Create a temporary directory holding the todo file"""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir) / "todo.yaml"
+    shutil.rmtree(temp_dir)
+
+
+def sample_document():
+    return {
+        "project": {"name": "Cache", "description": "desc", "prefix": "CA", "next_task_number": 2},
+        "tasks": [
+            {"task_id": "CA-001", "title": "Cached", "type": "feature", "priority": "low", "notes": ["one"]}
+        ],
+    }
+
+
+def test_snapshot_used_when_file_unchanged(todo_file, monkeypatch):
+    """Test that a saved document is loaded back from the snapshot without parsing YAML"""
+    storage.save_document(todo_file, sample_document())
+    assert storage.cache_file(todo_file).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed")
+
+    monkeypatch.setattr(storage, "parse", fail)
+    assert storage.load_document(todo_file) == sample_document()
+
+
+def test_snapshot_invalidated_by_external_edit(todo_file):
+    """Test that editing todo.yaml by hand is picked up instead of the stale snapshot"""
+    storage.save_document(todo_file, sample_document())
+    stat = todo_file.stat()
+    text = todo_file.read_text().replace("Cached", "Edited")
+    todo_file.write_text(text)
+    # Same size and mtime: only the content hash can tell the files apart
+    os.utime(todo_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert storage.load_document(todo_file)["tasks"][0]["title"] == "Edited"
+
+
+def test_corrupt_snapshot_falls_back_to_yaml(todo_file):
+    """Test that an unreadable snapshot is ignored and rebuilt"""
+    storage.save_document(todo_file, sample_document())
+    storage.cache_file(todo_file).write_bytes(b"not a pickle")
+    assert storage.load_document(todo_file) == sample_document()
+    assert storage.load_document(todo_file) == sample_document()
+
+
+def test_serialize_matches_pure_python_layout():
+    """Test that the libyaml codec writes exactly what yaml.dump(sort_keys=False) writes"""
+    tasks = [
+        {
+            "task_id": f"CA-{i:03d}",
+            "title": "Café ✓ résumé with a tab\tand enough text to be folded by the emitter" * (i % 3),
+            "notes": ["plain", "yes", "multi\nline", " leading", "a: b"],
+            "work_sessions": [{"started_at": "2025-01-01T09:00:00", "duration": 25, "interrupted": False}],
+            "due_date": None,
+        }
+        for i in range(300)
+    ]
+    document = {"project": sample_document()["project"], "tasks": tasks, "checklist": []}
+    expected = yaml.dump(document, sort_keys=False)
+    assert storage.serialize(document) == expected
+    assert storage.serialize(document, dumper=storage.PURE_DUMPER) == expected
+    assert storage.parse(expected) == storage.parse(expected, loader=storage.PURE_LOADER) == document
+
+
+def test_failed_save_leaves_previous_file_intact(todo_file, monkeypatch):
+    """Test that a save interrupted before the rename keeps the old todo file"""
+    storage.save_document(todo_file, sample_document())
+    before = todo_file.read_bytes()
+
+    def crash(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(storage.os, "replace", crash)
+    changed = sample_document()
+    changed["project"]["name"] = "Changed"
+    with pytest.raises(KeyboardInterrupt):
+        storage.save_document(todo_file, changed)
+    assert todo_file.read_bytes() == before
+    assert sorted(p.name for p in todo_file.parent.iterdir()) == [".todo", "todo.yaml"]
+
+
+def test_lock_is_reentrant(todo_file):
+    """Test that the same process can take the project lock again while holding it"""
+    with storage.lock(todo_file, timeout=0):
+        with storage.lock(todo_file, timeout=0):
+            storage.save_document(todo_file, sample_document())
+    with storage.lock(todo_file, timeout=0):
+        pass
+
+
+@pytest.mark.skipif(storage.fcntl is None, reason="advisory locks are tested on POSIX")
+def test_writer_waits_for_lock_then_times_out(todo_file):
+    """Test that another todo process cannot modify the project while the lock is held"""
+    storage.save_document(todo_file, sample_document())
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent))
+    command = [sys.executable, "-m", "todo.cli", "--lock-timeout", "0.2", "note", "add", "CA-001", "blocked"]
+    with storage.lock(todo_file):
+        result = subprocess.run(command, cwd=todo_file.parent, capture_output=True, text=True, env=env)
+    assert result.returncode == 1
+    assert "locked by another todo process" in result.stdout
+    assert storage.load_document(todo_file)["tasks"][0]["notes"] == ["one"]
+    result = subprocess.run(command, cwd=todo_file.parent, capture_output=True, text=True, env=env)
+    assert result.returncode == 0
+    assert storage.load_document(todo_file)["tasks"][0]["notes"] == ["one", "blocked"]
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, tagindex
+from todo.cli import app
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def add_task(title, tags=""):
+    runner.invoke(app, ["add"], input=f"{title}\n\nfeature\nmedium\n\n\n{tags}\n\n")
+
+
+def test_boolean_tag_queries():
+    tasks = [
+        {"task_id": "PX-001", "tags": ["infra"]},
+        {"task_id": "PX-002", "tags": ["infra", "blocked"]},
+        {"task_id": "PX-003", "tags": ["urgent", "blocked"], "status": "cancelled"},
+        {"task_id": "PX-004", "tags": []},
+    ]
+    state = tagindex.INDEX.build({"tasks": tasks})
+    assert tagindex.select(state, "infra") == ["PX-001", "PX-002"]
+    assert tagindex.select(state, "infra & !blocked | urgent") == ["PX-001", "PX-003"]
+    assert tagindex.select(state, "infra & !(blocked | urgent)") == ["PX-001"]
+    assert tagindex.select(state, "!infra") == ["PX-003", "PX-004"]
+    assert tagindex.select(state, "!infra", include_closed=False) == ["PX-004"]
+    assert tagindex.counts(state) == {"infra": 2, "blocked": 2, "urgent": 1}
+    for query in ["", "infra &", "(infra", "infra urgent", "| infra"]:
+        with pytest.raises(ValueError):
+            tagindex.parse_query(query)
+
+
+def test_tag_index_follows_changes(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add_task("Servers", "infra")
+    add_task("Outage", "infra, urgent")
+    assert "PX-002" in runner.invoke(app, ["list", "--tag", "infra & urgent"]).stdout
+
+    def no_rebuild(todos):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(tagindex.INDEX, "build", no_rebuild)
+    runner.invoke(app, ["update", "tag", "add", "PX-001", "blocked"])
+    runner.invoke(app, ["update", "tag", "remove", "PX-002", "urgent"])
+    add_task("Pager", "urgent")
+    runner.invoke(app, ["complete", "PX-002"])
+    indexes.clear_memory()  # force reading the persisted index
+
+    result = runner.invoke(app, ["list", "--tag", "infra & !blocked | urgent"])
+    assert "PX-003" in result.stdout
+    assert "PX-001" not in result.stdout and "PX-002" not in result.stdout
+    assert "PX-002" in runner.invoke(app, ["list", "-a", "--tag", "infra & !blocked"]).stdout
+    assert "PX-001" in runner.invoke(app, ["tag-tasks", "blocked"]).stdout
+    result = runner.invoke(app, ["tags"])
+    assert "infra (2 tasks)" in result.stdout and "urgent (1 task)" in result.stdout
+
+    result = runner.invoke(app, ["list", "--tag", "infra &"])
+    assert result.exit_code == 1
+    assert "Invalid tag query" in result.stdout
+
+
+def test_multi_word_tags_are_selected_by_name():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add_task("Review", "needs review, a&b")
+    add_task("Other", "review")
+    result = runner.invoke(app, ["tag-tasks", "needs review"])
+    assert result.exit_code == 0 and "PX-001" in result.stdout and "PX-002" not in result.stdout
+    result = runner.invoke(app, ["list", "--tag", "needs review"])
+    assert result.exit_code == 0 and "PX-001" in result.stdout and "PX-002" not in result.stdout
+    assert "PX-001" in runner.invoke(app, ["list", "--tag", "a&b"]).stdout
+    assert runner.invoke(app, ["list", "--tag", "missing tag"]).exit_code == 1
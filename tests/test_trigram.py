@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from todo import indexes, trigram
+from todo.cli import app, load_todos
+
+runner = CliRunner()
+
+
+@pytest.fixture(autouse=True)
+def temp_todo_dir(monkeypatch):
+    temp_dir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(temp_dir)
+    monkeypatch.setattr("todo.cli.TODO_FILE", Path("todo.yaml"))
+    indexes.clear_memory()
+    yield temp_dir
+    indexes.clear_memory()
+    os.chdir(cwd)
+    shutil.rmtree(temp_dir)
+
+
+def add_task(title, description="", note=""):
+    runner.invoke(app, ["add"], input=f"{title}\n{description}\nfeature\nmedium\n\n{note}\n\n\n")
+
+
+def test_fuzzy_search_tolerates_typos():
+    tasks = [
+        {"task_id": "PX-001", "title": "Deployment pipeline", "description": "", "notes": []},
+        {"task_id": "PX-002", "title": "Write docs", "description": "about the deployment", "notes": []},
+        {"task_id": "PX-003", "title": "Fix login", "notes": ["pipeline is green"]},
+    ]
+    state = trigram.INDEX.build({"tasks": tasks})
+    results = trigram.fuzzy_search(state, "deplyment pipline")
+    assert [task_id for task_id, _ in results] == ["PX-001", "PX-002"]
+    assert results[0][1] > results[1][1]
+    # PX-003 only resembles one of the two words
+    assert trigram.fuzzy_search(state, "deplyment pipline", threshold=0.2)[-1][0] == "PX-003"
+    assert trigram.fuzzy_search(state, "deplyment pipline", limit=1)[0][0] == "PX-001"
+    assert trigram.fuzzy_search(state, "deplyment pipline", threshold=0.6) == []
+    assert trigram.fuzzy_search(state, "zzz") == []
+
+
+def test_fuzzy_index_is_updated_incrementally(monkeypatch):
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    add_task("Refactor scheduler")
+    result = runner.invoke(app, ["search", "--fuzzy", "shceduler"])
+    assert "PX-001" in result.stdout
+
+    def no_rebuild(todos):
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(trigram.INDEX, "build", no_rebuild)
+    add_task("Cache thumbnails")
+    runner.invoke(app, ["update", "description", "PX-001", "Move to asyncio"])
+    runner.invoke(app, ["note", "add", "PX-002", "Use an LRU policy"])
+    indexes.clear_memory()  # force reading the persisted index
+    assert "PX-002" in runner.invoke(app, ["search", "-f", "thumbnial"]).stdout
+    assert "PX-001" in runner.invoke(app, ["search", "-f", "asyncoi"]).stdout
+    assert "PX-002" in runner.invoke(app, ["search", "-f", "polcy"]).stdout
+
+
+def test_partial_task_ids():
+    runner.invoke(app, ["init"], input="Proj\nDesc\nPX\n")
+    for title in ("First", "Second", "Third"):
+        add_task(title)
+    for _ in range(9):
+        add_task("Filler")
+    assert "First" in runner.invoke(app, ["show", "1"]).stdout
+    assert "Second" in runner.invoke(app, ["show", "px-2"]).stdout
+    assert "Third" in runner.invoke(app, ["show", "PX-003"]).stdout
+
+    runner.invoke(app, ["evolve", "px3"])
+    assert load_todos()["tasks"][2]["status"] == "doing"
+
+    result = runner.invoke(app, ["show", "px-1"])
+    assert result.exit_code == 0 and "First" in result.stdout
+    result = runner.invoke(app, ["show", "px-01"])
+    assert result.exit_code == 0 and "First" in result.stdout
+    result = runner.invoke(app, ["show", "x1"])
+    assert result.exit_code == 1
+    assert "ambiguous" in result.stdout
+    assert runner.invoke(app, ["show", "99"]).exit_code == 1
@@ -0,0 +1,3 @@
+from todo.client import main
+
+main()
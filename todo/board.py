@@ -1,16 +1,97 @@
-from typing import List, Dict
+import re
+from typing import List, Dict, Union
 import webbrowser
 from threading import Timer
 import dash
-from dash import html, dcc, Input, Output, State
+from dash import html, dcc, Input, Output, State, ALL
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import pandas as pd
 from datetime import datetime
 
-def launch_board(tasks: List[Dict]):
+from todo.live import ProjectStore
+from todo.lru import LRUCache
+from todo.repository import task_key
+
+# Where the board listens by default, and its request threads with --serve
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8050
+DEFAULT_WORKERS = 8
+# Milliseconds between checks of open pages for changes to the project
+REFRESH_INTERVAL = 1000
+# Rendered cards and pages kept for reuse (see launch_board)
+CARD_CACHE_SIZE = 10_000
+PAGE_CACHE_SIZE = 256
+# Cards shown per column at first, and added by each "Load more"
+COLUMN_PAGE_SIZE = 50
+# Columns shown collapsed (header and count only) until opened
+COLLAPSED_COLUMNS = ("Completed", "Cancelled")
+
+def launch_board(
+    tasks: Union[List[Dict], ProjectStore],
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    serve: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    open_browser: bool = True,
+):
     """
     Launch a Dash web app with a Trello-like board showing all tasks grouped by status.
+
+    By default it runs on Dash's development server. With `serve`, it runs
+    on waitress, a production WSGI server, with `workers` threads handling
+    requests. The threads share one ProjectStore: its views are immutable
+    and swapped in whole, so requests read them without locking, and the
+    project is loaded, followed and rendered into the caches once for all.
+    """
+    app = create_app(tasks)
+
+    if open_browser:
+        # A wildcard address is not one a browser can open
+        browse_host = "127.0.0.1" if host in ("0.0.0.0", "::", "") else host
+        Timer(1, webbrowser.open_new, [f"http://{browse_host}:{port}/"]).start()
+    if serve:
+        server = make_server(app, host, port, workers)
+        print(f"Serving the board on http://{host}:{port}/ with {workers} worker threads (Ctrl+C to stop)")
+        try:
+            server.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+    else:
+        app.run(host=host, port=port, debug=False)
+
+
+def make_server(app: dash.Dash, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: int = DEFAULT_WORKERS):
+    """A waitress server for the board, not yet running (port 0 picks a free port, see server.effective_port)"""
+    import waitress
+
+    return waitress.create_server(app.server, host=host, port=port, threads=workers, ident="todo-board")
+
+
+def create_app(tasks: Union[List[Dict], ProjectStore]) -> dash.Dash:
+    """
+    The Dash app of the board (see launch_board), without running it.
+
+    `tasks` is either a list of tasks, shown as they are, or a ProjectStore
+    following the project files (see todo.live): open pages then check for
+    changes every REFRESH_INTERVAL and re-render only the columns, or the
+    task details, whose tasks changed.
+
+    Rendered cards, task details and statistics are cached. Tasks are
+    immutable (a change replaces the Task object), so cards and details are
+    keyed by the task object and the statistics by the store version; the
+    entries of changed tasks are dropped as soon as the store changes, and
+    the least recently used go when a cache is full.
+
+    `app.renderers` holds the layouts of the pages (see todo.snapshot).
+
+    Columns show at most COLUMN_PAGE_SIZE cards, with a count and a "Load
+    more" button; Completed and Cancelled start collapsed. How many cards
+    each column shows is kept in the page ("board-limits"), so a response
+    stays bounded whatever the size of the project.
     """
     try:
         # Only catch ImportError for CLI fallback, not for main board rendering
@@ -19,6 +100,29 @@ def launch_board(tasks: List[Dict]):
         print("[red]Dash is not installed. Please run 'uv pip install dash dash-bootstrap-components'.[/red]")
         return
 
+    store = tasks if isinstance(tasks, ProjectStore) else ProjectStore(tasks)
+    cards = LRUCache(CARD_CACHE_SIZE)
+    pages = LRUCache(PAGE_CACHE_SIZE)
+
+    def drop_changed(previous, view):
+        current = {id(task) for task in view.tasks}
+        cards.prune(lambda key, entry: key in current)
+        pages.prune(lambda key, entry: entry[0] is view or id(entry[0]) in current)
+
+    store.listeners.append(drop_changed)
+    store.start()
+
+    def cached(cache, key, source, render):
+        # Entries remember what they were rendered from: an id is only reused once its object is gone
+        entry = cache.get(key)
+        if entry is None or entry[0] is not source:
+            entry = (source, render())
+            cache.put(key, entry)
+        return entry[1]
+
+    def card(task):
+        return cached(cards, id(task), task, lambda: make_card(task))
+
     status_columns = [
         ("Pending", "cyan"),
         ("Doing", "orange"),
@@ -26,14 +130,7 @@ def launch_board(tasks: List[Dict]):
         ("Cancelled", "yellow"),
     ]
     def get_status(task):
-        if task.get("completed"):
-            return "Completed"
-        elif task.get("status") == "cancelled":
-            return "Cancelled"
-        elif task.get("status") == "doing":
-            return "Doing"
-        else:
-            return "Pending"
+        return task.state.capitalize()
     def make_card(task):
         # Color for type
         type_colors = {
@@ -42,35 +139,25 @@ def launch_board(tasks: List[Dict]):
             "feature": "success",
             "chore": "secondary",
         }
-        type_color = type_colors.get(task.get("type", "task"), "primary")
+        type_color = type_colors.get(task.type or "task", "primary")
         # Priority badge
         priority_color = {
             "high": "danger",
             "medium": "warning",
             "low": "success",
-        }.get(task.get("priority", "medium"), "secondary")
+        }.get(task.priority or "medium", "secondary")
         # Status badge
-        if task.get("completed"):
-            status_label = "Completed"
-            status_color = "success"
-        elif task.get("status") == "cancelled":
-            status_label = "Cancelled"
-            status_color = "warning"
-        elif task.get("status") == "doing":
-            status_label = "Doing"
-            status_color = "info"
-        else:
-            status_label = "Pending"
-            status_color = "info"
+        status_label = get_status(task)
+        status_color = {"Completed": "success", "Cancelled": "warning"}.get(status_label, "info")
         # Repeat info
-        repeat = task.get("repeat")
+        repeat = task.repeat
         repeat_badge = None
         if repeat:
             repeat_badge = dbc.Badge(f"Repeats: {repeat}", color="info", pill=True, style={"fontSize": "0.85rem", "marginLeft": "0.5rem", "background": "#e6fffa", "color": "#234e52", "border": "1px solid #38b2ac"})
         # Next scheduled date (for repeatable tasks)
         next_due = None
-        if repeat and task.get("due_date"):
-            next_due = task["due_date"]
+        if repeat and task.due_date:
+            next_due = task.due_date
         # Repeat info row
         repeat_info_row = None
         if repeat:
@@ -79,31 +166,31 @@ def launch_board(tasks: List[Dict]):
                 html.Span(next_due, style={"color": "#234e52", "fontWeight": 500})
             ], className="mb-1", style={"fontSize": "0.92rem"})
         # Tags as badges
-        tags = task.get("tags", [])
+        tags = task.tags or []
         tag_badges = [dbc.Badge(tag, color="secondary", className="me-1", pill=True, style={"fontSize": "0.85rem", "background": "#e3e8f0", "color": "#4a5568"}) for tag in tags]
         # --- View Details Link ---
         details_link = dcc.Link(
             'View Details', 
-            href=f"/task/{task['task_id']}", 
+            href=f"/task/{task.task_id}", 
             style={"fontSize": "0.92rem", "fontWeight": 500, "color": "#3182ce", "textDecoration": "underline", "marginTop": "0.5rem", "display": "inline-block"}
         )
         return dbc.Card([
             dbc.CardHeader([
-                html.Span(task["title"], style={"fontWeight": "bold", "fontSize": "1.15rem", "fontFamily": "'Montserrat', 'Segoe UI', Arial, sans-serif", "color": "#2d3748"}),
+                html.Span(task.title, style={"fontWeight": "bold", "fontSize": "1.15rem", "fontFamily": "'Montserrat', 'Segoe UI', Arial, sans-serif", "color": "#2d3748"}),
                 dbc.Badge(status_label, color=status_color, className="ms-2", pill=True, style={"fontSize": "0.9rem"}),
                 repeat_badge if repeat_badge else None
             ], className="d-flex justify-content-between align-items-center", style={"background": "#f1f5f9", "borderBottom": "1px solid #e2e8f0"}),
             dbc.CardBody([
                 html.Div([
-                    html.Span("ID: ", style={"fontWeight": "bold", "color": "#718096", "fontFamily": "monospace"}), task["task_id"]
+                    html.Span("ID: ", style={"fontWeight": "bold", "color": "#718096", "fontFamily": "monospace"}), task.task_id
                 ], className="mb-1 text-muted", style={"fontSize": "0.95rem"}),
                 html.Div([
-                    dbc.Badge(task["type"], color=type_color, className="me-2", pill=True, style={"fontSize": "0.85rem"}),
-                    dbc.Badge(task["priority"].capitalize(), color=priority_color, pill=True, style={"fontSize": "0.85rem"}),
+                    dbc.Badge(task.type, color=type_color, className="me-2", pill=True, style={"fontSize": "0.85rem"}),
+                    dbc.Badge(task.priority.capitalize(), color=priority_color, pill=True, style={"fontSize": "0.85rem"}),
                 ], className="mb-2"),
                 html.Div([
                     html.Span("Due: ", style={"fontWeight": "bold", "color": "#3182ce"}),
-                    task["due_date"] if task.get("due_date") else "-"
+                    task.due_date or "-"
                 ], className="mb-2", style={"fontSize": "0.95rem"}),
                 repeat_info_row if repeat_info_row else None,
                 html.Div(tag_badges, className="mb-1"),
@@ -140,12 +227,57 @@ def launch_board(tasks: List[Dict]):
     ], style=SIDEBAR_STYLE)
 
     # --- Main Content Layouts ---
-    def layout_board(filtered_tasks=None):
-        # Use filtered_tasks if provided, else use all tasks
-        current_tasks = filtered_tasks if filtered_tasks is not None else tasks
+    def group_by_status(current_tasks):
         columns = {s: [] for s, _ in status_columns}
         for task in current_tasks:
             columns[get_status(task)].append(task)
+        return columns
+
+    def default_limits():
+        return {status: 0 if status in COLLAPSED_COLUMNS else COLUMN_PAGE_SIZE for status, _ in status_columns}
+
+    def column_signature(view, column_tasks, limit):
+        # Changes whenever the count, or a shown task, changes
+        shown = (task_key(t.task_id) for t in column_tasks[:limit])
+        return hash((limit, len(column_tasks), tuple((key, view.revisions.get(key)) for key in shown)))
+
+    def layout_column(status, color, column_tasks, limit, static=False):
+        if static:
+            # Without callbacks: every card, in a column the browser opens and closes itself
+            return [html.Details([
+                html.Summary(html.H4(f"{status} ({len(column_tasks)})", style={"color": color, "fontWeight": 700, "display": "inline"}), style={"marginBottom": "1rem"}),
+                *[card(task) for task in column_tasks],
+            ], open=status not in COLLAPSED_COLUMNS)]
+        header = html.Div([
+            html.H4(f"{status} ({len(column_tasks)})", style={"color": color, "fontWeight": 700, "marginBottom": 0}),
+            dbc.Button("Hide" if limit else "Show", id={"type": "column-toggle", "index": status}, color="link", size="sm"),
+        ], className="d-flex justify-content-between align-items-center", style={"marginBottom": "1rem"})
+        children = [header, *[card(task) for task in column_tasks[:limit]]]
+        hidden = len(column_tasks) - limit
+        if limit and hidden > 0:
+            children.append(dbc.Button(
+                f"Load more ({hidden} more)", id={"type": "column-more", "index": status},
+                color="secondary", outline=True, size="sm", className="w-100 mb-3"
+            ))
+        return children
+
+    def layout_repeat_summary(current_tasks):
+        repeatable_count = sum(1 for t in current_tasks if t.repeat)
+        now = datetime.now().isoformat()
+        overdue_repeat_count = sum(1 for t in current_tasks if t.repeat and t.due_date and t.due_date < now)
+        return dbc.CardBody([
+            html.H5("Repeatable Tasks", className="card-title mb-1", style={"fontWeight": 700}),
+            html.Div([
+                dbc.Badge(f"Total: {repeatable_count}", color="info", className="me-2", style={"fontSize": "1rem", "padding": "0.7em 1.2em"}),
+                dbc.Badge(f"Overdue: {overdue_repeat_count}", color="danger" if overdue_repeat_count else "secondary", className="me-2", style={"fontSize": "1rem", "padding": "0.7em 1.2em"})
+            ])
+        ])
+
+    def layout_board(filtered_tasks=None, limits=None, static=False):
+        # Use filtered_tasks if provided, else use all tasks
+        current_tasks = filtered_tasks if filtered_tasks is not None else store.tasks
+        limits = limits or default_limits()
+        columns = group_by_status(current_tasks)
         # Filter toggle for repeatable tasks
         filter_repeat = dcc.Checklist(
             options=[{"label": "Show only repeatable tasks", "value": "repeatable"}],
@@ -158,32 +290,26 @@ def launch_board(tasks: List[Dict]):
         for status, color in status_columns:
             filtered = columns[status]
             board_columns.append(
-                dbc.Col([
-                    html.H4(status, style={"color": color, "fontWeight": 700, "marginBottom": "1rem"}),
-                    *[make_card(task) for task in filtered]
-                ], width=3, style={"minWidth": "320px"})
+                dbc.Col(layout_column(status, color, filtered, limits[status], static), id={"type": "board-column", "index": status}, width=3, style={"minWidth": "320px"})
             )
         # Dashboard summary for repeatable tasks
-        repeatable_count = sum(1 for t in current_tasks if t.get("repeat"))
-        overdue_repeat_count = sum(1 for t in current_tasks if t.get("repeat") and t.get("due_date") and t["due_date"] < datetime.now().isoformat())
         dashboard = dbc.Card([
-            dbc.CardBody([
-                html.H5("Repeatable Tasks", className="card-title mb-1", style={"fontWeight": 700}),
-                html.Div([
-                    dbc.Badge(f"Total: {repeatable_count}", color="info", className="me-2", style={"fontSize": "1rem", "padding": "0.7em 1.2em"}),
-                    dbc.Badge(f"Overdue: {overdue_repeat_count}", color="danger" if overdue_repeat_count else "secondary", className="me-2", style={"fontSize": "1rem", "padding": "0.7em 1.2em"})
-                ])
-            ])
-        ], style={"boxShadow": "0 2px 8px rgba(44,62,80,0.08)", "borderRadius": "0.7rem", "marginBottom": "1.2rem"})
+            layout_repeat_summary(current_tasks)
+        ], id={"type": "board-summary", "index": 0}, style={"boxShadow": "0 2px 8px rgba(44,62,80,0.08)", "borderRadius": "0.7rem", "marginBottom": "1.2rem"})
         return dbc.Container([
             dashboard,
-            filter_repeat,
+            None if static else filter_repeat,
             dbc.Row(board_columns, className="g-4 flex-nowrap", style={"overflowX": "auto"})
         ], fluid=True)
 
     def layout_task_details(task_id):
         # Find the task by id
-        task = next((t for t in tasks if str(t['task_id']) == str(task_id)), None)
+        task = store.get(task_id)
+        if task:
+            return cached(pages, id(task), task, lambda: render_task_details(task))
+        return render_task_details(task)
+
+    def render_task_details(task):
         if not task:
             return dbc.Container([
                 html.Div([
@@ -193,23 +319,22 @@ def launch_board(tasks: List[Dict]):
             ], style={"maxWidth": "600px", "margin": "0 auto"})
 
         from datetime import datetime
-        import dateutil.parser
+        from todo import dates
         def format_duration(minutes):
             if not minutes:
                 return "0m"
             hours, mins = divmod(minutes, 60)
             return f"{hours}h {mins}m" if hours else f"{mins}m"
-        sessions = task.get('work_sessions', [])
-        total_time = sum(s.get('duration', 0) for s in sessions)
-        completed_sessions = sum(1 for s in sessions if not s.get('interrupted'))
-        interrupted_sessions = sum(1 for s in sessions if s.get('interrupted'))
-        created_at = task.get('created_at')
+        sessions = task.sessions
+        total_time = sessions.total_duration()
+        interrupted_sessions = sessions.interrupted_count()
+        completed_sessions = len(sessions) - interrupted_sessions
+        created_at = dates.parse(task.created_at)
         if created_at:
-            created_at = dateutil.parser.parse(created_at)
             created_str = created_at.strftime('%Y-%m-%d %H:%M')
         else:
             created_str = "-"
-        notes = task.get('notes', [])
+        notes = task.notes or []
         # Badge styles
         type_colors = {
             "task": "primary",
@@ -217,47 +342,37 @@ def launch_board(tasks: List[Dict]):
             "feature": "success",
             "chore": "secondary",
         }
-        type_color = type_colors.get(task.get("type", "task"), "primary")
+        type_color = type_colors.get(task.type or "task", "primary")
         priority_color = {
             "high": "danger",
             "medium": "warning",
             "low": "success",
-        }.get(task.get("priority", "medium"), "secondary")
-        if task.get("completed"):
-            status_label = "Completed"
-            status_color = "success"
-        elif task.get("status") == "cancelled":
-            status_label = "Cancelled"
-            status_color = "warning"
-        elif task.get("status") == "doing":
-            status_label = "Doing"
-            status_color = "info"
-        else:
-            status_label = "Pending"
-            status_color = "info"
-        tag_badges = [dbc.Badge(tag, color="secondary", className="me-1", pill=True, style={"fontSize": "0.85rem", "background": "#e3e8f0", "color": "#4a5568"}) for tag in task.get('tags', [])]
+        }.get(task.priority or "medium", "secondary")
+        status_label = get_status(task)
+        status_color = {"Completed": "success", "Cancelled": "warning"}.get(status_label, "info")
+        tag_badges = [dbc.Badge(tag, color="secondary", className="me-1", pill=True, style={"fontSize": "0.85rem", "background": "#e3e8f0", "color": "#4a5568"}) for tag in task.tags or []]
         # Main Card
         rows = [
-            html.Tr([html.Th("Task ID"), html.Td(task["task_id"])]),
-            html.Tr([html.Th("Title"), html.Td(task["title"])]),
-            html.Tr([html.Th("Type"), html.Td(task["type"])]),
-            html.Tr([html.Th("Priority"), html.Td(task["priority"])]),
-            html.Tr([html.Th("Status"), html.Td(task["status"])]),
-            html.Tr([html.Th("Due Date"), html.Td(task["due_date"] if task.get("due_date") else "-")]),
+            html.Tr([html.Th("Task ID"), html.Td(task.task_id)]),
+            html.Tr([html.Th("Title"), html.Td(task.title)]),
+            html.Tr([html.Th("Type"), html.Td(task.type)]),
+            html.Tr([html.Th("Priority"), html.Td(task.priority)]),
+            html.Tr([html.Th("Status"), html.Td(task.status)]),
+            html.Tr([html.Th("Due Date"), html.Td(task.due_date or "-")]),
         ]
         # Add repeat row if present
-        if task.get("repeat"):
-            rows.append(html.Tr([html.Th("Repeat"), html.Td(task["repeat"])]))
+        if task.repeat:
+            rows.append(html.Tr([html.Th("Repeat"), html.Td(task.repeat)]))
             # Show next scheduled date
-            if task.get("due_date"):
-                rows.append(html.Tr([html.Th("Next Due"), html.Td(task["due_date"])]))
+            if task.due_date:
+                rows.append(html.Tr([html.Th("Next Due"), html.Td(task.due_date)]))
         return dbc.Container([
             dcc.Link("← Back to Board", href="/", style={"color": "#3182ce", "fontWeight": 500, "marginBottom": "1.5rem", "display": "inline-block"}),
             dbc.Card([
                 dbc.CardHeader([
                     html.Div([
-                        html.Span(f"Task {task['task_id']}: ", style={"fontWeight": 700, "fontSize": "1.2rem", "color": "#2d3748"}),
-                        html.Span(task['title'], style={"fontWeight": 600, "fontSize": "1.1rem", "color": "#2d3748"}),
+                        html.Span(f"Task {task.task_id}: ", style={"fontWeight": 700, "fontSize": "1.2rem", "color": "#2d3748"}),
+                        html.Span(task.title, style={"fontWeight": 600, "fontSize": "1.1rem", "color": "#2d3748"}),
                         dbc.Badge(status_label, color=status_color, className="ms-2", pill=True, style={"fontSize": "0.9rem"})
                     ], className="d-flex align-items-center justify-content-between"),
                 ], style={"background": "#f7fafc", "borderBottom": "1px solid #e2e8f0", "padding": "1rem 1.5rem"}),
@@ -297,17 +412,24 @@ def launch_board(tasks: List[Dict]):
         ], style={"padding": "2.5rem 0"})
 
     def layout_statistics():
+        view = store.view
+        return cached(pages, "statistics", view, lambda: render_statistics(view.tasks))
+
+    def render_statistics(tasks):
         # Compute statistics
         total_tasks = len(tasks)
-        completed = sum(1 for t in tasks if t.get("completed"))
-        pending = sum(1 for t in tasks if not t.get("completed") and t.get("status") != "cancelled")
-        cancelled = sum(1 for t in tasks if t.get("status") == "cancelled")
-        priorities = [t.get("priority", "medium") for t in tasks]
-        types = [t.get("type", "task") for t in tasks]
-        tags = [tag for t in tasks for tag in t.get("tags", [])]
-        overdue = sum(1 for t in tasks if t.get("due_date") and not t.get("completed") and t.get("status") != "cancelled")
-        # Timeline chart (creation and completion)
-        df = pd.DataFrame(tasks)
+        completed = sum(1 for t in tasks if t.completed)
+        pending = sum(1 for t in tasks if not t.completed and t.status != "cancelled")
+        cancelled = sum(1 for t in tasks if t.status == "cancelled")
+        priorities = [t.priority or "medium" for t in tasks]
+        types = [t.type or "task" for t in tasks]
+        tags = [tag for t in tasks for tag in t.tags or []]
+        overdue = sum(1 for t in tasks if t.due_date and not t.completed and t.status != "cancelled")
+        # Timeline chart (creation and completion), built from the only columns it reads
+        columns = {"created_at": [t.created_at for t in tasks]}
+        if any("completed_at" in t for t in tasks):
+            columns["completed_at"] = [t.get("completed_at") for t in tasks]
+        df = pd.DataFrame(columns)
         df["created_at"] = pd.to_datetime(df["created_at"], errors="coerce")
         df["completed_at"] = pd.to_datetime(df.get("completed_at", None), errors="coerce") if "completed_at" in df.columns else pd.NaT
         # Creation timeline
@@ -323,7 +445,7 @@ def launch_board(tasks: List[Dict]):
         # Timeline chart
         timeline_fig = px.line(timeline, x="Date", y=["Created", "Completed"], markers=True, title="Task Creation & Completion Timeline")
         # Status stats
-        status_counts = {"Pending": pending, "Doing": sum(1 for t in tasks if t.get("status") == "doing"), "Completed": completed, "Cancelled": cancelled}
+        status_counts = {"Pending": pending, "Doing": sum(1 for t in tasks if t.status == "doing"), "Completed": completed, "Cancelled": cancelled}
         # Priority chart
         priority_counts = {p: priorities.count(p) for p in set(priorities)}
         priority_fig = px.pie(
@@ -372,7 +494,7 @@ def launch_board(tasks: List[Dict]):
             dbc.Col(dbc.Card([
                 dbc.CardBody([
                     html.H5("Doing", className="card-title mb-1", style={"fontWeight": 700}),
-                    html.H2(sum(1 for t in tasks if t.get("status") == "doing"), className="card-text", style={"color": "#ffb347", "fontWeight": 700}),
+                    html.H2(sum(1 for t in tasks if t.status == "doing"), className="card-text", style={"color": "#ffb347", "fontWeight": 700}),
                 ])
             ], style={"boxShadow": "0 2px 8px rgba(44,62,80,0.08)", "borderRadius": "0.7rem"}), width=3),
             dbc.Col(dbc.Card([
@@ -416,6 +538,13 @@ def launch_board(tasks: List[Dict]):
         suppress_callback_exceptions=True
         )
     app.title = "Flowistic Task Board"
+    # The page layouts, for rendering them outside of a request (see todo.snapshot)
+    app.renderers = {
+        "sidebar": sidebar,
+        "board": lambda tasks: layout_board(filtered_tasks=tasks, static=True),
+        "task": render_task_details,
+        "statistics": render_statistics,
+    }
     app.layout = html.Div([
         dcc.Location(id="url"),
         sidebar,
@@ -426,31 +555,117 @@ def launch_board(tasks: List[Dict]):
             id="repeat-filter",
             style={"display": "none"}
         ),
-        html.Div(id="page-content", style={"marginLeft": "240px", "padding": "2rem 2rem 2rem 2rem"})
+        html.Div(id="page-content", style={"marginLeft": "240px", "padding": "2rem 2rem 2rem 2rem"}),
+        # Live updates: what the page shows, checked against the store every REFRESH_INTERVAL
+        dcc.Store(id="board-seen"),
+        dcc.Store(id="board-limits"),
+        dcc.Interval(id="board-refresh", interval=REFRESH_INTERVAL, disabled=not store.live),
     ])
 
     # Add callback for filtering
     @app.callback(
         Output("page-content", "children"),
         [Input("url", "pathname")],
-        [State("repeat-filter", "value")]
+        [State("repeat-filter", "value"), State("board-limits", "data")]
     )
-    def display_page(pathname, repeat_filter):
-        import re
+    def display_page(pathname, repeat_filter, limits):
         match = re.match(r"/task/(.+)", pathname or "")
         if match:
             task_id = match.group(1)
-            return layout_task_details(task_id)
+            return html.Div(layout_task_details(task_id), id={"type": "live-page", "index": 0})
         if pathname == "/statistics":
-            return layout_statistics()
+            return html.Div(layout_statistics(), id={"type": "live-page", "index": 0})
+        return layout_board(filtered_tasks=filter_tasks(store.tasks, repeat_filter), limits=limits)
+
+    def filter_tasks(current_tasks, repeat_filter):
         # Filter tasks if checklist is checked
-        filtered_tasks = tasks
         if repeat_filter and "repeatable" in repeat_filter:
-            filtered_tasks = [t for t in tasks if t.get("repeat")]
-        return layout_board(filtered_tasks=filtered_tasks)
+            return [t for t in current_tasks if t.repeat]
+        return current_tasks
+
+    def page_signature(view, pathname):
+        # What the details or statistics page shows: one task, or every task
+        match = re.match(r"/task/(.+)", pathname or "")
+        return view.revision(match.group(1)) if match else view.version
+
+    @app.callback(
+        Output("board-limits", "data"),
+        Input({"type": "column-more", "index": ALL}, "n_clicks"),
+        Input({"type": "column-toggle", "index": ALL}, "n_clicks"),
+        State("board-limits", "data"),
+        prevent_initial_call=True,
+    )
+    def change_limits(_, __, limits):
+        """Show the next page of a column, or collapse or open it"""
+        trigger = dash.ctx.triggered_id
+        if trigger is None or not dash.ctx.triggered[0]["value"]:
+            # Buttons just rendered, not clicked
+            raise PreventUpdate
+        limits = dict(limits or default_limits())
+        status = trigger["index"]
+        if trigger["type"] == "column-more":
+            limits[status] += COLUMN_PAGE_SIZE
+        else:
+            limits[status] = 0 if limits[status] else COLUMN_PAGE_SIZE
+        return limits
+
+    @app.callback(
+        Output({"type": "board-column", "index": ALL}, "children"),
+        Output({"type": "board-summary", "index": ALL}, "children"),
+        Output({"type": "live-page", "index": ALL}, "children"),
+        Output("board-seen", "data"),
+        Input("board-refresh", "n_intervals"),
+        Input("board-limits", "data"),
+        State("url", "pathname"),
+        State("repeat-filter", "value"),
+        State("board-seen", "data"),
+        State({"type": "board-column", "index": ALL}, "id"),
+        State({"type": "board-summary", "index": ALL}, "id"),
+        State({"type": "live-page", "index": ALL}, "id"),
+    )
+    def refresh_page(_, limits, pathname, repeat_filter, seen, column_ids, summary_ids, page_ids):
+        """Re-render the parts of the page whose tasks, or shown cards, changed since it was last checked"""
+        view = store.view
+        seen = seen or {}
+        limits = limits or default_limits()
+        if seen.get("version") == view.version and seen.get("pathname") == pathname and seen.get("limits") == limits:
+            raise PreventUpdate
+        signatures = {}
+        column_updates, summary_updates, page_updates = [], [], []
+        if column_ids:
+            current_tasks = filter_tasks(view.tasks, repeat_filter)
+            columns = group_by_status(current_tasks)
+            colors = dict(status_columns)
+            for column_id in column_ids:
+                status = column_id["index"]
+                signatures[status] = column_signature(view, columns[status], limits[status])
+                if seen.get("pathname") == pathname and seen.get("signatures", {}).get(status) == signatures[status]:
+                    column_updates.append(dash.no_update)
+                else:
+                    column_updates.append(layout_column(status, colors[status], columns[status], limits[status]))
+            summary_updates = [layout_repeat_summary(current_tasks) for _ in summary_ids]
+        if page_ids:
+            signatures["page"] = page_signature(view, pathname)
+            if seen.get("pathname") == pathname and seen.get("signatures", {}).get("page") == signatures["page"]:
+                page_updates = [dash.no_update for _ in page_ids]
+            else:
+                page = layout_statistics() if pathname == "/statistics" else layout_task_details(re.match(r"/task/(.+)", pathname).group(1))
+                page_updates = [page for _ in page_ids]
+        return column_updates, summary_updates, page_updates, {
+            "version": view.version, "pathname": pathname, "limits": limits, "signatures": signatures,
+        }
+
+    @app.server.route("/healthz")
+    def healthz():
+        """Liveness: the server answers requests"""
+        return {"status": "ok"}
 
-    def open_browser():
-        webbrowser.open_new("http://127.0.0.1:8050/")
+    @app.server.route("/readyz")
+    def readyz():
+        """Readiness: the project is loaded and followed, so pages show current tasks"""
+        view = store.view
+        if not store.ready:
+            return {"status": "loading"}, 503
+        return {"status": "ready", "version": view.version, "tasks": len(view.tasks)}
 
-    Timer(1, open_browser).start()
-    app.run(debug=False)
+    return app
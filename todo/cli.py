@@ -1,16 +1,19 @@
 """Todo CLI."""
 
+import contextlib
+import io
+import json
+import shlex
 import signal
+import socket
 import sys
 import time
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import TYPE_CHECKING, Optional, List, Dict, Iterable
 
-import dateparser
 import typer
-import yaml
 from rich.console import Console
 from rich.table import Table
 from rich.prompt import Prompt, Confirm
@@ -23,9 +26,12 @@ from rich.progress import (
     TimeRemainingColumn,
 )
 from rich.text import Text
-from dateutil import parser
-from todo.board import launch_board
-import pandas as pd
+
+from todo import dates, journal, output, phrases, query, storage
+from todo.repository import TaskRepository
+
+if TYPE_CHECKING:
+    from todo import indexes
 
 app = typer.Typer()
 console = Console()
@@ -56,37 +62,229 @@ def get_todo_file() -> Path:
 
 TODO_FILE = get_todo_file()
 
+# While `todo batch` runs, every command works on this in-memory repository
+# and its changes are collected here instead of being saved (see batch()).
+# "changes" becomes None once a command asks for a full save.
+BATCH: Optional[Dict] = None
+
 
 def load_todos() -> Dict:
     """Load todos from the todo file"""
-    if not TODO_FILE.exists():
-        return {
-            "project": {
-                "name": "",
-                "description": "",
-                "prefix": "",
-                "next_task_number": 1,
-            },
-            "tasks": [],
-        }
-    with open(TODO_FILE, "r") as f:
-        return yaml.safe_load(f) or {
-            "project": {
-                "name": "",
-                "description": "",
-                "prefix": "",
-                "next_task_number": 1,
-            },
-            "tasks": [],
-        }
-
-
-def save_todos(todos: Dict):
-    """Save todos to the todo file"""
-    # Ensure the directory exists for the todo file
-    TODO_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(TODO_FILE, "w") as f:
-        yaml.dump(todos, f, sort_keys=False)
+    if BATCH is not None:
+        return BATCH["repo"].todos
+    return storage.load_document(TODO_FILE)
+
+
+def save_todos(todos: Dict, changes: Optional[List[Dict]] = None):
+    """
+    Save todos to the todo file.
+
+    `changes` describes what was modified as journal records (see todo.journal);
+    in journal mode only those are written. Without it the whole file is rewritten.
+    """
+    if BATCH is not None:
+        if changes is None or BATCH["changes"] is None:
+            BATCH["changes"] = None
+        else:
+            BATCH["changes"].extend(changes)
+        return
+    storage.save_document(TODO_FILE, todos, changes)
+
+
+def abort(message: str):
+    """Print an error and stop the command with a non-zero exit code"""
+    console.print(f"[red]Error:[/red] {message}")
+    raise typer.Exit(code=1)
+
+
+def load_repository() -> TaskRepository:
+    """Load todos from the todo file, indexed by task id"""
+    if BATCH is not None:
+        return BATCH["repo"]
+    return TaskRepository(load_todos())
+
+
+def load_project() -> Dict:
+    """Load the project settings, without the tasks when the backend allows it"""
+    if BATCH is not None:
+        return BATCH["repo"].todos["project"]
+    return storage.load_project(TODO_FILE)
+
+
+def load_index(index: "indexes.SidecarIndex", todos: Optional[Dict] = None):
+    """
+    The state of a sidecar index (see todo.indexes) for the project as
+    commands see it. `todos` is the project if the caller already loaded it,
+    to build the index from when it is missing or stale.
+    """
+    from todo import indexes
+
+    if BATCH is not None and BATCH["changes"] != []:
+        # Unsaved changes in this batch: index the in-memory project instead
+        return index.build(load_todos())
+    return indexes.get(index, TODO_FILE, load_todos() if BATCH is not None else todos)
+
+
+def find_task(repo: TaskRepository, task_id: str) -> Optional[Dict]:
+    """
+    Look a task up by id, accepting partially typed ids such as `12` or
+    `px-12` for PX-012. Aborts if a partial id matches several tasks.
+    """
+    task = repo.get(task_id)
+    if task is not None:
+        return task
+    from todo import trigram
+
+    matches = trigram.resolve_id(load_index(trigram.INDEX), task_id)
+    if len(matches) > 1:
+        shown = ", ".join(matches[:5]) + (", ..." if len(matches) > 5 else "")
+        abort(f"Task id '{task_id}' is ambiguous: {shown}")
+    return repo.get(matches[0]) if matches else None
+
+
+def use_sql() -> bool:
+    """Whether queries can run directly against the SQLite database"""
+    return BATCH is None and storage.backend(TODO_FILE) == "sqlite"
+
+
+def parse_filter(where: str):
+    """The parsed --where expression (see todo.filters), aborting on errors"""
+    from todo import filters
+
+    try:
+        return filters.parse(where)
+    except ValueError as e:
+        abort(f"Invalid filter '{where}': {e}")
+
+
+def query_tasks(
+    include_closed: bool = True, tag: Optional[str] = None, where: Optional[str] = None, todos: Optional[Dict] = None
+) -> List[Dict]:
+    """
+    Return the tasks in project order, optionally without completed and
+    cancelled ones and/or only those matching the tag query `tag` (see
+    todo.tagindex), which is answered from the tag index. With the SQLite
+    backend the tasks are read from the database.
+
+    `where` is a filter expression (see todo.filters). With the SQLite
+    backend it runs as SQL; otherwise its tag conditions join the tag query
+    and only the tasks the tag index returns are checked against the rest.
+
+    `todos` is the project if the caller already loaded it, so that it is
+    not read again.
+    """
+    from todo import sqlite_store
+
+    check = None
+    if where is not None:
+        from todo import filters
+
+        tree = parse_filter(where)
+        now = datetime.now()
+        if tag is None and use_sql():
+            condition, params = filters.to_sql(tree, now)
+            return sqlite_store.query_tasks(
+                sqlite_store.database_file(TODO_FILE), include_closed, where=condition, where_params=params
+            )
+        indexed, rest = filters.tag_query(tree)
+        if indexed is not None:
+            tag = indexed if tag is None else f"({tag}) & {indexed}"
+        if rest is not None:
+            check = filters.predicate(rest, now)
+    if tag is not None:
+        from todo import tagindex
+
+        try:
+            task_ids = tagindex.select(load_index(tagindex.INDEX, todos), tag, include_closed)
+        except ValueError as e:
+            abort(f"Invalid tag query '{tag}': {e}")
+        if use_sql():
+            tasks = sqlite_store.get_tasks(sqlite_store.database_file(TODO_FILE), task_ids)
+        else:
+            repo = load_repository() if todos is None else TaskRepository(todos)
+            tasks = [repo.get(task_id) for task_id in task_ids]
+    elif use_sql():
+        tasks = sqlite_store.query_tasks(sqlite_store.database_file(TODO_FILE), include_closed)
+    else:
+        tasks = (load_todos() if todos is None else todos)["tasks"]
+        if not include_closed:
+            tasks = [t for t in tasks if not t.get("completed", False) and t.get("status", "") != "cancelled"]
+    if check is not None:
+        tasks = [task for task in tasks if check(task)]
+    return tasks
+
+
+def iterate_tasks(
+    include_closed: bool = True, tag: Optional[str] = None, where: Optional[str] = None
+) -> Iterable[Dict]:
+    """Like query_tasks, but the SQLite backend reads the tasks a batch at a time as they are consumed"""
+    if tag is None and use_sql():
+        from todo import sqlite_store
+
+        condition, params = None, []
+        if where is not None:
+            from todo import filters
+
+            condition, params = filters.to_sql(parse_filter(where))
+        return sqlite_store.iter_tasks(
+            sqlite_store.database_file(TODO_FILE), include_closed, where=condition, where_params=params
+        )
+    return query_tasks(include_closed, tag, where)
+
+
+def format_option():
+    return typer.Option(
+        "table", "--format", help="Output format: table, or json, ndjson, csv or tsv streamed without colors"
+    )
+
+
+def sort_option():
+    return typer.Option(
+        None, "--sort", help="Sort by fields such as due,priority,-created (- for descending): "
+        + ", ".join(query.SORT_FIELDS)
+    )
+
+
+def limit_option():
+    return typer.Option(None, "--limit", "-n", min=1, help="Show at most this many tasks")
+
+
+def offset_option():
+    return typer.Option(None, "--offset", min=0, help="Skip this many tasks first")
+
+
+def page_option():
+    return typer.Option(None, "--page", min=1, help=f"Show this page of --limit tasks ({query.PAGE_SIZE} by default)")
+
+
+def paging(limit: Optional[int], offset: Optional[int], page: Optional[int]):
+    """(limit, offset) from --limit, --offset and --page, aborting on conflicting options"""
+    try:
+        return query.page_bounds(limit, offset, page)
+    except ValueError as e:
+        abort(str(e))
+
+
+def parse_sort(sort: Optional[str]):
+    """The parsed --sort option, aborting on unknown fields"""
+    if not sort:
+        return None
+    try:
+        return query.parse_sort(sort)
+    except ValueError as e:
+        abort(f"Invalid sort '{sort}': {e}")
+
+
+def print_page_footer(offset: int, shown: int, total: int):
+    if shown < total:
+        console.print(f"[dim]Showing {offset + 1}-{offset + shown} of {total} tasks[/dim]")
+
+
+def check_format(output_format: str):
+    """Abort on an unknown --format"""
+    error = output.check_format(output_format)
+    if error:
+        abort(error)
 
 
 def parse_due_date(date_str: str) -> Optional[datetime]:
@@ -94,7 +292,7 @@ def parse_due_date(date_str: str) -> Optional[datetime]:
     if not date_str:
         return None
 
-    parsed_date = dateparser.parse(date_str)
+    parsed_date = phrases.parse_date(date_str)
     if parsed_date:
         # Set time to end of day (23:59:59) for due dates
         parsed_date = parsed_date.replace(hour=23, minute=59, second=59)
@@ -133,8 +331,88 @@ def get_total_worked_time(work_sessions: List[Dict]) -> int:
     return sum(session["duration"] for session in work_sessions)
 
 
+def print_startup_report(value: bool):
+    """Print the per-package import cost of starting the CLI and exit."""
+    if not value:
+        return
+    from todo.startup import HEAVY_MODULES, measure_import_times, summarize_by_package
+
+    timings = measure_import_times("todo.cli")
+    totals = summarize_by_package(timings)
+    total_us = next((cumulative for name, _, cumulative in timings if name == "todo.cli"), 0)
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Package")
+    table.add_column("Import time", justify="right")
+    table.add_column("Share", justify="right")
+    for package, self_us in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:20]:
+        share = self_us / total_us * 100 if total_us else 0
+        table.add_row(package, f"{self_us / 1000:.1f} ms", f"{share:.1f}%")
+    console.print(table)
+    console.print(f"\nTotal startup import time: [bold]{total_us / 1000:.1f} ms[/bold]")
+
+    heavy = sorted(package for package in totals if package in HEAVY_MODULES)
+    if heavy:
+        console.print(f"[red]Heavy modules imported at startup:[/red] {', '.join(heavy)}")
+    else:
+        console.print("[green]✓[/green] No heavy modules imported at startup")
+    raise typer.Exit()
+
+
+# Commands that only read the project take the lock shared; commands that
+# hold it open for a long time manage locking themselves.
+READ_ONLY_COMMANDS = {"list", "show", "status", "search", "tags", "tag-tasks"}
+UNLOCKED_COMMANDS = {"board", "workon", "version", "help", "daemon"}
+
+LOCK_TIMEOUT = storage.DEFAULT_LOCK_TIMEOUT
+
+
+@app.callback()
+def main(
+    ctx: typer.Context,
+    startup_report: bool = typer.Option(
+        False,
+        "--startup-report",
+        help="Show how long each package takes to import when the CLI starts",
+        callback=print_startup_report,
+        is_eager=True,
+    ),
+    lock_timeout: float = typer.Option(
+        storage.DEFAULT_LOCK_TIMEOUT,
+        "--lock-timeout",
+        help="Seconds to wait for other todo processes working on the same project (env: TODO_LOCK_TIMEOUT)",
+    ),
+):
+    """
+    A rich CLI todo app with project management and task tagging.
+    """
+    global LOCK_TIMEOUT
+    LOCK_TIMEOUT = lock_timeout
+    command = ctx.invoked_subcommand
+    if command in UNLOCKED_COMMANDS or (command != "init" and not storage.project_exists(TODO_FILE)):
+        return
+    # Hold the project lock across the whole load -> modify -> save cycle
+    try:
+        ctx.with_resource(
+            storage.lock(TODO_FILE, lock_timeout, shared=command in READ_ONLY_COMMANDS)
+        )
+    except storage.LockTimeout as e:
+        abort(str(e))
+
+
 @app.command()
-def init():
+def init(
+    use_journal: bool = typer.Option(
+        False,
+        "--journal",
+        help="Append changes to todo.journal instead of rewriting todo.yaml on every change",
+    ),
+    backend: str = typer.Option(
+        "yaml",
+        "--backend",
+        help="Storage backend: yaml (todo.yaml) or sqlite (todo.db, for large projects)",
+    ),
+):
     """
     Initialize a new todo list with project details.
 
@@ -145,12 +423,18 @@ def init():
     - Add todo.yaml to .gitignore if in a git repository
 
     If a todo list already exists, you will be asked for confirmation before resetting.
+    Use --journal for large projects: changes are then appended to todo.journal and
+    folded back into todo.yaml by 'todo compact'.
+    Use --backend sqlite to keep tasks in an indexed todo.db database instead.
     """
     # Update TODO_FILE to ensure we're always using the local file for init
     global TODO_FILE
     TODO_FILE = Path("todo.yaml")
-    
-    if TODO_FILE.exists():
+
+    if backend not in storage.BACKENDS:
+        abort(f"Invalid backend. Must be one of: {', '.join(storage.BACKENDS)}")
+
+    if storage.project_exists(TODO_FILE):
         if not Confirm.ask("A todo list already exists. Do you want to reset it?"):
             raise typer.Abort()
 
@@ -167,11 +451,14 @@ def init():
         },
         "tasks": [],
     }
-    save_todos(todos)
+    if use_journal:
+        todos["project"]["journal"] = True
+    storage.create_document(TODO_FILE, todos, backend)
+    todo_file = storage.active_file(TODO_FILE)
     console.print("[green]✓[/green] Initialized new todo list!")
     console.print(f"Project: [bold]{project_name}[/bold]")
     console.print(f"Description: {project_description}")
-    console.print(f"Todo file location: {TODO_FILE}")
+    console.print(f"Todo file location: {todo_file}")
     
     # Check if current directory is a git repository
     if Path(".git").is_dir():
@@ -183,20 +470,20 @@ def init():
             with open(gitignore_path, "r") as f:
                 gitignore_content = f.read()
             
-            # Check if todo.yaml is already in .gitignore
-            if "todo.yaml" not in gitignore_content:
-                # Add todo.yaml to .gitignore
+            # Check if the todo file is already in .gitignore
+            if todo_file.name not in gitignore_content:
+                # Add the todo file to .gitignore
                 with open(gitignore_path, "a") as f:
                     # Add a newline if the file doesn't end with one
                     if gitignore_content and not gitignore_content.endswith("\n"):
                         f.write("\n")
-                    f.write("# Todo CLI file\ntodo.yaml\n")
-                console.print("[green]✓[/green] Added todo.yaml to .gitignore")
+                    f.write(f"# Todo CLI file\n{todo_file.name}\n")
+                console.print(f"[green]✓[/green] Added {todo_file.name} to .gitignore")
         else:
-            # Create new .gitignore file with todo.yaml
+            # Create new .gitignore file with the todo file
             with open(gitignore_path, "w") as f:
-                f.write("# Todo CLI file\ntodo.yaml\n")
-            console.print("[green]✓[/green] Created .gitignore with todo.yaml")
+                f.write(f"# Todo CLI file\n{todo_file.name}\n")
+            console.print(f"[green]✓[/green] Created .gitignore with {todo_file.name}")
 
 
 @app.command()
@@ -217,13 +504,11 @@ def add():
     The task will be automatically assigned a task id using the project prefix.
     Example: For project prefix 'PROJ', first task will be 'PROJ-001'
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     if not todos["project"]["prefix"]:
-        console.print(
-            "[red]Error:[/red] Project prefix not set. Run 'todo init' first."
-        )
-        raise typer.Abort()
+        abort("Project prefix not set. Run 'todo init' first.")
 
     title = Prompt.ask("Task title")
     description = Prompt.ask("Description", default="")
@@ -257,9 +542,12 @@ def add():
         ],
         "repeat": repeat if repeat else None,
     }
+    recurrence = phrases.compile_rule(repeat)
+    if recurrence:
+        task["recurrence"] = recurrence
 
-    todos["tasks"].append(task)
-    save_todos(todos)
+    repo.add(task)
+    save_todos(todos, [journal.add_task_op(task), journal.project_op(todos, "next_task_number")])
     console.print(f"[green]✓[/green] Task [bold]{task_id}[/bold] added successfully!")
 
 
@@ -268,11 +556,9 @@ def tags():
     """
     List all unique tags across all tasks, along with the number of tasks for each tag.
     """
-    todos = load_todos()
-    tag_counts = {}
-    for task in todos["tasks"]:
-        for tag in (task.get("tags") or []):
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    from todo import tagindex
+
+    tag_counts = tagindex.counts(load_index(tagindex.INDEX))
     if tag_counts:
         console.print("[bold]Tags:[/bold]")
         for t in sorted(tag_counts):
@@ -282,12 +568,36 @@ def tags():
 
 
 @app.command()
-def tag_tasks(tag: str):
+def tag_tasks(
+    tag: str = typer.Argument(..., help="Tag, or tag query such as 'infra & !blocked'"),
+    sort: Optional[str] = sort_option(),
+    limit: Optional[int] = limit_option(),
+    offset: Optional[int] = offset_option(),
+    page: Optional[int] = page_option(),
+    output_format: str = format_option(),
+):
     """
     List all tasks associated with a given tag.
-    """
-    todos = load_todos()
-    filtered = [t for t in todos["tasks"] if tag in (t.get("tags") or [])]
+
+    The tag can also be a query combining tags with & (and), | (or),
+    ! (not) and parentheses.
+    With --format, tasks are written as JSON, NDJSON, CSV or TSV records instead of a table.
+    --sort, --limit, --offset and --page work as for the list command.
+
+    Example:
+        todo tag-tasks urgent
+        todo tag-tasks 'infra & !blocked | urgent'
+        todo tag-tasks urgent --format csv
+        todo tag-tasks urgent --sort due --limit 10
+    """
+    check_format(output_format)
+    fields = parse_sort(sort)
+    limit, offset = paging(limit, offset, page)
+    matching = query_tasks(tag=tag)
+    filtered = [task for task in query.select(matching, fields, limit, offset)]
+    if output_format != "table":
+        output.write_records(map(output.task_record, filtered), output_format, output.TASK_FIELDS)
+        return
     if not filtered:
         console.print(f"[yellow]No tasks found with tag '{tag}'.[/yellow]")
         return
@@ -298,7 +608,7 @@ def tag_tasks(tag: str):
     table.add_column("Priority")
     table.add_column("Due Date")
     for task in filtered:
-        due_date = format_due_date(parser.parse(task["due_date"])) if task.get("due_date") else "-"
+        due_date = format_due_date(dates.field(task, "due_date"))
         table.add_row(
             task["task_id"],
             task["title"],
@@ -307,6 +617,7 @@ def tag_tasks(tag: str):
             due_date,
         )
     console.print(table)
+    print_page_footer(offset, len(filtered), len(matching))
 
 
 @app.command()
@@ -320,29 +631,62 @@ def list(
     tag: Optional[str] = typer.Option(
         None,
         "--tag",
-        help="Filter tasks by tag"
+        help="Filter tasks by tag, or by a tag query such as 'infra & !blocked | urgent'"
     ),
+    where: Optional[str] = typer.Option(
+        None, "--where", "-w", help="Filter expression, e.g. 'priority=high and due<+7d and worked>2h'"
+    ),
+    sort: Optional[str] = sort_option(),
+    limit: Optional[int] = limit_option(),
+    offset: Optional[int] = offset_option(),
+    page: Optional[int] = page_option(),
+    output_format: str = format_option(),
 ):
     """
     List all pending tasks with project information.
     By default, only shows pending tasks. Use -a/--all to show all tasks (including completed and cancelled).
-    Use --tag to filter tasks by a specific tag.
+    Use --tag to filter tasks by a specific tag, or by a query combining tags
+    with & (and), | (or), ! (not) and parentheses.
     Displays tags for each task.
-    """
-    todos = load_todos()
+    Use --where to filter on task fields with an expression such as
+    "priority=high and due<+7d and type in (bugfix,test) and worked>2h"
+    (fields: id, title, description, type, status, priority, tag, due,
+    created, worked, sessions, notes; operators: = != < <= > >= ~ !~ in;
+    combined with and, or, not and parentheses).
+    Use --sort to order tasks by fields such as due,priority,-created (a
+    leading - sorts descending; tasks without a value come last), and
+    --limit with --offset or --page to show one page of them.
+    Use --format json, ndjson, csv or tsv to stream the tasks as records for scripts.
 
-    # Show project info
-    if todos["project"]["name"]:
-        console.print(f"\n[bold blue]Project:[/bold blue] {todos['project']['name']}")
-        console.print(f"[dim]Prefix:[/dim] {todos['project']['prefix']}\n")
+    Example:
+        todo list --where "priority=high and due<+7d"
+        todo list -a --where "tag=infra and not status=completed and worked>2h"
+        todo list --sort due,priority --limit 20
+        todo list -a --sort -created --page 2
+        todo list -a --format ndjson | jq .title
+    """
+    check_format(output_format)
+    fields = parse_sort(sort)
+    limit, offset = paging(limit, offset, page)
+    if output_format != "table":
+        tasks = query.select(iterate_tasks(include_closed=all, tag=tag or None, where=where), fields, limit, offset)
+        output.write_records(map(output.task_record, tasks), output_format, output.TASK_FIELDS)
+        return
+
+    if use_sql():
+        # Only the project settings: the tasks are queried from the database
+        todos, project = None, load_project()
+    else:
+        todos = load_todos()
+        project = todos["project"]
 
-    tasks = todos["tasks"]
-    if tag:
-        tasks = [t for t in tasks if tag in (t.get("tags") or [])]
+    # Show project info
+    if project["name"]:
+        console.print(f"\n[bold blue]Project:[/bold blue] {project['name']}")
+        console.print(f"[dim]Prefix:[/dim] {project['prefix']}\n")
 
-    # Filter tasks
-    if not all:
-        tasks = [t for t in tasks if not t.get("completed", False) and t.get("status", "") != "cancelled"]
+    matching = query_tasks(include_closed=all, tag=tag or None, where=where, todos=todos)
+    tasks = [task for task in query.select(matching, fields, limit, offset)]
 
     if not tasks:
         console.print("[yellow]No tasks found.[/yellow]")
@@ -362,7 +706,7 @@ def list(
     for task in tasks:
         # Ensure tags are sorted for display consistency
         tags_list = sorted(task.get("tags") or [])
-        due_date_str = format_due_date(parser.parse(task["due_date"])) if task.get("due_date") else "-"
+        due_date_str = format_due_date(dates.field(task, "due_date"))
         total_time = format_duration(sum(ws["duration"] for ws in task.get("work_sessions", [])))
         # Improved status display
         if task.get("status") == "doing":
@@ -389,6 +733,7 @@ def list(
             tags_text,
         )
     console.print(table)
+    print_page_footer(offset, len(tasks), len(matching))
 
 
 @app.command()
@@ -397,18 +742,17 @@ def show(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)")
     Show detailed information about a specific task.
 
     Arguments:
-        task_id: The task id (e.g., PROJ-001, case-insensitive)
+        task_id: The task id (e.g., PROJ-001, case-insensitive; PROJ-1 or 1 also work)
 
     Example:
         todo show PROJ-001
     """
-    todos = load_todos()
+    repo = load_repository()
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = find_task(repo, task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Create a panel to display task information
     console.print(
@@ -440,8 +784,8 @@ def show(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)")
             console.print(f"[dim]{i}.[/dim] {note}")
 
     # Due Date
-    if task.get("due_date"):
-        due_date = parser.parse(task["due_date"])
+    due_date = dates.field(task, "due_date")
+    if due_date:
         now = datetime.now()
         due_date_str = format_due_date(due_date)
 
@@ -473,7 +817,7 @@ def show(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)")
 
         table = Table("Date", "Duration", "Status", show_header=True, box=None)
         for session in sorted(task["work_sessions"], key=lambda x: x["started_at"]):
-            start_time = parser.parse(session["started_at"])
+            start_time = dates.parse(session["started_at"])
             duration = format_duration(session["duration"])
             status = (
                 "[yellow]Interrupted[/yellow]"
@@ -492,12 +836,13 @@ def show(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)")
     if task.get("status_history"):
         console.print("\n[bold]Status History:[/bold]")
         for entry in task["status_history"]:
-            ts = parser.parse(entry["timestamp"]).strftime('%Y-%m-%d %H:%M')
+            ts = dates.parse(entry["timestamp"]).strftime('%Y-%m-%d %H:%M')
             console.print(f"- {entry['status']} at [dim]{ts}[/dim]")
 
     # Created Date
-    created_at = parser.parse(task["created_at"])
-    console.print(f"\nCreated: {created_at.strftime('%Y-%m-%d %H:%M')}")
+    created_at = dates.field(task, "created_at")
+    if created_at:
+        console.print(f"\nCreated: {created_at.strftime('%Y-%m-%d %H:%M')}")
 
 
 @app.command()
@@ -511,18 +856,30 @@ def complete(task_id: str):
     Example:
         todo complete PROJ-001
     """
-    todos = load_todos()
+    if use_sql():
+        from todo import indexes, sqlite_store
 
-    for task in todos["tasks"]:
-        if task["task_id"].lower() == task_id.lower():
-            task["completed"] = True
-            save_todos(todos)
+        # Single indexed UPDATE, without loading the project
+        before = indexes.signature(TODO_FILE)
+        if sqlite_store.complete_task(sqlite_store.database_file(TODO_FILE), task_id):
+            indexes.after_save(TODO_FILE, None, [{"op": "set", "task_id": task_id, "values": {"completed": True}}], before)
             console.print(
                 f"[green]✓[/green] Task [bold]{task_id}[/bold] marked as complete!"
             )
             return
+        abort(f"Task with id [bold]{task_id}[/bold] not found!")
+
+    repo = load_repository()
+    task = repo.get(task_id)
+    if task:
+        task["completed"] = True
+        save_todos(repo.todos, [journal.set_op(task, "completed")])
+        console.print(
+            f"[green]✓[/green] Task [bold]{task_id}[/bold] marked as complete!"
+        )
+        return
 
-    console.print(f"[red]Error:[/red] Task with id [bold]{task_id}[/bold] not found!")
+    abort(f"Task with id [bold]{task_id}[/bold] not found!")
 
 
 @app.command()
@@ -530,14 +887,14 @@ def cancel(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)
     """
     Cancel a task by its task id (sets status to cancelled).
     """
-    todos = load_todos()
-    for task in todos["tasks"]:
-        if task["task_id"].lower() == task_id.lower():
-            task["status"] = "cancelled"
-            save_todos(todos)
-            console.print(f"[yellow]Task [bold]{task_id}[/bold] marked as cancelled.[/yellow]")
-            return
-    console.print(f"[red]Error:[/red] Task with id [bold]{task_id}[/bold] not found!")
+    repo = load_repository()
+    task = repo.get(task_id)
+    if task:
+        task["status"] = "cancelled"
+        save_todos(repo.todos, [journal.set_op(task, "status")])
+        console.print(f"[yellow]Task [bold]{task_id}[/bold] marked as cancelled.[/yellow]")
+        return
+    abort(f"Task with id [bold]{task_id}[/bold] not found!")
 
 
 @app.command()
@@ -545,14 +902,12 @@ def delete(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)
     """
     Delete a task by its task id (completely removes it from the list).
     """
-    todos = load_todos()
-    initial_count = len(todos["tasks"])
-    todos["tasks"] = [t for t in todos["tasks"] if t["task_id"].lower() != task_id.lower()]
-    if len(todos["tasks"]) < initial_count:
-        save_todos(todos)
+    repo = load_repository()
+    if repo.delete(task_id):
+        save_todos(repo.todos, [journal.delete_task_op(task_id)])
         console.print(f"[red]Task [bold]{task_id}[/bold] deleted.[/red]")
     else:
-        console.print(f"[red]Error:[/red] Task with id [bold]{task_id}[/bold] not found!")
+        abort(f"Task with id [bold]{task_id}[/bold] not found!")
 
 
 @app.command()
@@ -566,7 +921,7 @@ def workon(
     Work on a specific task with an interactive timer.
 
     Arguments:
-        task_id: The task id (e.g., PROJ-001, case-insensitive)
+        task_id: The task id (e.g., PROJ-001, case-insensitive; PROJ-1 or 1 also work)
         duration: Work session duration in minutes (default: 25)
 
     Features:
@@ -578,18 +933,14 @@ def workon(
         todo workon PROJ-001
         todo workon PROJ-001 --duration 45
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = None
-    for t in todos["tasks"]:
-        if t["task_id"].lower() == task_id.lower():
-            task = t
-            break
+    task = find_task(repo, task_id)
 
     if not task:
-        console.print(f"[red]Error:[/red] Task with id [bold]{task_id}[/bold] not found!")
-        return
+        abort(f"Task with id [bold]{task_id}[/bold] not found!")
 
     # Initialize work_sessions if it doesn't exist
     if "work_sessions" not in task:
@@ -662,8 +1013,20 @@ def save_work_session(
         "duration": duration,
         "interrupted": interrupted,
     }
-    task["work_sessions"].append(session)
-    save_todos(todos)
+    # The timer ran without holding the lock: reload the project so changes
+    # made by other commands in the meantime are not overwritten.
+    try:
+        with storage.lock(TODO_FILE, LOCK_TIMEOUT):
+            repo = load_repository()
+            todos = repo.todos
+            task = repo.get(task["task_id"])
+            if not task:
+                console.print("[red]Error:[/red] Task was deleted while you were working on it!")
+                return
+            task.setdefault("work_sessions", []).append(session)
+            save_todos(todos, [journal.append_op(task, "work_sessions")])
+    except storage.LockTimeout as e:
+        console.print(f"[red]Error:[/red] Work session not saved: {e}")
 
 
 # Create a note command group
@@ -689,13 +1052,13 @@ def add_note(
         todo note add PROJ-001 "Remember to update documentation"
         todo note add PROJ-001  # Will prompt for note text
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Initialize notes list if it doesn't exist
     if "notes" not in task:
@@ -713,7 +1076,7 @@ def add_note(
     # Add the new note to the list
     if text:
         task["notes"].append(text)
-        save_todos(todos)
+        save_todos(todos, [journal.append_op(task, "notes")])
         console.print(f"[green]✓[/green] Added new note to task {task_id}")
 
 
@@ -728,13 +1091,13 @@ def reset_notes(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ
     Example:
         todo note reset PROJ-001
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Check if task has any notes
     if not task.get("notes"):
@@ -749,7 +1112,7 @@ def reset_notes(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ
     # Confirm reset
     if Confirm.ask("\nAre you sure you want to reset all notes?", default=False):
         task["notes"] = []
-        save_todos(todos)
+        save_todos(todos, [journal.set_op(task, "notes")])
         console.print("[green]✓[/green] All notes have been cleared.")
     else:
         console.print("Operation cancelled.")
@@ -757,68 +1120,25 @@ def reset_notes(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ
 
 def calculate_project_stats(todos: Dict) -> Dict:
     """Calculate comprehensive project statistics"""
-    stats = {
-        "total_tasks": len(todos["tasks"]),
-        "completed_tasks": 0,
-        "pending_tasks": 0,
-        "high_priority": 0,
-        "medium_priority": 0,
-        "low_priority": 0,
-        "overdue_tasks": 0,
-        "due_today": 0,
-        "no_due_date": 0,
-        "total_work_time": 0,
-        "completed_work_time": 0,
-        "pending_work_time": 0,
-        "interrupted_sessions": 0,
-        "total_sessions": 0,
-    }
-
-    now = datetime.now()
+    from todo import columns, stats
 
-    for task in todos["tasks"]:
-        # Task completion stats
-        if task.get("completed"):
-            stats["completed_tasks"] += 1
-        elif task.get("status") == "cancelled":
-            continue
-        else:
-            stats["pending_tasks"] += 1
-
-        # Priority stats
-        stats[f"{task['priority']}_priority"] += 1
-
-        # Due date stats
-        if task.get("due_date"):
-            due_date = datetime.fromisoformat(task["due_date"])
-            if due_date.date() == now.date():
-                stats["due_today"] += 1
-            elif due_date < now:
-                stats["overdue_tasks"] += 1
-        else:
-            stats["no_due_date"] += 1
-
-        # Work session stats
-        if "work_sessions" in task:
-            task_work_time = get_total_worked_time(task["work_sessions"])
-            stats["total_work_time"] += task_work_time
-            if task.get("completed"):
-                stats["completed_work_time"] += task_work_time
-            else:
-                stats["pending_work_time"] += task_work_time
+    return stats.summarize(columns.INDEX.build(todos))
 
-            stats["total_sessions"] += len(task["work_sessions"])
-            stats["interrupted_sessions"] += sum(
-                1
-                for session in task["work_sessions"]
-                if session.get("interrupted", False)
-            )
 
-    return stats
+# Breakdowns `todo status --by` can show
+STATUS_BREAKDOWNS = ["type", "tag", "week"]
 
 
 @app.command()
-def status():
+def status(
+    by: Optional[List[str]] = typer.Option(
+        None, "--by", help="Also break tasks and time down by type, tag or week (repeatable)"
+    ),
+    verify: bool = typer.Option(
+        False, "--verify", help="Recount the statistics from the tasks and report any drift"
+    ),
+    output_format: str = format_option(),
+):
     """
     Show detailed project status and statistics.
 
@@ -829,21 +1149,68 @@ def status():
     - Due date statistics
     - Work session analytics
     - Time tracking summary
-    """
-    todos = load_todos()
+    - With --by, breakdowns per task type, per tag and/or per week
+
+    The statistics are counters kept up to date by every change (with the
+    SQLite backend, one aggregate query unless --by or --verify). With
+    --verify they are also recounted from the tasks; if they drifted, the
+    differences are listed, the counters are rebuilt and the exit code is 1.
 
-    if not todos["project"]["name"]:
+    With --format json (or ndjson, csv, tsv) the statistics are written as
+    one object, with the --by breakdowns under by_type, by_tag and by_week
+    (JSON and NDJSON only).
+
+    Example:
+        todo status
+        todo status --by type --by week
+        todo status --verify
+        todo status --format json
+    """
+    breakdowns = by or []
+    for breakdown in breakdowns:
+        if breakdown not in STATUS_BREAKDOWNS:
+            abort(f"Unknown breakdown '{breakdown}'. Choose from: {', '.join(STATUS_BREAKDOWNS)}")
+    check_format(output_format)
+    if output_format in ("csv", "tsv") and breakdowns:
+        abort("--by needs --format table, json or ndjson")
+    if output_format != "table" and verify:
+        abort("--verify needs --format table")
+    project = load_project()
+
+    if not project["name"]:
         console.print("[yellow]No project initialized. Run 'todo init' first.[/yellow]")
         return
 
-    stats = calculate_project_stats(todos)
+    now = datetime.now()
+    if use_sql() and not breakdowns and not verify:
+        # One aggregate query: no tasks loaded, no counters to keep
+        from todo import sqlite_store
+
+        state = None
+        stats = sqlite_store.project_stats(sqlite_store.database_file(TODO_FILE))
+    else:
+        from todo import columns
+
+        state = load_index(columns.INDEX)
+        stats = columns.summary(state, now)
+    if breakdowns or verify:
+        # NumPy, only for what the counters do not hold
+        from todo import stats as columnar
+
+    if output_format != "table":
+        result = dict(stats)
+        for breakdown in dict.fromkeys(breakdowns):
+            by = {"type": columnar.by_type, "tag": columnar.by_tag, "week": columnar.by_week}[breakdown]
+            result[f"by_{breakdown}"] = by(state)
+        output.write_object(result, output_format)
+        return
 
     # Project Header
     console.print("\n[bold blue]Project Status[/bold blue]")
     console.print("═" * 50)
-    console.print(f"[bold]Project:[/bold] {todos['project']['name']}")
-    console.print(f"[bold]Description:[/bold] {todos['project']['description']}")
-    console.print(f"[bold]Task Prefix:[/bold] {todos['project']['prefix']}")
+    console.print(f"[bold]Project:[/bold] {project['name']}")
+    console.print(f"[bold]Description:[/bold] {project['description']}")
+    console.print(f"[bold]Task Prefix:[/bold] {project['prefix']}")
 
     # Task Progress
     console.print("\n[bold]Task Progress[/bold]")
@@ -919,6 +1286,67 @@ def status():
         sessions_table.add_row("Time on Pending Tasks", pending_time)
         console.print(sessions_table)
 
+    for breakdown in dict.fromkeys(breakdowns):
+        if breakdown == "week":
+            console.print("\n[bold]Work per Week[/bold]")
+            console.print("─" * 30)
+            week_table = Table(show_header=True, header_style="bold magenta", box=None)
+            week_table.add_column("Week of")
+            week_table.add_column("Sessions", justify="right")
+            week_table.add_column("Interrupted", justify="right")
+            week_table.add_column("Time Worked", justify="right")
+            for row in columnar.by_week(state):
+                week_table.add_row(
+                    row["week"].isoformat(),
+                    str(row["sessions"]),
+                    str(row["interrupted"]),
+                    format_duration(row["work_time"]),
+                )
+            console.print(week_table if week_table.row_count else "[dim]No work sessions yet.[/dim]")
+            continue
+        rows = columnar.by_type(state) if breakdown == "type" else columnar.by_tag(state)
+        console.print(f"\n[bold]By {breakdown.capitalize()}[/bold]")
+        console.print("─" * 30)
+        breakdown_table = Table(show_header=True, header_style="bold magenta", box=None)
+        breakdown_table.add_column(breakdown.capitalize())
+        breakdown_table.add_column("Tasks", justify="right")
+        breakdown_table.add_column("Open", justify="right")
+        breakdown_table.add_column("Completed", justify="right")
+        breakdown_table.add_column("Cancelled", justify="right")
+        breakdown_table.add_column("Time Worked", justify="right")
+        for row in rows:
+            style = TASK_TYPE_COLORS.get(row["name"], "white") if breakdown == "type" else "white"
+            breakdown_table.add_row(
+                Text(str(row["name"]), style=style),
+                str(row["tasks"]),
+                str(row["open"]),
+                str(row["completed"]),
+                str(row["cancelled"]),
+                format_duration(row["work_time"]),
+            )
+        console.print(breakdown_table if breakdown_table.row_count else f"[dim]No {breakdown}s yet.[/dim]")
+
+    if verify:
+        # Recount from the tasks, with no counters involved
+        recounted = columnar.summarize(columns.INDEX.build(load_todos()), now)
+        drift = [name for name in recounted if stats[name] != recounted[name]]
+        if not drift:
+            console.print("\n[green]✓[/green] Statistics verified: the counters match a full recount")
+        else:
+            console.print("\n[bold red]Statistics Drift[/bold red]")
+            console.print("─" * 30)
+            drift_table = Table(show_header=True, header_style="bold magenta", box=None)
+            drift_table.add_column("Counter")
+            drift_table.add_column("Kept", justify="right")
+            drift_table.add_column("Recounted", justify="right")
+            for name in drift:
+                drift_table.add_row(name, str(stats[name]), str(recounted[name]))
+            console.print(drift_table)
+            from todo import indexes
+
+            indexes.discard(columns.INDEX, TODO_FILE)
+            abort("Statistics drifted from the tasks; the counters will be rebuilt on the next run")
+
     console.print("\n[dim]Use 'todo list' for detailed task information[/dim]")
 
 
@@ -942,19 +1370,19 @@ def add_tag(
     Example:
         todo update tag add PROJ-001 urgent
     """
-    todos = load_todos()
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    repo = load_repository()
+    todos = repo.todos
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
     tags = set(task.get("tags") or [])  # Ensure tags is always a set, even if None
     if tag in tags:
         console.print(f"[yellow]Task already has tag '{tag}'.[/yellow]")
         return
     tags.add(tag)
     # Always store tags as a non-empty list, or remove the field if empty
-    task["tags"] = sorted(list(tags)) if tags else []
-    save_todos(todos)
+    task["tags"] = sorted(tags) if tags else []
+    save_todos(todos, [journal.set_op(task, "tags")])
     console.print(f"[green]✓[/green] Tag '[bold]{tag}[/bold]' added to task [bold]{task_id}[/bold].")
 
 
@@ -969,19 +1397,19 @@ def remove_tag(
     Example:
         todo update tag remove PROJ-001 urgent
     """
-    todos = load_todos()
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    repo = load_repository()
+    todos = repo.todos
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
     tags = set(task.get("tags") or [])  # Ensure tags is always a set, even if None
     if tag not in tags:
         console.print(f"[yellow]Task does not have tag '{tag}'.[/yellow]")
         return
     tags.remove(tag)
     # Always store tags as a non-empty list, or remove the field if empty
-    task["tags"] = sorted(list(tags)) if tags else []
-    save_todos(todos)
+    task["tags"] = sorted(tags) if tags else []
+    save_todos(todos, [journal.set_op(task, "tags")])
     console.print(f"[green]✓[/green] Tag '[bold]{tag}[/bold]' removed from task [bold]{task_id}[/bold].")
 
 
@@ -1003,13 +1431,13 @@ def update_type(
         todo update type PROJ-001 feature
         todo update type PROJ-001  # Will prompt for type
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Show current type and get new one
     current_type = task["type"]
@@ -1020,14 +1448,11 @@ def update_type(
     if new_type is None:
         new_type = Prompt.ask("New type", choices=TASK_TYPES, default=current_type)
     elif new_type not in TASK_TYPES:
-        console.print(
-            f"[red]Error:[/red] Invalid type. Must be one of: {', '.join(TASK_TYPES)}"
-        )
-        return
+        abort(f"Invalid type. Must be one of: {', '.join(TASK_TYPES)}")
 
     # Update the type
     task["type"] = new_type
-    save_todos(todos)
+    save_todos(todos, [journal.set_op(task, "type")])
     console.print(
         f"[green]✓[/green] Updated task type to: [{TASK_TYPE_COLORS[new_type]}]{new_type}[/{TASK_TYPE_COLORS[new_type]}]"
     )
@@ -1051,13 +1476,13 @@ def update_priority(
         todo update priority PROJ-001 high
         todo update priority PROJ-001  # Will prompt for priority
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Show current priority and get new one
     priority_colors = {"high": "red", "medium": "yellow", "low": "blue"}
@@ -1071,14 +1496,11 @@ def update_priority(
             "New priority", choices=["low", "medium", "high"], default=current_priority
         )
     elif new_priority not in ["low", "medium", "high"]:
-        console.print(
-            "[red]Error:[/red] Invalid priority. Must be one of: low, medium, high"
-        )
-        return
+        abort("Invalid priority. Must be one of: low, medium, high")
 
     # Update the priority
     task["priority"] = new_priority
-    save_todos(todos)
+    save_todos(todos, [journal.set_op(task, "priority")])
     console.print(
         f"[green]✓[/green] Updated task priority to: [{priority_colors[new_priority]}]{new_priority}[/{priority_colors[new_priority]}]"
     )
@@ -1103,18 +1525,18 @@ def update_due_date(
         todo update due PROJ-001 "next friday"
         todo update due PROJ-001 clear    # Remove due date
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Show current due date
     current_due = None
     if task.get("due_date"):
-        current_due = datetime.fromisoformat(task["due_date"])
+        current_due = dates.field(task, "due_date")
         console.print(f"\nCurrent due date: {format_due_date(current_due)}")
     else:
         console.print("\nNo current due date")
@@ -1128,7 +1550,7 @@ def update_due_date(
     # Handle clearing the due date
     if new_date.lower() == "clear":
         task["due_date"] = None
-        save_todos(todos)
+        save_todos(todos, [journal.set_op(task, "due_date")])
         console.print("[green]✓[/green] Removed due date")
         return
 
@@ -1136,10 +1558,9 @@ def update_due_date(
     if new_date:
         new_due = parse_due_date(new_date)
         if not new_due:
-            console.print("[red]Error:[/red] Invalid date format")
-            return
+            abort("Invalid date format")
         task["due_date"] = new_due.isoformat()
-        save_todos(todos)
+        save_todos(todos, [journal.set_op(task, "due_date")])
         console.print(
             f"[green]✓[/green] Updated due date to: {format_due_date(new_due)}"
         )
@@ -1163,13 +1584,13 @@ def update_title(
         todo update title PROJ-001 "New task title"
         todo update title PROJ-001  # Will prompt for title
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Show current title and get new one
     console.print(f"\nCurrent title: {task['title']}")
@@ -1179,7 +1600,7 @@ def update_title(
 
     # Update the title
     task["title"] = new_title
-    save_todos(todos)
+    save_todos(todos, [journal.set_op(task, "title")])
     console.print(f"[green]✓[/green] Updated task title to: {new_title}")
 
 
@@ -1201,13 +1622,13 @@ def update_description(
         todo update description PROJ-001 "New task description"
         todo update description PROJ-001  # Will prompt for description
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
 
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
 
     # Show current description and get new one
     if task.get("description"):
@@ -1222,7 +1643,7 @@ def update_description(
 
     # Update the description
     task["description"] = new_description
-    save_todos(todos)
+    save_todos(todos, [journal.set_op(task, "description")])
     console.print(f"[green]✓[/green] Updated task description")
 
 
@@ -1244,19 +1665,18 @@ def update_status(
         todo update status PROJ-001 doing
         todo update status PROJ-001  # Will prompt for status
     """
-    todos = load_todos()
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    repo = load_repository()
+    todos = repo.todos
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
     valid_statuses = ["pending", "doing", "completed", "cancelled"]
     current_status = task.get("status", "pending")
     console.print(f"\nCurrent status: {current_status}")
     if new_status is None:
         new_status = Prompt.ask("New status", choices=valid_statuses, default=current_status)
     elif new_status not in valid_statuses:
-        console.print(f"[red]Error:[/red] Invalid status. Must be one of: {', '.join(valid_statuses)}")
-        return
+        abort(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
     if new_status == current_status:
         console.print(f"[yellow]No change: Status is already '{current_status}'.[/yellow]")
         return
@@ -1264,6 +1684,8 @@ def update_status(
     task["status"] = new_status
     if "status_history" not in task:
         task["status_history"] = []
+    history_length = len(task["status_history"])
+    changed = ["status", "completed", "due_date"]
     task["status_history"].append({"status": new_status, "timestamp": datetime.now().isoformat()})
     # Optionally sync completed/cancelled fields
     if new_status == "completed":
@@ -1271,9 +1693,13 @@ def update_status(
         # Auto-reschedule if repeatable
         repeat_rule = task.get("repeat")
         if repeat_rule:
-            # Parse the repeat rule as a time delta
-            last_due = parser.parse(task["due_date"]) if task.get("due_date") else datetime.now()
-            next_due = dateparser.parse(repeat_rule, settings={"RELATIVE_BASE": last_due})
+            recurrence = phrases.recurrence_of(task)
+            if recurrence and task.get("recurrence") != recurrence:
+                # Set before repeat rules were compiled, or edited by hand
+                task["recurrence"] = recurrence
+                changed.append("recurrence")
+            last_due = dates.field(task, "due_date") or datetime.now()
+            next_due = phrases.next_due(task, last_due)
             if next_due:
                 task["due_date"] = next_due.isoformat()
                 task["completed"] = False
@@ -1286,7 +1712,10 @@ def update_status(
             console.print("[yellow]Warning: Task is not repeatable. Please set a repeat rule to enable auto-rescheduling.[/yellow]")
     elif new_status == "cancelled":
         task["completed"] = False
-    save_todos(todos)
+    save_todos(todos, [
+        journal.set_op(task, *changed),
+        journal.append_op(task, "status_history", len(task["status_history"]) - history_length),
+    ])
     console.print(f"[green]✓[/green] Updated task status to: {new_status}")
 
 
@@ -1298,39 +1727,104 @@ def update_repeat(
     """
     Update a task's repeatability (e.g., every day, every week).
     """
-    todos = load_todos()
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    repo = load_repository()
+    todos = repo.todos
+    task = repo.get(task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
     current_repeat = task.get("repeat", None)
     console.print(f"\nCurrent repeat: {current_repeat if current_repeat else '[none]'}")
     if repeat is None:
         repeat = Prompt.ask("New repeat rule (e.g., every week, leave blank for none)", default=current_repeat or "")
     task["repeat"] = repeat if repeat else None
-    save_todos(todos)
+    changed = ["repeat"]
+    recurrence = phrases.compile_rule(repeat)
+    if recurrence or "recurrence" in task:
+        task["recurrence"] = recurrence
+        changed.append("recurrence")
+    save_todos(todos, [journal.set_op(task, *changed)])
     console.print(f"[green]✓[/green] Updated repeat rule to: {repeat if repeat else '[none]'}")
+    if repeat and not recurrence and not phrases.parse_date(repeat):
+        console.print("[yellow]Warning: Could not understand the repeat rule; the task will not be rescheduled.[/yellow]")
 
 
 @app.command()
-def search(query: str = typer.Argument(..., help="Search query (matches title, description, or notes)")):
-    """
-    Search tasks by title, description, or notes and list relevant tasks.
-    The search is case-insensitive and matches substrings.
-    Displays results in the same table format as the list command.
+def search(
+    text: str = typer.Argument(
+        ..., metavar="QUERY", help="Search query (matches title, tags, description, or notes)"
+    ),
+    limit: Optional[int] = typer.Option(None, "--limit", "-n", min=1, help="Show at most this many results"),
+    offset: Optional[int] = offset_option(),
+    page: Optional[int] = page_option(),
+    sort: Optional[str] = typer.Option(
+        None, "--sort", help="Order the matches by fields such as due,-priority instead of relevance"
+    ),
+    fuzzy: bool = typer.Option(False, "--fuzzy", "-f", help="Tolerate typos: rank tasks by word similarity"),
+    threshold: Optional[float] = typer.Option(
+        None, "--threshold", "-t", min=0.0, max=1.0, help="Minimum similarity for --fuzzy (default: 0.3)"
+    ),
+    output_format: str = format_option(),
+):
     """
-    todos = load_todos()
-    query_lower = query.lower()
-    matched_tasks = []
-    for task in todos["tasks"]:
-        if (
-            query_lower in (task.get("title") or "").lower()
-            or query_lower in (task.get("description") or "").lower()
-            or any(query_lower in (note or "").lower() for note in task.get("notes", []))
-        ):
-            matched_tasks.append(task)
+    Search tasks by title, tags, description, or notes, best matches first.
+
+    Every word of the query must match a whole word of the task (case-insensitive).
+    Use "quotes" for an exact phrase and a trailing * for a prefix. Matches in the
+    title count most, then tags, description and notes.
+    With --fuzzy, words only need to look alike (as measured by shared letter
+    trigrams) to words of the title, description or notes, so typos still match.
+    Displays results in the same table format as the list command, or with
+    --format as records carrying a relevance `score`.
+    --offset and --page page through the results; --sort orders the matches
+    by task fields (as for the list command) instead of relevance.
+
+    Example:
+        todo search deploy
+        todo search '"release notes" api*' --limit 5
+        todo search deploy --limit 10 --page 2
+        todo search --fuzzy "deplyment pipline"
+        todo search deploy --sort due --format json
+    """
+    check_format(output_format)
+    fields = parse_sort(sort)
+    limit, offset = paging(limit, offset, page)
+    # Ranking only needs the best matches up to the end of the page, unless they are re-sorted
+    # or counted for the table's footer
+    rank_limit = None if fields or limit is None or output_format == "table" else offset + limit
+    if fuzzy:
+        from todo import trigram
+
+        if threshold is None:
+            threshold = trigram.THRESHOLD
+        ranked = trigram.fuzzy_search(load_index(trigram.INDEX), text, rank_limit, threshold)
+    else:
+        from todo import search as fulltext
+
+        state = load_index(fulltext.INDEX)
+    if use_sql():
+        from todo import sqlite_store
+
+        database = sqlite_store.database_file(TODO_FILE)
+        if not fuzzy:
+            get_task = lambda task_id: next(iter(sqlite_store.get_tasks(database, [task_id])), None)  # noqa: E731
+            ranked = fulltext.search(state, text, rank_limit, get_task)
+        matched_tasks = sqlite_store.get_tasks(database, [task_id for task_id, _ in ranked])
+    else:
+        repo = load_repository()
+        if not fuzzy:
+            ranked = fulltext.search(state, text, rank_limit, repo.get)
+        matched_tasks = [repo.get(task_id) for task_id, _ in ranked if task_id in repo]
+    total = len(matched_tasks)
+    matched_tasks = [task for task in query.select(matched_tasks, fields, limit, offset)]
+    if output_format != "table":
+        scores = dict(ranked)
+        records = (
+            {**output.task_record(task), "score": round(scores[task["task_id"]], 4)} for task in matched_tasks
+        )
+        output.write_records(records, output_format, output.TASK_FIELDS + ["score"])
+        return
     if not matched_tasks:
-        console.print(f"[yellow]No tasks found matching '{query}'.[/yellow]")
+        console.print(f"[yellow]No tasks found matching '{text}'.[/yellow]")
         return
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Task ID")
@@ -1346,7 +1840,7 @@ def search(query: str = typer.Argument(..., help="Search query (matches title, d
     for task in matched_tasks:
         # Ensure tags are sorted for display consistency
         tags_list = sorted(task.get("tags") or [])
-        due_date_str = format_due_date(parser.parse(task["due_date"])) if task.get("due_date") else "-"
+        due_date_str = format_due_date(dates.field(task, "due_date"))
         total_time = format_duration(sum(ws["duration"] for ws in task.get("work_sessions", [])))
         # Improved status display
         if task.get("status") == "doing":
@@ -1373,6 +1867,7 @@ def search(query: str = typer.Argument(..., help="Search query (matches title, d
             tags_text,
         )
     console.print(table)
+    print_page_footer(offset, len(matched_tasks), total)
 
 
 @app.command()
@@ -1409,8 +1904,7 @@ def help(command: Optional[str] = typer.Argument(None, help="Command to get help
         # Get the command function
         cmd = app.registered_commands.get(command)
         if not cmd:
-            console.print(f"[red]Error:[/red] Command '{command}' not found!")
-            return
+            abort(f"Command '{command}' not found!")
 
         # Show detailed help for the command
         console.print(f"\n[bold blue]Command:[/bold blue] todo {command}")
@@ -1454,9 +1948,13 @@ def help(command: Optional[str] = typer.Argument(None, help="Command to get help
         ("tags", "List all unique tags across all tasks, along with the number of tasks for each tag"),
         ("tag <tag>", "List all tasks associated with a given tag"),
         ("version", "Show the version of the current CLI"),
-        ("search <query>", "Search tasks by title, description, or notes"),
+        ("search <query>", "Search tasks by title, tags, description, or notes"),
         ("board", "Launch a Dash web app with a Trello-like board showing all tasks grouped by status"),
         ("evolve <task_id>", "Move a task to the next workflow status"),
+        ("compact", "Fold the change journal back into todo.yaml"),
+        ("migrate --to <backend>", "Convert the project between the yaml and sqlite backends"),
+        ("batch [file]", "Apply many commands from a file or stdin with a single save"),
+        ("daemon start|stop|status", "Keep the project in memory in a background process"),
         ("checklist add <item>", "Add a new checklist item"),
         ("checklist list", "List all checklist items and their status"),
         ("checklist check <index>", "Mark a checklist item as checked"),
@@ -1478,12 +1976,62 @@ def help(command: Optional[str] = typer.Argument(None, help="Command to get help
 
 
 @app.command()
-def board():
+def board(
+    host: str = typer.Option("127.0.0.1", "--host", help="Address to listen on (0.0.0.0 for every interface)"),
+    port: int = typer.Option(8050, "--port", min=1, max=65535, help="Port to listen on"),
+    serve: bool = typer.Option(
+        False, "--serve", help="Run on a production WSGI server (waitress) instead of Dash's development server"
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", min=1,
+        help="Threads handling requests with --serve (8 by default), or processes rendering pages with --export"
+    ),
+    no_browser: bool = typer.Option(False, "--no-browser", help="Do not open the board in a browser"),
+    export: Optional[Path] = typer.Option(
+        None, "--export", file_okay=False,
+        help="Write the board, task pages and statistics as static HTML to this directory instead of serving them"
+    ),
+):
     """
     Launch a Dash web app with a Trello-like board showing all tasks grouped by status.
+
+    The board follows the project: changes made with other todo commands (or
+    by editing todo.yaml) show up in open pages within a second, without
+    restarting it. /healthz and /readyz answer liveness and readiness checks.
+
+    With --export, writes a static snapshot instead (see todo.snapshot): only
+    the pages whose tasks changed since the last export there are rewritten.
+
+    Examples:
+        todo board
+        todo board --serve --host 0.0.0.0 --port 8080 --workers 16 --no-browser
+        todo board --export out/
     """
-    todos = load_todos()["tasks"]
-    launch_board(todos)
+    if export is not None:
+        from todo.snapshot import export_board
+
+        if not storage.project_exists(TODO_FILE):
+            abort("No todo list found. Run 'todo init' first.")
+        # A consistent read, like the read-only commands; writers need not wait for the rendering
+        try:
+            with storage.lock(TODO_FILE, LOCK_TIMEOUT, shared=True):
+                tasks = load_todos()["tasks"]
+        except storage.LockTimeout as e:
+            abort(str(e))
+        counts = export_board(tasks, export, workers)
+        console.print(
+            f"[green]✓[/green] Exported the board to {export}/index.html: {counts['written']} pages written, "
+            f"{counts['unchanged']} unchanged, {counts['removed']} removed"
+        )
+        return
+
+    from todo.board import DEFAULT_WORKERS, launch_board
+    from todo.live import ProjectStore
+
+    launch_board(
+        ProjectStore.open(TODO_FILE), host=host, port=port, serve=serve, workers=workers or DEFAULT_WORKERS,
+        open_browser=not no_browser,
+    )
 
 
 @app.command()
@@ -1497,13 +2045,13 @@ def evolve(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)
     Example:
         todo evolve PROJ-001
     """
-    todos = load_todos()
+    repo = load_repository()
+    todos = repo.todos
     workflow = ["pending", "doing", "completed", "cancelled"]
     # Find the task
-    task = next((t for t in todos["tasks"] if t["task_id"].lower() == task_id.lower()), None)
+    task = find_task(repo, task_id)
     if not task:
-        console.print(f"[red]Error:[/red] Task '{task_id}' not found!")
-        return
+        abort(f"Task '{task_id}' not found!")
     current_status = task.get("status", "pending")
     try:
         idx = workflow.index(current_status)
@@ -1517,12 +2065,281 @@ def evolve(task_id: str = typer.Argument(..., help="The task id (e.g., PROJ-001)
             if "status_history" not in task:
                 task["status_history"] = []
             task["status_history"].append({"status": new_status, "timestamp": datetime.now().isoformat()})
-            save_todos(todos)
+            save_todos(todos, [
+                journal.set_op(task, "status", "completed"),
+                journal.append_op(task, "status_history"),
+            ])
             console.print(f"[green]✓[/green] Task [bold]{task_id}[/bold] moved to status: [cyan]{new_status}[/cyan]")
         else:
             console.print(f"[yellow]Task [bold]{task_id}[/bold] is already at the last status: [cyan]{current_status}[/cyan]")
     except ValueError:
-        console.print(f"[red]Error:[/red] Unknown status '{current_status}' for task '{task_id}'.")
+        abort(f"Unknown status '{current_status}' for task '{task_id}'.")
+
+
+@app.command()
+def compact(
+    use_journal: Optional[bool] = typer.Option(
+        None,
+        "--journal/--no-journal",
+        help="Switch journal mode on or off for this project",
+    ),
+):
+    """
+    Fold the journal back into todo.yaml.
+
+    In journal mode, changes are appended to todo.journal instead of rewriting
+    todo.yaml. This command rewrites todo.yaml with every pending change applied
+    and removes the journal. It also happens automatically once the journal grows
+    past 1 MB.
+
+    Example:
+        todo compact
+        todo compact --journal      # Enable journal mode
+        todo compact --no-journal   # Disable journal mode
+    """
+    if not storage.project_exists(TODO_FILE):
+        abort("No todo list found. Run 'todo init' first.")
+    records = journal.read_records(journal.journal_file(TODO_FILE))
+    folded = sum(1 for record in records if record["op"] != "compacted")
+    todos = load_todos()
+    if use_journal is True:
+        todos["project"]["journal"] = True
+    elif use_journal is False:
+        todos["project"].pop("journal", None)
+    save_todos(todos)
+    console.print(f"[green]✓[/green] Compacted {folded} journal record{'s' if folded != 1 else ''} into {storage.active_file(TODO_FILE)}")
+    if use_journal is not None:
+        console.print(f"Journal mode: [bold]{'on' if use_journal else 'off'}[/bold]")
+
+
+@app.command()
+def migrate(
+    to: str = typer.Option(..., "--to", help="Backend to convert the project to: yaml or sqlite"),
+):
+    """
+    Convert the project between the YAML and SQLite backends.
+
+    The SQLite backend keeps tasks in an indexed todo.db database, so that list,
+    tag-tasks, search, status and complete stay fast on projects with tens of
+    thousands of tasks. The previous file is kept as todo.yaml.bak or todo.db.bak.
+
+    Example:
+        todo migrate --to sqlite
+        todo migrate --to yaml
+    """
+    if to not in storage.BACKENDS:
+        abort(f"Invalid backend. Must be one of: {', '.join(storage.BACKENDS)}")
+    if not storage.project_exists(TODO_FILE):
+        abort("No todo list found. Run 'todo init' first.")
+    if storage.backend(TODO_FILE) == to:
+        console.print(f"[yellow]The project already uses the {to} backend.[/yellow]")
+        return
+    backup = storage.migrate(TODO_FILE, to)
+    console.print(f"[green]✓[/green] Migrated project to {storage.active_file(TODO_FILE)}")
+    console.print(f"Previous file kept as {backup}")
+
+
+# Commands that cannot run inside `todo batch`
+BATCH_EXCLUDED_COMMANDS = {"batch", "init", "migrate", "board", "workon", "daemon", "compact"}
+
+
+def parse_batch_line(line: str) -> Optional[Dict]:
+    """
+    Parse one line of a batch file into {"args": [...], "input": "..."}.
+
+    A line is either a todo command line (`update status PROJ-001 doing`,
+    optionally starting with `todo`) or a JSON operation: a list of arguments,
+    or an object with "args" (list or string) and an optional "input" holding
+    the answers to the command's prompts. Blank lines and # comments are skipped.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    if line[0] in "[{":
+        operation = json.loads(line)
+        if not isinstance(operation, dict):
+            operation = {"args": operation}
+        args = operation.get("args", [])
+        if isinstance(args, str):
+            args = shlex.split(args)
+        operation = {"args": [str(arg) for arg in args], "input": operation.get("input", "")}
+    else:
+        operation = {"args": shlex.split(line), "input": ""}
+    if operation["args"][:1] == ["todo"]:
+        operation["args"] = operation["args"][1:]
+    return operation
+
+
+def run_batch_operation(command, operation: Dict):
+    """Run one batch operation; returns (succeeded, captured output or error)"""
+    args = operation["args"]
+    if not args:
+        return False, "Empty command"
+    if args[0] in BATCH_EXCLUDED_COMMANDS:
+        return False, f"'{args[0]}' cannot be used in a batch"
+    stdin = sys.stdin
+    # Prompts read their answers from the operation's input, never from the batch itself
+    sys.stdin = io.StringIO(operation["input"])
+    try:
+        with console.capture() as capture, contextlib.redirect_stdout(io.StringIO()):
+            try:
+                code = command.main(args, prog_name="todo", standalone_mode=False)
+                error = None
+            except (EOFError, typer.Abort):
+                # Typically a prompt that ran out of answers
+                code, error = 1, "Aborted (commands that prompt need their answers in the JSON 'input' field)"
+            except Exception as e:
+                code = 1
+                error = e.format_message() if hasattr(e, "format_message") else str(e) or type(e).__name__
+    finally:
+        sys.stdin = stdin
+    output = capture.get().strip()
+    if code:
+        return False, error or output
+    return True, output
+
+
+@app.command()
+def batch(
+    file: Optional[Path] = typer.Argument(None, help="File with one command per line (default: stdin)"),
+):
+    """
+    Apply many commands with a single load and a single save.
+
+    Each line holds a command as you would type it after 'todo', or a JSON
+    operation ({"args": [...], "input": "answers to prompts"}). All commands run
+    against the same in-memory project and the result is written once at the end.
+    If any command fails, nothing is saved.
+
+    Example:
+        todo batch ops.txt
+        printf 'update status PROJ-001 doing\nnote add PROJ-001 "Started"\n' | todo batch
+    """
+    global BATCH
+    if not storage.project_exists(TODO_FILE):
+        abort("No todo list found. Run 'todo init' first.")
+    if file is not None and str(file) != "-":
+        try:
+            text = file.read_text(encoding="utf-8")
+        except OSError as e:
+            abort(f"Cannot read {file}: {e.strerror}")
+    else:
+        text = sys.stdin.read()
+
+    operations = []
+    for number, line in enumerate(text.splitlines(), 1):
+        try:
+            operation = parse_batch_line(line)
+        except ValueError as e:
+            abort(f"Line {number}: {e}")
+        if operation is not None:
+            operations.append((number, operation))
+
+    command = typer.main.get_command(app)
+    BATCH = {"repo": TaskRepository(storage.load_document(TODO_FILE)), "changes": []}
+    results = []
+    failed = False
+    try:
+        for number, operation in operations:
+            if failed:
+                results.append((number, operation, None, ""))
+                continue
+            succeeded, message = run_batch_operation(command, operation)
+            results.append((number, operation, succeeded, message))
+            failed = not succeeded
+    finally:
+        todos, changes = BATCH["repo"].todos, BATCH["changes"]
+        BATCH = None
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Line", justify="right")
+    table.add_column("Command")
+    table.add_column("Result")
+    table.add_column("Output")
+    for number, operation, succeeded, message in results:
+        if succeeded is None:
+            result = "[dim]skipped[/dim]"
+        elif succeeded:
+            result = "[green]ok[/green]"
+        else:
+            result = "[red]failed[/red]"
+        # The last line saying something, e.g. the confirmation or the error
+        last_line = next((line for line in reversed(message.splitlines()) if any(c.isalnum() for c in line)), "")
+        table.add_row(str(number), shlex.join(operation["args"]), result, Text(last_line))
+    if results:
+        console.print(table)
+
+    if failed:
+        abort("Batch rolled back, nothing was saved.")
+    if changes is None or changes:
+        save_todos(todos, changes)
+    console.print(f"[green]✓[/green] Applied {len(results)} operation{'s' if len(results) != 1 else ''} with a single save")
+
+
+# --- DAEMON COMMAND GROUP ---
+daemon_app = typer.Typer(help="Keep the project in memory in a background process to speed up commands")
+app.add_typer(daemon_app, name="daemon")
+
+
+@daemon_app.command("start")
+def daemon_start(
+    foreground: bool = typer.Option(False, "--foreground", help="Run in this terminal instead of the background"),
+):
+    """
+    Start a daemon serving the project in the current directory.
+
+    While it runs, 'todo' forwards commands to it over .todo/daemon.sock, so they
+    skip interpreter startup and loading the project. Interactive commands still
+    run locally. Set TODO_NO_DAEMON=1 to bypass it.
+
+    Example:
+        todo daemon start
+    """
+    from todo import daemon
+
+    if not hasattr(socket, "AF_UNIX"):
+        abort("The daemon needs Unix domain sockets, which this platform does not support.")
+    if not storage.project_exists(TODO_FILE):
+        abort("No todo list found. Run 'todo init' first.")
+    status = daemon.ping(TODO_FILE)
+    if status:
+        console.print(f"[yellow]A daemon is already running (pid {status['pid']}).[/yellow]")
+        return
+    if foreground:
+        console.print(f"Serving {storage.active_file(TODO_FILE)} on {daemon.socket_file(TODO_FILE)} (Ctrl+C to stop)")
+        daemon.Daemon(TODO_FILE).serve()
+        return
+    pid = daemon.spawn(TODO_FILE)
+    if pid is None:
+        abort(f"The daemon did not start, see {daemon.log_file(TODO_FILE)}")
+    console.print(f"[green]✓[/green] Daemon started (pid {pid})")
+
+
+@daemon_app.command("stop")
+def daemon_stop():
+    """
+    Stop the daemon serving the project in the current directory.
+    """
+    from todo import daemon
+
+    if daemon.stop(TODO_FILE):
+        console.print("[green]✓[/green] Daemon stopped")
+    else:
+        console.print("[yellow]No daemon is running.[/yellow]")
+
+
+@daemon_app.command("status")
+def daemon_status():
+    """
+    Show whether a daemon serves the project in the current directory.
+    """
+    from todo import daemon
+
+    status = daemon.ping(TODO_FILE)
+    if status:
+        console.print(f"Daemon running (pid {status['pid']}) on {daemon.socket_file(TODO_FILE)}")
+    else:
+        console.print("No daemon is running.")
 
 
 # --- CHECKLIST COMMAND GROUP ---
@@ -1538,7 +2355,7 @@ def checklist_add(item: str = typer.Argument(..., help="Checklist item text")):
     if "checklist" not in todos:
         todos["checklist"] = []
     todos["checklist"].append({"item": item, "checked": False})
-    save_todos(todos)
+    save_todos(todos, [journal.document_op(todos, "checklist")])
     console.print(f"[green]✓[/green] Checklist item added: [bold]{item}[/bold]")
 
 @checklist_app.command("list")
@@ -1571,7 +2388,7 @@ def checklist_check(index: int = typer.Argument(..., help="Checklist item number
         console.print(f"[red]Invalid index:[/red] {index}")
         return
     checklist[index-1]["checked"] = True
-    save_todos(todos)
+    save_todos(todos, [journal.document_op(todos, "checklist")])
     console.print(f"[green]✓[/green] Checked item #{index}: [bold]{checklist[index-1]['item']}[/bold]")
 
 @checklist_app.command("uncheck")
@@ -1585,7 +2402,7 @@ def checklist_uncheck(index: int = typer.Argument(..., help="Checklist item numb
         console.print(f"[red]Invalid index:[/red] {index}")
         return
     checklist[index-1]["checked"] = False
-    save_todos(todos)
+    save_todos(todos, [journal.document_op(todos, "checklist")])
     console.print(f"[yellow]Unchecked item #{index}: [bold]{checklist[index-1]['item']}[/bold]")
 
 @checklist_app.command("remove")
@@ -1599,7 +2416,7 @@ def checklist_remove(index: int = typer.Argument(..., help="Checklist item numbe
         console.print(f"[red]Invalid index:[/red] {index}")
         return
     removed = checklist.pop(index-1)
-    save_todos(todos)
+    save_todos(todos, [journal.document_op(todos, "checklist")])
     console.print(f"[red]Removed item #{index}: [bold]{removed['item']}[/bold]")
 
 
@@ -1617,6 +2434,8 @@ def checklist_export(
     if not checklist:
         console.print("[yellow]No checklist items to export.[/yellow]")
         return
+    import pandas as pd
+
     df = pd.DataFrame(checklist)
     df.index += 1
     df.index.name = "#"
@@ -0,0 +1,86 @@
+"""Entry point of the `todo` command.
+
+When a daemon (`todo daemon start`) serves the project in the current
+directory, the command line is forwarded to it over its Unix socket and
+only its output is printed here, which avoids importing Typer, Rich and
+the YAML parser on every invocation. Otherwise, or when the daemon asks
+for it (interactive commands), the CLI runs in-process as usual.
+
+Stdin is never read here: the daemon runs commands without input, and a
+command that prompts is handed back and rerun here with the untouched
+stdin. So `while read id; do todo complete "$id"; done < ids.txt` works,
+and an inherited pipe that stays open does not block the command.
+
+This module must stay cheap to import: standard library only.
+"""
+
+import json
+import os
+import shutil
+import socket
+import sys
+from typing import Dict, Optional
+
+# storage.sidecar_dir(todo.yaml) / daemon.SOCKET_NAME, relative to the project
+SOCKET_PATH = os.path.join(".todo", "daemon.sock")
+
+
+def send_message(sock: socket.socket, message: Dict):
+    sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+
+
+def receive_message(sock: socket.socket) -> Optional[Dict]:
+    """Read one newline-terminated JSON message, or None if the peer hung up"""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    data = b"".join(chunks)
+    return json.loads(data) if data.strip() else None
+
+
+def request(message: Dict, path: str = SOCKET_PATH, timeout: Optional[float] = None) -> Optional[Dict]:
+    """Send a message to the daemon and return its answer, or None if no daemon is reachable"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(path)
+            send_message(sock, message)
+            return receive_message(sock)
+    except (OSError, ValueError):
+        # Stale socket left by a daemon that died, or a garbled answer
+        return None
+
+
+def run_local():
+    from todo.cli import app
+
+    app(prog_name="todo")
+
+
+def main():
+    if os.environ.get("TODO_NO_DAEMON") or not os.path.exists(SOCKET_PATH):
+        run_local()
+        return
+    interactive = sys.stdout.isatty()
+    response = request({
+        "argv": sys.argv[1:],
+        "color": interactive and "NO_COLOR" not in os.environ,
+        "width": shutil.get_terminal_size().columns if interactive else None,
+    })
+    if response is None or response.get("retry_local"):
+        run_local()
+        return
+    sys.stdout.write(response["output"])
+    sys.stdout.flush()
+    sys.exit(response["exit_code"])
+
+
+if __name__ == "__main__":
+    main()
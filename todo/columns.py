@@ -0,0 +1,316 @@
+"""Columns of the project for statistics (see todo.stats).
+
+The tasks are kept as columns of stdlib arrays: one entry per task
+(completion, status, priority, type, due date), per work session and per
+tag, with timestamps as microseconds since the epoch. NumPy reads these
+arrays as raw buffers, and the columns are persisted as a sidecar
+index (see todo.indexes) that change records update in place, so `todo
+status` neither loads the project nor walks its tasks.
+
+The statistics of `todo status` are also kept as counters that every
+change adjusts by the difference it makes (see _account()), with the due
+dates kept sorted for the overdue and due today buckets, so the summary
+costs the same for any number of tasks.
+
+Rows are never moved: a deleted task is only marked dead, and its tags and
+sessions are ignored from then on. The columns are rebuilt, without dead
+rows, whenever the index is rebuilt.
+"""
+
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime, time
+from typing import Dict, Iterable, List, Optional
+
+from todo import indexes
+from todo.dates import MISSING, micros, timestamp
+from todo.model import PRIORITIES, PRIORITY_CODES
+from todo.repository import task_key
+
+# Statistics maintained as counters (see summary())
+COUNTERS = [
+    "total_tasks",
+    "completed_tasks",
+    "pending_tasks",
+    "high_priority",
+    "medium_priority",
+    "low_priority",
+    "no_due_date",
+    "total_work_time",
+    "completed_work_time",
+    "pending_work_time",
+    "interrupted_sessions",
+    "total_sessions",
+]
+
+
+def _empty() -> Dict:
+    return {
+        "rows": {},  # task key -> row of the first task with that id
+        "duplicates": {},  # task key -> rows of the other tasks with that id
+        "alive": array("b"),
+        "completed": array("b"),
+        "cancelled": array("b"),  # status is "cancelled"; completion takes precedence
+        "priority": array("b"),  # index in PRIORITIES, -1 if unknown
+        "type": array("q"),
+        "types": {},  # type -> code
+        "due": array("q"),
+        "worked": array("q"),  # row -> minutes worked, sessions and interrupted sessions
+        "session_count": array("q"),
+        "interrupted_count": array("q"),
+        "session_row": array("q"),
+        "duration": array("q"),
+        "interrupted": array("b"),
+        "started": array("q"),
+        "tag_row": array("q"),
+        "tag": array("q"),
+        "tag_alive": array("b"),
+        "tags": {},  # tag -> code
+        "tag_start": array("q"),  # row -> position of its first tag; a task's tags are contiguous
+        "tag_count": array("q"),
+        "counters": dict.fromkeys(COUNTERS, 0),
+        "due_sorted": array("q"),  # due dates of the tasks counted in the statistics
+    }
+
+
+# Columns with one entry per row, besides "alive"
+_ROW_COLUMNS = [
+    "completed", "cancelled", "priority", "type", "due",
+    "worked", "session_count", "interrupted_count", "tag_start", "tag_count",
+]
+
+
+def _code(names: Dict, value) -> int:
+    return names.setdefault(value, len(names))
+
+
+def _account(state: Dict, row: int, sign: int, dues: Optional[List[int]] = None):
+    """
+    Add (sign 1) or take back (sign -1) the contribution of a live task to
+    the counters; like calculate_project_stats, cancelled tasks only count
+    as tasks. Due dates are collected in `dues` if given, instead of being
+    inserted in order.
+    """
+    if not state["alive"][row]:
+        return
+    counters = state["counters"]
+    counters["total_tasks"] += sign
+    completed = state["completed"][row]
+    if completed:
+        counters["completed_tasks"] += sign
+    elif state["cancelled"][row]:
+        return
+    else:
+        counters["pending_tasks"] += sign
+    priority = state["priority"][row]
+    if priority >= 0:
+        counters[f"{PRIORITIES[priority]}_priority"] += sign
+    due = state["due"][row]
+    if due == MISSING:
+        counters["no_due_date"] += sign
+    elif dues is not None:
+        dues.append(due)
+    elif sign > 0:
+        insort(state["due_sorted"], due)
+    else:
+        del state["due_sorted"][bisect_left(state["due_sorted"], due)]
+    worked = state["worked"][row] * sign
+    counters["total_work_time"] += worked
+    counters["completed_work_time" if completed else "pending_work_time"] += worked
+    counters["total_sessions"] += state["session_count"][row] * sign
+    counters["interrupted_sessions"] += state["interrupted_count"][row] * sign
+
+
+def _add_sessions(state: Dict, row: int, sessions: Iterable[Dict]):
+    for session in sessions:
+        duration = int(session.get("duration") or 0)
+        interrupted = bool(session.get("interrupted", False))
+        state["session_row"].append(row)
+        state["duration"].append(duration)
+        state["interrupted"].append(interrupted)
+        state["started"].append(timestamp(session.get("started_at")))
+        state["worked"][row] += duration
+        state["session_count"][row] += 1
+        state["interrupted_count"][row] += interrupted
+
+
+def _remove_sessions(state: Dict, row: int):
+    for name in ("worked", "session_count", "interrupted_count"):
+        state[name][row] = 0
+    keep = [position for position, owner in enumerate(state["session_row"]) if owner != row]
+    for name in ("session_row", "duration", "interrupted", "started"):
+        column = state[name]
+        state[name] = array(column.typecode, [column[position] for position in keep])
+
+
+def _set_tags(state: Dict, row: int, tags: Iterable):
+    start = state["tag_start"][row]
+    for position in range(start, start + state["tag_count"][row]):
+        state["tag_alive"][position] = 0
+    tags = dict.fromkeys(tags)
+    state["tag_start"][row] = len(state["tag_row"])
+    state["tag_count"][row] = len(tags)
+    for tag in tags:
+        state["tag_row"].append(row)
+        state["tag"].append(_code(state["tags"], tag))
+        state["tag_alive"].append(1)
+
+
+def _tags_of(state: Dict, row: int) -> List:
+    names = list(state["tags"])
+    start = state["tag_start"][row]
+    return [names[state["tag"][position]] for position in range(start, start + state["tag_count"][row])]
+
+
+def _set(state: Dict, row: int, values: Dict):
+    _account(state, row, -1)
+    if "completed" in values:
+        state["completed"][row] = bool(values["completed"])
+    if "status" in values:
+        state["cancelled"][row] = values["status"] == "cancelled"
+    if "priority" in values:
+        state["priority"][row] = PRIORITY_CODES.get(values["priority"], -1)
+    if "type" in values:
+        state["type"][row] = _code(state["types"], values["type"])
+    if "due_date" in values:
+        state["due"][row] = timestamp(values["due_date"])
+    if "tags" in values:
+        _set_tags(state, row, values["tags"] or ())
+    if "work_sessions" in values:
+        _remove_sessions(state, row)
+        _add_sessions(state, row, values["work_sessions"] or ())
+    _account(state, row, 1)
+
+
+def _add(state: Dict, task: Dict):
+    row = len(state["alive"])
+    key = task_key(task["task_id"])
+    if key in state["rows"]:
+        state["duplicates"].setdefault(key, []).append(row)
+    else:
+        state["rows"][key] = row
+    # Dead until fully set, so that it is only accounted for once
+    state["alive"].append(0)
+    for name in _ROW_COLUMNS:
+        state[name].append(0)
+    _set(state, row, {
+        "completed": task.get("completed"),
+        "status": task.get("status"),
+        "priority": task.get("priority"),
+        "type": task.get("type"),
+        "due_date": task.get("due_date"),
+        "tags": task.get("tags"),
+    })
+    _add_sessions(state, row, task.get("work_sessions") or ())
+    state["alive"][row] = 1
+    _account(state, row, 1)
+
+
+class ColumnsIndex(indexes.SidecarIndex):
+    name = "columns"
+    version = 2
+
+    def build(self, todos: Dict) -> Dict:
+        # Same result as _add() for every task, with one pass and no per-entry calls
+        state = _empty()
+        rows, duplicates, types, tags = state["rows"], state["duplicates"], state["types"], state["tags"]
+        values = {name: [] for name, column in state.items() if isinstance(column, array) and name != "due_sorted"}
+        completed, cancelled, priority, task_type, due = (
+            values[name] for name in ("completed", "cancelled", "priority", "type", "due")
+        )
+        session_row, duration, interrupted, started = (
+            values[name] for name in ("session_row", "duration", "interrupted", "started")
+        )
+        worked, session_count, interrupted_count = (
+            values[name] for name in ("worked", "session_count", "interrupted_count")
+        )
+        tag_row, tag, tag_start, tag_count = (values[name] for name in ("tag_row", "tag", "tag_start", "tag_count"))
+        for row, task in enumerate(todos["tasks"]):
+            key = task_key(task["task_id"])
+            if key in rows:
+                duplicates.setdefault(key, []).append(row)
+            else:
+                rows[key] = row
+            done = bool(task.get("completed"))
+            completed.append(done)
+            cancelled.append(task.get("status") == "cancelled")
+            priority.append(PRIORITY_CODES.get(task.get("priority"), -1))
+            task_type.append(types.setdefault(task.get("type"), len(types)))
+            due.append(timestamp(task.get("due_date")))
+            task_worked = task_sessions = task_interrupted = 0
+            for session in task.get("work_sessions") or ():
+                minutes = int(session.get("duration") or 0)
+                stopped = bool(session.get("interrupted", False))
+                session_row.append(row)
+                duration.append(minutes)
+                interrupted.append(stopped)
+                started.append(timestamp(session.get("started_at")))
+                task_worked += minutes
+                task_sessions += 1
+                task_interrupted += stopped
+            worked.append(task_worked)
+            session_count.append(task_sessions)
+            interrupted_count.append(task_interrupted)
+            task_tags = dict.fromkeys(task.get("tags") or ())
+            tag_start.append(len(tag_row))
+            tag_count.append(len(task_tags))
+            for name in task_tags:
+                tag_row.append(row)
+                tag.append(tags.setdefault(name, len(tags)))
+        values["alive"] = [1] * len(completed)
+        values["tag_alive"] = [1] * len(tag_row)
+        for name, items in values.items():
+            state[name] = array(state[name].typecode, items)
+        dues: List[int] = []
+        for row in range(len(completed)):
+            _account(state, row, 1, dues)
+        state["due_sorted"] = array("q", sorted(dues))
+        return state
+
+    def apply(self, state: Dict, todos: Optional[Dict], changes: List[Dict]):
+        for record in changes:
+            op = record["op"]
+            if op == "add":
+                _add(state, record["task"])
+                continue
+            if op not in ("delete", "set", "append"):
+                continue
+            key = task_key(record["task_id"])
+            row = state["rows"].get(key)
+            if row is None:
+                continue
+            if op == "delete":
+                # Like TaskRepository.delete, every task with the id goes
+                for dead in [state["rows"].pop(key)] + state["duplicates"].pop(key, []):
+                    _account(state, dead, -1)
+                    state["alive"][dead] = 0
+                    _set_tags(state, dead, ())
+            elif op == "set":
+                # Like the journal, changes go to the first task with the id
+                _set(state, row, record["values"])
+            elif record["field"] == "work_sessions":
+                _account(state, row, -1)
+                _add_sessions(state, row, record["values"])
+                _account(state, row, 1)
+            elif record["field"] == "tags":
+                _set_tags(state, row, _tags_of(state, row) + list(record["values"]))
+        if todos is not None and state["alive"].count(0) > len(todos["tasks"]):
+            # Mostly dead rows: start afresh
+            state.clear()
+            state.update(self.build(todos))
+
+
+INDEX = indexes.register(ColumnsIndex())
+
+
+def summary(state: Dict, now: Optional[datetime] = None) -> Dict:
+    """
+    The statistics of cli.calculate_project_stats, read from the counters;
+    due date buckets are counted by bisecting the sorted due dates.
+    """
+    now = now or datetime.now()
+    today = micros(datetime.combine(now.date(), time()))
+    due_sorted = state["due_sorted"]
+    overdue = bisect_left(due_sorted, today)
+    due_today = bisect_left(due_sorted, today + 86400 * 1_000_000) - overdue
+    return {**state["counters"], "overdue_tasks": overdue, "due_today": due_today}
@@ -0,0 +1,204 @@
+"""Background server keeping a project in memory.
+
+`todo daemon start` runs this server for the project in the current
+directory. It loads the project once, keeps it (with its task id index)
+in memory, reloads it when another process changes the project files,
+and answers the command lines forwarded by the `todo` client (see
+todo.client) over `.todo/daemon.sock`. Requests are handled one at a time
+while holding the project lock, so the daemon serializes every write.
+"""
+
+import contextlib
+import io
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import click
+import typer
+from rich.console import Console
+
+from todo import cli, client, storage, watch
+from todo.repository import TaskRepository
+
+SOCKET_NAME = "daemon.sock"
+
+# Interactive, long-running or backend-changing commands: the client runs them itself
+LOCAL_COMMANDS = {"init", "migrate", "board", "workon", "batch", "daemon"}
+
+# Seconds between checks for external changes while idle
+POLL_INTERVAL = 1.0
+
+
+def socket_file(todo_file: Path) -> Path:
+    return storage.sidecar_dir(todo_file) / SOCKET_NAME
+
+
+def pid_file(todo_file: Path) -> Path:
+    return storage.sidecar_dir(todo_file) / "daemon.pid"
+
+
+def log_file(todo_file: Path) -> Path:
+    return storage.sidecar_dir(todo_file) / "daemon.log"
+
+
+def ping(todo_file: Path) -> Optional[Dict]:
+    """Status of the daemon serving this project, or None if there is none"""
+    return client.request({"control": "ping"}, str(socket_file(todo_file)), timeout=2)
+
+
+def stop(todo_file: Path) -> bool:
+    """Ask the daemon to exit; False if none was running"""
+    return client.request({"control": "stop"}, str(socket_file(todo_file)), timeout=5) is not None
+
+
+def spawn(todo_file: Path, timeout: float = 10) -> Optional[int]:
+    """Start the daemon in the background and wait until it answers; returns its pid"""
+    storage.ensure_sidecar_dir(todo_file)
+    with open(log_file(todo_file), "ab") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "todo.daemon"],
+            cwd=str(todo_file.parent),
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = ping(todo_file)
+        if status:
+            return status["pid"]
+        if process.poll() is not None:
+            return None
+        time.sleep(0.05)
+    return None
+
+
+class Daemon:
+    def __init__(self, todo_file: Path):
+        self.todo_file = todo_file
+        self.command = typer.main.get_command(cli.app)
+        self.watcher = watch.FileWatcher(watch.project_files(todo_file))
+        self.repo: Optional[TaskRepository] = None
+        self.running = False
+
+    def repository(self) -> TaskRepository:
+        """The in-memory project, reloaded if another process changed it"""
+        if self.watcher.changed() or self.repo is None:
+            self.repo = TaskRepository(storage.load_document(self.todo_file))
+        return self.repo
+
+    def handle(self, message: Dict) -> Dict:
+        control = message.get("control")
+        if control == "ping":
+            return {"pid": os.getpid(), "tasks": len(self.repo) if self.repo is not None else None}
+        if control == "stop":
+            self.running = False
+            return {"stopped": True}
+        args = [str(arg) for arg in message.get("argv", [])]
+        if not args or args[0].startswith("-") or args[0] in LOCAL_COMMANDS:
+            return {"retry_local": True}
+        return self.execute(args, message)
+
+    def execute(self, args, message: Dict) -> Dict:
+        """Run a command line against the in-memory project and save its changes"""
+        output = io.StringIO()
+        console = Console(
+            file=output,
+            force_terminal=bool(message.get("color")),
+            no_color=not message.get("color"),
+            width=message.get("width") or 80,
+        )
+        saved_console, saved_stdin = cli.console, sys.stdin
+        cli.console = console
+        # No input: a command that prompts aborts and the client reruns it with its own stdin
+        sys.stdin = io.StringIO("")
+        try:
+            with storage.lock(self.todo_file, cli.LOCK_TIMEOUT):
+                cli.BATCH = {"repo": self.repository(), "changes": []}
+                try:
+                    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                        code = self.command.main(args, prog_name="todo", standalone_mode=False) or 0
+                except click.exceptions.Abort:
+                    # A prompt without answers: let the client run it with its terminal
+                    self.repo = None
+                    return {"retry_local": True}
+                except click.ClickException as e:
+                    with contextlib.redirect_stderr(output):
+                        e.show()
+                    code = e.exit_code
+                changes = cli.BATCH["changes"]
+                if code:
+                    # Discard whatever the failed command changed in memory
+                    self.repo = None
+                elif changes is None or changes:
+                    storage.save_document(self.todo_file, self.repo.todos, changes)
+                    self.watcher.reset()
+        except storage.LockTimeout as e:
+            console.print(f"[red]Error:[/red] {e}")
+            code = 1
+        except Exception as e:
+            self.repo = None
+            console.print(f"[red]Error:[/red] {type(e).__name__}: {e}")
+            code = 1
+        finally:
+            cli.BATCH = None
+            cli.console, sys.stdin = saved_console, saved_stdin
+        return {"output": output.getvalue(), "exit_code": code}
+
+    def serve(self):
+        """Answer requests until stopped"""
+        path = socket_file(self.todo_file)
+        storage.ensure_sidecar_dir(self.todo_file)
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(str(path))
+        server.listen(16)
+        server.settimeout(POLL_INTERVAL)
+        pid_file(self.todo_file).write_text(str(os.getpid()))
+        self.running = True
+        self.repository()
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    # Pick up external edits while idle so the next request is fast
+                    if self.watcher.changed():
+                        self.repo = None
+                        self.repository()
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    try:
+                        message = client.receive_message(conn)
+                        if message is not None:
+                            client.send_message(conn, self.handle(message))
+                    except (OSError, ValueError):
+                        continue
+        finally:
+            server.close()
+            for leftover in (path, pid_file(self.todo_file)):
+                with contextlib.suppress(FileNotFoundError):
+                    leftover.unlink()
+
+
+def main():
+    daemon = Daemon(cli.TODO_FILE)
+
+    def shutdown(signum, frame):
+        daemon.running = False
+
+    signal.signal(signal.SIGTERM, shutdown)
+    daemon.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Reading the timestamps stored in tasks (due dates, creation dates, sessions).
+
+todo writes timestamps with `datetime.isoformat()`, which
+`datetime.fromisoformat` reads in well under a microsecond, while
+dateutil's generic parser takes tens of microseconds per call; dateutil is
+only tried for other spellings, such as dates edited by hand. Parsed values
+are memoized per string, so a timestamp is parsed once per process however
+many times it is displayed (the board and the daemon render the same tasks
+over and over). Tasks keep the original strings, so saving a project
+writes them back unchanged.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+
+# Distinct timestamps kept parsed
+CACHE_SIZE = 1 << 16
+
+# Missing timestamp: NumPy reads it as NaT
+MISSING = -(2 ** 63)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def timestamp(value) -> int:
+    """Microseconds since the epoch of an ISO timestamp (in UTC if it has a timezone), or MISSING"""
+    if not value:
+        return MISSING
+    try:
+        moment = datetime.fromisoformat(str(value))
+    except ValueError:
+        return MISSING
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return micros(moment)
+
+
+def micros(moment: datetime) -> int:
+    """Microseconds since the epoch of a naive datetime"""
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse(text: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    from dateutil import parser
+
+    try:
+        return parser.parse(text)
+    except (ValueError, OverflowError):
+        return None
+
+
+def parse(value) -> Optional[datetime]:
+    """The datetime of a stored timestamp, or None if it is empty or unreadable"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        # YAML reads unquoted dates as date objects
+        return datetime(value.year, value.month, value.day)
+    return _parse(str(value))
+
+
+def field(task: Dict, name: str) -> Optional[datetime]:
+    """The parsed timestamp of a task field such as due_date or created_at"""
+    return parse(task.get(name))
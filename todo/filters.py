@@ -0,0 +1,467 @@
+"""Filter expressions for `todo list --where`.
+
+An expression such as
+
+    priority=high and due<+7d and type in (bugfix,test) and worked>2h
+
+is parsed once into a tree and compiled, either into a single Python
+predicate over task dicts or into a SQL condition on the tasks table of
+the SQLite backend (whose indexes then do the work). Conditions on tags
+can also be answered by the tag index (see tag_query()), so that only the
+tasks carrying the right tags are checked one by one.
+
+Syntax:
+    field op value         comparison, e.g. priority>=medium, title~deploy
+    field in (a, b)        one of several values
+    not e, e and e, e or e with parentheses for grouping
+
+Fields and their values:
+    id, title, description   text; ~ and !~ test for a substring, = ignores case
+    type, status             status is completed, cancelled, doing, pending...
+    priority                 low < medium < high
+    tag                      tag=ops: has the tag; tag!=ops: does not
+    due, created             dates: 2025-06-30, 2025-06-30T12:00, today,
+                             tomorrow, yesterday, now, +7d, -2w, +3h, or none
+    worked                   time worked: 90, 90m, 2h, 1h30m (minutes by default)
+    sessions, notes          counts
+"""
+
+import re
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from todo.dates import MISSING, timestamp
+from todo.model import PRIORITIES
+
+# Field -> kind of value
+FIELDS = {
+    "id": "text",
+    "title": "text",
+    "description": "text",
+    "type": "name",
+    "status": "name",
+    "priority": "priority",
+    "tag": "tag",
+    "due": "date",
+    "created": "date",
+    "worked": "duration",
+    "sessions": "count",
+    "notes": "count",
+}
+ALIASES = {"tags": "tag", "task_id": "id", "due_date": "due", "created_at": "created"}
+
+# Operators allowed for each kind of field
+OPERATORS = {
+    "text": ("=", "!=", "~", "!~", "in"),
+    "name": ("=", "!=", "in"),
+    "priority": ("=", "!=", "<", "<=", ">", ">=", "in"),
+    "tag": ("=", "!=", "in"),
+    "date": ("=", "!=", "<", "<=", ">", ">=", "in"),
+    "duration": ("=", "!=", "<", "<=", ">", ">=", "in"),
+    "count": ("=", "!=", "<", "<=", ">", ">=", "in"),
+}
+
+# low < medium < high
+PRIORITY_RANKS = {name: len(PRIORITIES) - code for code, name in enumerate(PRIORITIES)}
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<op><=|>=|!=|!~|[=<>~(),])
+      | "(?P<double>[^"]*)"
+      | '(?P<single>[^']*)'
+      | (?P<word>[^\s=<>~!(),"']+)
+    )""",
+    re.VERBOSE,
+)
+_KEYWORDS = {"and", "or", "not", "in"}
+_RELATIVE = re.compile(r"^([+-])(\d+)([hdw])$")
+_DURATION = re.compile(r"^(?:(\d+)h)?(?:(\d+)m?)?$")
+_DAY = 86400 * 1_000_000
+_UNITS = {"h": timedelta(hours=1), "d": timedelta(days=1), "w": timedelta(weeks=1)}
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"unexpected {expression[position:].strip()[:1]!r}")
+        position = match.end()
+        if match.group("op"):
+            tokens.append(("op", match.group("op")))
+        elif match.group("word") is not None:
+            word = match.group("word")
+            tokens.append(("keyword", word.lower()) if word.lower() in _KEYWORDS else ("word", word))
+        else:
+            value = match.group("double") if match.group("double") is not None else match.group("single")
+            tokens.append(("word", value))
+    tokens.append(("end", ""))
+    return tokens
+
+
+def parse(expression: str):
+    """
+    Parse an expression into a tree of ("and" / "or", [nodes]), ("not",
+    node) and ("cmp", field, operator, [values]) tuples. Values are checked
+    here, so that a bad date or duration is reported before any task is
+    read. Raises ValueError on errors.
+    """
+    tokens = _tokenize(expression)
+    position = 0
+
+    def peek() -> Tuple[str, str]:
+        return tokens[position]
+
+    def take() -> Tuple[str, str]:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def expect(token: Tuple[str, str]):
+        found = take()
+        if found != token:
+            raise ValueError(f"expected {token[1]!r}, got {found[1]!r}" if found[1] else f"expected {token[1]!r}")
+
+    def expression_of(keyword: str):
+        # "or" binds loosest, then "and"
+        operand = (lambda: expression_of("and")) if keyword == "or" else unary
+        nodes = [operand()]
+        while peek() == ("keyword", keyword):
+            take()
+            nodes.append(operand())
+        return nodes[0] if len(nodes) == 1 else (keyword, nodes)
+
+    def unary():
+        if peek() == ("keyword", "not"):
+            take()
+            return ("not", unary())
+        if peek() == ("op", "("):
+            take()
+            node = expression_of("or")
+            expect(("op", ")"))
+            return node
+        return comparison()
+
+    def comparison():
+        kind, name = take()
+        if kind != "word":
+            raise ValueError(f"expected a field, got {name!r}" if name else "expected a field at the end")
+        field = ALIASES.get(name.lower(), name.lower())
+        if field not in FIELDS:
+            raise ValueError(f"unknown field '{name}'. Choose from: {', '.join(FIELDS)}")
+        kind, operator = take()
+        if kind not in ("op", "keyword") or operator not in OPERATORS[FIELDS[field]]:
+            allowed = " ".join(OPERATORS[FIELDS[field]])
+            raise ValueError(f"expected one of {allowed} after '{name}'")
+        if operator == "in":
+            expect(("op", "("))
+            values = [value()]
+            while peek() == ("op", ","):
+                take()
+                values.append(value())
+            expect(("op", ")"))
+        else:
+            values = [value()]
+        for item in values:
+            _check(field, item)
+        return ("cmp", field, operator, values)
+
+    def value() -> str:
+        kind, text = take()
+        if kind not in ("word", "keyword"):
+            raise ValueError(f"expected a value, got {text!r}" if text else "expected a value at the end")
+        return text
+
+    tree = expression_of("or")
+    if peek()[0] != "end":
+        raise ValueError(f"unexpected {peek()[1]!r}")
+    return tree
+
+
+def _check(field: str, value: str):
+    kind = FIELDS[field]
+    if kind == "priority" and value.lower() not in PRIORITY_RANKS:
+        raise ValueError(f"unknown priority '{value}'. Choose from: {', '.join(PRIORITIES)}")
+    if kind == "date":
+        _interval(value, datetime.now())
+    if kind in ("duration", "count"):
+        _number(kind, value)
+
+
+def _number(kind: str, value: str) -> int:
+    if kind == "count":
+        if not value.isdigit():
+            raise ValueError(f"expected a number, got '{value}'")
+        return int(value)
+    match = _DURATION.match(value.lower())
+    if not value or match is None:
+        raise ValueError(f"expected a duration such as 90m, 2h or 1h30m, got '{value}'")
+    hours, minutes = match.groups()
+    return int(hours or 0) * 60 + int(minutes or 0)
+
+
+def _interval(value: str, now: datetime) -> Optional[Tuple[int, int]]:
+    """
+    [start, end) in microseconds since the epoch of a date value, None for
+    "none": a day for dates and named days, an instant otherwise.
+    """
+    text = value.lower()
+    if text == "none":
+        return None
+    today = datetime.combine(now.date(), time())
+    days = {"today": 0, "tomorrow": 1, "yesterday": -1}
+    if text in days:
+        start = timestamp((today + timedelta(days=days[text])).isoformat())
+        return start, start + _DAY
+    if text == "now":
+        moment = timestamp(now.isoformat())
+        return moment, moment + 1
+    match = _RELATIVE.match(text)
+    if match:
+        sign, count, unit = match.groups()
+        moment = timestamp((now + int(sign + count) * _UNITS[unit]).isoformat())
+        return moment, moment + 1
+    start = timestamp(value)
+    if start == MISSING:
+        raise ValueError(f"expected a date such as 2025-06-30, today or +7d, got '{value}'")
+    if "t" not in text and " " not in text:
+        return start, start + _DAY
+    return start, start + 1
+
+
+def _status(task: Dict) -> str:
+    if task.get("completed"):
+        return "completed"
+    return task.get("status") or "pending"
+
+
+def _worked(task: Dict) -> int:
+    return sum(int(session.get("duration") or 0) for session in task.get("work_sessions") or ())
+
+
+# Field -> value of a task, as compared by the predicate
+_GETTERS: Dict[str, Callable[[Dict], object]] = {
+    "id": lambda task: str(task["task_id"]).lower(),
+    "title": lambda task: (task.get("title") or "").lower(),
+    "description": lambda task: (task.get("description") or "").lower(),
+    "type": lambda task: task.get("type") or "",
+    "status": _status,
+    "priority": lambda task: PRIORITY_RANKS.get(task.get("priority"), 0),
+    "tag": lambda task: task.get("tags") or (),
+    "due": lambda task: timestamp(task.get("due_date")),
+    "created": lambda task: timestamp(task.get("created_at")),
+    "worked": _worked,
+    "sessions": lambda task: len(task.get("work_sessions") or ()),
+    "notes": lambda task: len(task.get("notes") or ()),
+}
+
+
+def _compare(operator: str, actual, expected) -> bool:
+    if operator == "=":
+        return actual == expected
+    if operator == "!=":
+        return actual != expected
+    if operator == "<":
+        return actual < expected
+    if operator == "<=":
+        return actual <= expected
+    if operator == ">":
+        return actual > expected
+    return actual >= expected
+
+
+def _date_test(operator: str, bounds: Optional[Tuple[int, int]]) -> Callable[[int], bool]:
+    if bounds is None:
+        # Only = none and != none make sense
+        return (lambda due: due == MISSING) if operator in ("=", "in") else (lambda due: due != MISSING)
+    start, end = bounds
+    tests = {
+        "=": lambda due: start <= due < end,
+        "in": lambda due: start <= due < end,
+        "!=": lambda due: not start <= due < end,
+        "<": lambda due: due < start,
+        "<=": lambda due: due < end,
+        ">": lambda due: due >= end,
+        ">=": lambda due: due >= start,
+    }
+    test = tests[operator]
+    return lambda due: due != MISSING and test(due)
+
+
+def _leaf(field: str, operator: str, values: List[str], now: datetime) -> Callable[[Dict], bool]:
+    kind = FIELDS[field]
+    get = _GETTERS[field]
+    if kind == "date":
+        # A task without the date matches no date condition but "= none" (not even "!= date")
+        tests = [_date_test(operator, _interval(value, now)) for value in values]
+        return lambda task: any(test(get(task)) for test in tests)
+    if kind == "tag":
+        wanted = set(values)
+        if operator == "!=":
+            return lambda task: not wanted.intersection(get(task))
+        return lambda task: bool(wanted.intersection(get(task)))
+    if kind == "text":
+        texts = [value.lower() for value in values]
+        if operator in ("~", "!~"):
+            negate = operator == "!~"
+            return lambda task: (texts[0] in get(task)) != negate
+    elif kind == "priority":
+        texts = [PRIORITY_RANKS[value.lower()] for value in values]
+    elif kind in ("duration", "count"):
+        texts = [_number(kind, value) for value in values]
+    else:
+        texts = [value.lower() for value in values]
+    if operator == "in":
+        allowed = set(texts)
+        return lambda task: get(task) in allowed
+    expected = texts[0]
+    return lambda task: _compare(operator, get(task), expected)
+
+
+def predicate(tree, now: Optional[datetime] = None) -> Callable[[Dict], bool]:
+    """Compile a parsed expression into one function of a task"""
+    now = now or datetime.now()
+    kind = tree[0]
+    if kind == "cmp":
+        return _leaf(tree[1], tree[2], tree[3], now)
+    if kind == "not":
+        inner = predicate(tree[1], now)
+        return lambda task: not inner(task)
+    parts = [predicate(node, now) for node in tree[1]]
+    if kind == "and":
+        return lambda task: all(part(task) for part in parts)
+    return lambda task: any(part(task) for part in parts)
+
+
+# SQL expressions of the fields on the tasks table of the SQLite backend
+_STATUS_SQL = "CASE WHEN coalesce(completed, 0) THEN 'completed' ELSE coalesce(nullif(status, ''), 'pending') END"
+_PRIORITY_SQL = (
+    "CASE priority " + " ".join(f"WHEN '{name}' THEN {rank}" for name, rank in PRIORITY_RANKS.items()) + " ELSE 0 END"
+)
+_COLUMNS_SQL = {
+    "id": "task_key",
+    "title": "lower(coalesce(title, ''))",
+    "description": "lower(coalesce(description, ''))",
+    "type": "coalesce(type, '')",
+    "status": _STATUS_SQL,
+    "priority": _PRIORITY_SQL,
+    "due": "due_date",
+    "created": "created_at",
+    "worked": "(SELECT coalesce(sum(duration), 0) FROM work_sessions WHERE task = tasks.id)",
+    "sessions": "(SELECT count(*) FROM work_sessions WHERE task = tasks.id)",
+    "notes": "(SELECT count(*) FROM notes WHERE task = tasks.id)",
+}
+_SQL_OPERATORS = {"=": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">=", "in": "="}
+
+
+# A stored timestamp in UTC, to the millisecond (SQLite's precision), as fixed-width text
+# that sorts like the moments themselves; NULL if it is missing or unreadable
+_MOMENT_SQL = "strftime('%Y-%m-%dT%H:%M:%f', {column})"
+
+
+def _moment_text(moment: int) -> str:
+    # Rounded up: for values to the millisecond, value >= moment exactly when value >= this
+    milliseconds = -(-moment // 1000)
+    return (datetime(1970, 1, 1) + timedelta(milliseconds=milliseconds)).isoformat(timespec="milliseconds")
+
+
+def _date_sql(column: str, operator: str, bounds: Optional[Tuple[int, int]]) -> Tuple[str, List]:
+    # Stored dates may be dates alone, or carry a timezone: compare them normalized, as predicate() does
+    moment = _MOMENT_SQL.format(column=column)
+    if bounds is None:
+        missing = f"{moment} IS NULL"
+        return (missing, []) if operator in ("=", "in") else (f"NOT {missing}", [])
+    column = moment
+    start, end = _moment_text(bounds[0]), _moment_text(bounds[1])
+    tests = {
+        "=": (f"{column} >= ? AND {column} < ?", [start, end]),
+        "in": (f"{column} >= ? AND {column} < ?", [start, end]),
+        "!=": (f"NOT ({column} >= ? AND {column} < ?)", [start, end]),
+        "<": (f"{column} < ?", [start]),
+        "<=": (f"{column} < ?", [end]),
+        ">": (f"{column} >= ?", [end]),
+        ">=": (f"{column} >= ?", [start]),
+    }
+    sql, params = tests[operator]
+    return f"{column} IS NOT NULL AND {sql}", params
+
+
+def _leaf_sql(field: str, operator: str, values: List[str], now: datetime) -> Tuple[str, List]:
+    kind = FIELDS[field]
+    if kind == "tag":
+        marks = ", ".join("?" * len(values))
+        sql = f"id IN (SELECT task FROM tags WHERE tag IN ({marks}))"
+        return (f"NOT {sql}" if operator == "!=" else sql), [*values]
+    column = _COLUMNS_SQL[field]
+    if kind == "date":
+        parts = [_date_sql(column, operator, _interval(value, now)) for value in values]
+        return " OR ".join(f"({sql})" for sql, _ in parts), [param for _, params in parts for param in params]
+    if kind == "text" and operator in ("~", "!~"):
+        sql = f"instr({column}, ?) > 0"
+        return (f"NOT {sql}" if operator == "!~" else sql), [values[0].lower()]
+    if kind == "priority":
+        params = [PRIORITY_RANKS[value.lower()] for value in values]
+    elif kind in ("duration", "count"):
+        params = [_number(kind, value) for value in values]
+    else:
+        params = [value.lower() for value in values]
+    if operator == "in":
+        return f"{column} IN ({', '.join('?' * len(params))})", params
+    return f"{column} {_SQL_OPERATORS[operator]} ?", params
+
+
+def to_sql(tree, now: Optional[datetime] = None) -> Tuple[str, List]:
+    """Compile a parsed expression into a SQL condition on the tasks table, with its parameters"""
+    now = now or datetime.now()
+    kind = tree[0]
+    if kind == "cmp":
+        sql, params = _leaf_sql(tree[1], tree[2], tree[3], now)
+        # Never NULL, so that "not" is the exact opposite, as in Python
+        return f"coalesce(({sql}), 0)", params
+    if kind == "not":
+        sql, params = to_sql(tree[1], now)
+        return f"NOT {sql}", params
+    parts = [to_sql(node, now) for node in tree[1]]
+    joiner = " AND " if kind == "and" else " OR "
+    return "(" + joiner.join(sql for sql, _ in parts) + ")", [param for _, params in parts for param in params]
+
+
+_TAG_NAME = re.compile(r"^[^\s&|!()]+$")
+
+
+def _tag_query(tree) -> Optional[str]:
+    """The tag query (see todo.tagindex) equivalent to a tree of tag conditions, or None"""
+    kind = tree[0]
+    if kind == "cmp":
+        _, field, operator, values = tree
+        if field != "tag" or not all(_TAG_NAME.match(value) for value in values):
+            return None
+        query = " | ".join(values)
+        return f"!({query})" if operator == "!=" else f"({query})"
+    if kind == "not":
+        inner = _tag_query(tree[1])
+        return None if inner is None else f"!{inner}"
+    parts = [_tag_query(node) for node in tree[1]]
+    if any(part is None for part in parts):
+        return None
+    return "(" + (" & " if kind == "and" else " | ").join(parts) + ")"
+
+
+def tag_query(tree) -> Tuple[Optional[str], Optional[object]]:
+    """
+    Split an expression into a tag query the tag index can answer and the
+    rest, to be checked task by task: (query or None, rest or None). Only
+    conditions of the top-level "and" that involve tags alone are moved to
+    the index.
+    """
+    nodes = tree[1] if tree[0] == "and" else [tree]
+    indexed, rest = [], []
+    for node in nodes:
+        query = _tag_query(node)
+        (rest if query is None else indexed).append(node if query is None else query)
+    query = " & ".join(indexed) if indexed else None
+    if not rest:
+        return query, None
+    return query, rest[0] if len(rest) == 1 else ("and", rest)
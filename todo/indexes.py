@@ -0,0 +1,192 @@
+"""Indexes derived from the project and persisted in the sidecar directory.
+
+Each index is stored in `.todo/<name>.index` together with the signature
+(see todo.watch) of the project files it was computed from, so a stale
+index is never used: it is rebuilt from the document instead. When todo
+saves the project itself, `after_save()` updates every existing index
+incrementally from the change records (see todo.journal) rather than
+rebuilding it. Indexes are also kept in memory, which makes repeated
+queries in one process (the daemon, a batch) cheap.
+"""
+
+import importlib
+import pickle
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from todo import storage, watch
+from todo.repository import task_key
+
+# Index name -> module defining it; imported on demand so that saving stays cheap
+INDEX_MODULES = {
+    "search": "todo.search",
+    "trigram": "todo.trigram",
+    "tags": "todo.tagindex",
+    "columns": "todo.columns",
+}
+
+REGISTRY: Dict[str, "SidecarIndex"] = {}
+
+# (resolved todo file, index name) -> (signature, state)
+_memory: Dict[Tuple[Path, str], Tuple[Any, Any]] = {}
+
+
+class SidecarIndex:
+    """
+    Base class for derived indexes. Subclasses set `name` and `version`
+    (bump it when the layout of the state changes) and implement `build()`
+    and `apply()`.
+    """
+
+    name = ""
+    version = 1
+
+    def build(self, todos: Dict) -> Any:
+        """Compute the index state from the whole document"""
+        raise NotImplementedError
+
+    def apply(self, state: Any, todos: Optional[Dict], changes: List[Dict]):
+        """
+        Update the state in place for a list of change records. `todos` is
+        the document after the changes, or None when the caller only has the
+        records; raise if they are not enough, the index is then rebuilt later.
+        """
+        raise NotImplementedError
+
+
+def register(index: SidecarIndex) -> SidecarIndex:
+    REGISTRY[index.name] = index
+    return index
+
+
+def changed_tasks(changes: List[Dict], fields) -> Tuple[Set[str], Set[str]]:
+    """
+    Keys (see todo.repository.task_key) of the tasks deleted and of the tasks
+    added or with one of `fields` changed by a list of change records
+    """
+    deleted: Set[str] = set()
+    changed: Set[str] = set()
+    for record in changes:
+        op = record["op"]
+        if op == "add":
+            key = task_key(record["task"]["task_id"])
+            deleted.discard(key)
+            changed.add(key)
+        elif op == "delete":
+            key = task_key(record["task_id"])
+            changed.discard(key)
+            deleted.add(key)
+        elif op == "set" and any(field in fields for field in record["values"]):
+            changed.add(task_key(record["task_id"]))
+        elif op == "append" and record["field"] in fields:
+            changed.add(task_key(record["task_id"]))
+    return deleted, changed
+
+
+def index_file(todo_file: Path, index: SidecarIndex) -> Path:
+    return storage.sidecar_dir(todo_file) / f"{index.name}.index"
+
+
+def _key(todo_file: Path, index: SidecarIndex) -> Tuple[Path, str]:
+    return todo_file.resolve(), index.name
+
+
+def _read(todo_file: Path, index: SidecarIndex, signature) -> Optional[Any]:
+    try:
+        with open(index_file(todo_file, index), "rb") as f:
+            if pickle.load(f) != (index.version, signature):
+                return None
+            return pickle.load(f)
+    except Exception:
+        # Missing, stale or corrupt: the caller rebuilds it
+        return None
+
+
+def _write(todo_file: Path, index: SidecarIndex, signature, state):
+    try:
+        storage.ensure_sidecar_dir(todo_file)
+        data = pickle.dumps((index.version, signature), protocol=pickle.HIGHEST_PROTOCOL)
+        data += pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        storage.atomic_write(index_file(todo_file, index), data, durable=False)
+    except Exception:
+        pass
+
+
+def signature(todo_file: Path):
+    return watch.signature(watch.project_files(todo_file))
+
+
+def get(index: SidecarIndex, todo_file: Path, todos: Optional[Dict] = None) -> Any:
+    """
+    Return the state of an index for the project as it is on disk, building
+    it (from `todos` if given, else from the loaded project) when needed.
+    """
+    current = signature(todo_file)
+    key = _key(todo_file, index)
+    cached = _memory.get(key)
+    if cached is not None and cached[0] == current:
+        return cached[1]
+    state = _read(todo_file, index, current)
+    if state is None:
+        state = index.build(todos if todos is not None else storage.load_document(todo_file))
+        _write(todo_file, index, current, state)
+    _memory[key] = (current, state)
+    return state
+
+
+def after_save(todo_file: Path, todos: Optional[Dict], changes: Optional[List[Dict]], before):
+    """
+    Bring the existing indexes up to date after todo wrote the project.
+
+    `before` is the signature of the project files before the write. Indexes
+    that were not in sync with it are left alone; they will be rebuilt the
+    next time they are needed. Without `changes`, in-sync indexes are rebuilt
+    from `todos`.
+    """
+    resolved = todo_file.resolve()
+    names = {name for path, name in _memory if path == resolved}
+    names.update(path.stem for path in storage.sidecar_dir(todo_file).glob("*.index"))
+    after = None
+    for name in sorted(names):
+        if name not in REGISTRY and name in INDEX_MODULES:
+            # Only the modules of existing indexes are imported
+            importlib.import_module(INDEX_MODULES[name])
+        index = REGISTRY.get(name)
+        if index is None:
+            continue
+        key = _key(todo_file, index)
+        cached = _memory.pop(key, None)
+        if cached is not None and cached[0] == before:
+            state = cached[1]
+        elif index_file(todo_file, index).exists():
+            state = _read(todo_file, index, before)
+        else:
+            continue
+        if state is None:
+            continue
+        try:
+            if changes is None:
+                if todos is None:
+                    continue
+                state = index.build(todos)
+            else:
+                index.apply(state, todos, changes)
+        except Exception:
+            # Leave the (now stale) index to be rebuilt on next use
+            continue
+        if after is None:
+            after = signature(todo_file)
+        _write(todo_file, index, after, state)
+        _memory[key] = (after, state)
+
+
+def discard(index: SidecarIndex, todo_file: Path):
+    """Drop an index, in memory and on disk, so that its next use rebuilds it"""
+    _memory.pop(_key(todo_file, index), None)
+    index_file(todo_file, index).unlink(missing_ok=True)
+
+
+def clear_memory():
+    """Forget the in-memory copies (the files on disk are kept)"""
+    _memory.clear()
+
@@ -0,0 +1,148 @@
+"""Append-only journal of changes made on top of todo.yaml.
+
+In journal mode a command that changes a handful of fields appends a small
+JSON record to `todo.journal` instead of rewriting the whole YAML file.
+Loading the project replays the journal on top of the last checkpoint
+(`todo.yaml`), and `todo compact` (or the next full save once the journal
+grows past `MAX_BYTES`) folds the records back into the YAML file.
+
+Record shapes:
+    {"op": "add", "task": {...}}
+    {"op": "delete", "task_id": "PROJ-001"}
+    {"op": "set", "task_id": "PROJ-001", "values": {"status": "doing"}}
+    {"op": "append", "task_id": "PROJ-001", "field": "notes", "values": ["..."]}
+    {"op": "project", "values": {"next_task_number": 4}}
+    {"op": "document", "values": {"checklist": [...]}}
+    {"op": "compacted", "digest": "..."}
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from todo.repository import TaskRepository
+
+# Once the journal is this large, the next change rewrites todo.yaml instead.
+MAX_BYTES = 1024 * 1024
+
+
+def journal_file(todo_file: Path) -> Path:
+    """Path of the journal belonging to a todo file"""
+    return todo_file.with_suffix(".journal")
+
+
+def add_task_op(task: Dict) -> Dict:
+    return {"op": "add", "task": task}
+
+
+def delete_task_op(task_id: str) -> Dict:
+    return {"op": "delete", "task_id": task_id}
+
+
+def set_op(task: Dict, *fields: str) -> Dict:
+    """Record the current value of some fields of a task"""
+    return {
+        "op": "set",
+        "task_id": task["task_id"],
+        "values": {field: task.get(field) for field in fields},
+    }
+
+
+def append_op(task: Dict, field: str, count: int = 1) -> Dict:
+    """Record the last `count` items appended to a list field of a task"""
+    return {
+        "op": "append",
+        "task_id": task["task_id"],
+        "field": field,
+        "values": task[field][-count:],
+    }
+
+
+def project_op(todos: Dict, *fields: str) -> Dict:
+    """Record the current value of some project settings"""
+    return {"op": "project", "values": {field: todos["project"].get(field) for field in fields}}
+
+
+def document_op(todos: Dict, key: str) -> Dict:
+    """Record the current value of a top-level key of the document"""
+    return {"op": "document", "values": {key: todos.get(key)}}
+
+
+def read_records(path: Path) -> List[Dict]:
+    """Read all records from a journal, skipping a torn last line"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return parse_records(f.read())
+    except FileNotFoundError:
+        return []
+
+
+def parse_records(text: str) -> List[Dict]:
+    """Parse journal lines, skipping a torn last line"""
+    records = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # A crash in the middle of an append leaves a partial line behind
+            continue
+    return records
+
+
+def append_records(path: Path, records: List[Dict]):
+    """Durably append records to the journal"""
+    data = "".join(json.dumps(record, default=str) + "\n" for record in records)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def mark_compacted(path: Path, digest: str):
+    """Note that the journal is about to be folded into a todo file with this digest"""
+    append_records(path, [{"op": "compacted", "digest": digest}])
+
+
+def pending(records: List[Dict], digest: str) -> List[Dict]:
+    """
+    Return the records that still have to be replayed on top of the todo
+    file whose content has the given digest.
+
+    The records up to a `compacted` marker for the current file have
+    already been folded into it (the process stopped before deleting the
+    journal, and later changes may have been appended after the marker).
+    Without such a marker every record is replayed, even if todo.yaml was
+    edited by hand in the meantime, so that no change is ever lost.
+    """
+    start = 0
+    for position, record in enumerate(records):
+        if record["op"] == "compacted" and record["digest"] == digest:
+            start = position + 1
+    return [record for record in records[start:] if record["op"] != "compacted"]
+
+
+def replay(todos: Dict, records: List[Dict]) -> Dict:
+    """Apply journal records to a document in place"""
+    repo = TaskRepository(todos)
+    for record in records:
+        op = record["op"]
+        if op == "add":
+            repo.add(record["task"])
+        elif op == "delete":
+            repo.delete(record["task_id"])
+        elif op == "project":
+            todos["project"].update(record["values"])
+        elif op == "document":
+            todos.update(record["values"])
+        else:
+            task = repo.get(record["task_id"])
+            if task is None:
+                continue
+            if op == "set":
+                task.update(record["values"])
+            elif op == "append":
+                task.setdefault(record["field"], []).extend(record["values"])
+    return todos
@@ -0,0 +1,238 @@
+"""The project as the board sees it, kept up to date while the board runs.
+
+A ProjectStore holds the tasks in the compact model (todo.model) with a
+revision number per task. A background thread waits for the project files
+to change (see watch.Notifier) and refreshes the store:
+
+- in journal mode, when only the journal grew, just the new records are
+  read and applied to the tasks they name;
+- otherwise (a rewritten todo.yaml, a compacted journal, the SQLite
+  backend) the project is reloaded, and tasks whose content did not change
+  keep their object and revision.
+
+Readers never wait for a refresh: each refresh builds a new View (tasks,
+positions, revisions) and swaps it in with one assignment, so a page
+renders from one consistent view. The board compares revisions to only
+re-render what changed.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from todo import journal, storage, watch
+from todo.model import Task, load_tasks
+from todo.repository import task_key
+
+# Seconds a refresh waits for the project lock before trying again later
+LOCK_TIMEOUT = 2.0
+# Seconds to let a burst of writes settle before refreshing
+SETTLE_DELAY = 0.05
+
+
+class View:
+    """An immutable state of the project: tasks, their positions by task key and their revisions"""
+
+    __slots__ = ("tasks", "positions", "revisions", "version")
+
+    def __init__(self, tasks: List[Task], revisions: Dict[str, int], version: int):
+        self.tasks = tasks
+        self.positions: Dict[str, int] = {}
+        for position, task in enumerate(tasks):
+            # Like TaskRepository, the first task with a given id wins
+            self.positions.setdefault(task_key(task.task_id), position)
+        self.revisions = revisions
+        self.version = version
+
+    def get(self, task_id) -> Optional[Task]:
+        position = self.positions.get(task_key(task_id))
+        return None if position is None else self.tasks[position]
+
+    def revision(self, task_id) -> Optional[int]:
+        return self.revisions.get(task_key(task_id))
+
+
+class ProjectStore:
+    """
+    Tasks shared by every request of the board. Without a todo file it is
+    a fixed snapshot; with one, start() keeps it in sync with the files.
+    """
+
+    def __init__(self, tasks: Iterable[Dict], todo_file: Optional[Path] = None):
+        self.todo_file = todo_file
+        self.reloads = 0  # full reloads, for tests and diagnostics
+        self._journal: Optional[tuple] = None  # (inode, offset) of the journal bytes already applied
+        self._base = None  # signature of todo.yaml and the database when the journal was last read
+        self._refreshing = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Called with the previous and the new view after every change
+        self.listeners: List[Callable[[View, View], None]] = []
+        tasks = load_tasks(tasks)
+        self.view = View(tasks, {task_key(task.task_id): 0 for task in tasks}, 0)
+
+    @classmethod
+    def open(cls, todo_file: Path) -> "ProjectStore":
+        """Load the project and follow the changes made to it"""
+        store = cls([], todo_file)
+        store.refresh()
+        return store
+
+    # Read access, always from the current view
+    @property
+    def tasks(self) -> List[Task]:
+        return self.view.tasks
+
+    @property
+    def version(self) -> int:
+        return self.view.version
+
+    def get(self, task_id) -> Optional[Task]:
+        return self.view.get(task_id)
+
+    @property
+    def live(self) -> bool:
+        return self.todo_file is not None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the tasks are those of the project: loaded and, once started, still followed"""
+        if self.todo_file is None:
+            return True
+        following = self._thread is None or self._thread.is_alive()
+        return self.reloads > 0 and following
+
+    def refresh(self) -> bool:
+        """Bring the store up to date with the files; whether anything changed"""
+        if self.todo_file is None:
+            return False
+        with self._refreshing:
+            try:
+                with storage.lock(self.todo_file, LOCK_TIMEOUT, shared=True):
+                    records = self._new_records()
+                    if records is None:
+                        return self._reload()
+                    return self._apply(records)
+            except storage.LockTimeout:
+                # A writer holds the project: the next change event or check retries
+                return False
+
+    def _files(self):
+        return watch.signature([self.todo_file, storage.database_file(self.todo_file)])
+
+    def _journal_state(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(journal.journal_file(self.todo_file))
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size
+
+    def _new_records(self) -> Optional[List[Dict]]:
+        """Records appended to the journal since the last refresh, or None if a full reload is needed"""
+        if self._journal is None or self._base != self._files():
+            return None
+        state = self._journal_state()
+        inode, offset = self._journal
+        if state is None or state[0] != inode or state[1] < offset:
+            return None
+        with open(journal.journal_file(self.todo_file), "rb") as f:
+            f.seek(offset)
+            data = f.read(state[1] - offset)
+        # Only whole lines: a record being appended is read next time
+        end = data.rfind(b"\n") + 1
+        self._journal = (inode, offset + end)
+        return journal.parse_records(data[:end].decode("utf-8"))
+
+    def _reload(self) -> bool:
+        self.reloads += 1
+        self._base = self._files()
+        document = storage.load_document(self.todo_file)
+        # load_document() replayed the whole journal: the next refresh reads from its current end
+        self._journal = self._journal_state()
+        current = self.view
+        version = current.version + 1
+        tasks, revisions, changed = [], {}, False
+        for data in document["tasks"]:
+            key = task_key(data["task_id"])
+            old = current.get(key)
+            if old is not None and key not in revisions and old.to_dict() == data:
+                task, revisions[key] = old, current.revisions[key]
+            else:
+                task, changed = Task.from_dict(data), True
+                revisions.setdefault(key, version)
+            tasks.append(task)
+        if not changed and len(tasks) == len(current.tasks):
+            return False
+        self._swap(View(tasks, revisions, version))
+        return True
+
+    def _apply(self, records: List[Dict]) -> bool:
+        """Apply journal records to a copy of the current view, like journal.replay() does to a document"""
+        current = self.view
+        version = current.version + 1
+        tasks, revisions = list(current.tasks), dict(current.revisions)
+        positions = dict(current.positions)
+        changed = False
+        for record in records:
+            op = record["op"]
+            if op == "add":
+                task = Task.from_dict(record["task"])
+                key = task_key(task.task_id)
+                positions.setdefault(key, len(tasks))
+                tasks.append(task)
+            elif op == "delete":
+                key = task_key(record["task_id"])
+                if key not in positions:
+                    continue
+                tasks = [task for task in tasks if task_key(task.task_id) != key]
+                positions = View(tasks, {}, 0).positions
+                revisions.pop(key, None)
+                changed = True
+                continue
+            elif op in ("set", "append"):
+                key = task_key(record["task_id"])
+                position = positions.get(key)
+                if position is None:
+                    continue
+                data = tasks[position].to_dict()
+                if op == "set":
+                    data.update(record["values"])
+                else:
+                    data.setdefault(record["field"], []).extend(record["values"])
+                tasks[position] = Task.from_dict(data)
+            else:
+                # Project settings and compaction markers do not show on the board
+                continue
+            revisions[key] = version
+            changed = True
+        if changed:
+            self._swap(View(tasks, revisions, version))
+        return changed
+
+    def _swap(self, view: View):
+        previous, self.view = self.view, view
+        for listener in self.listeners:
+            listener(previous, view)
+
+    def start(self):
+        """Follow changes to the project files in a background thread"""
+        if self.todo_file is None or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._follow, name="todo-board-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _follow(self):
+        notifier = watch.Notifier(watch.project_files(self.todo_file))
+        try:
+            while not self._stop.is_set():
+                # Until the project could be loaded (e.g. it was locked at startup), retry at every check
+                if notifier.wait(timeout=watch.SAFETY_INTERVAL) or not self.reloads:
+                    self._stop.wait(SETTLE_DELAY)
+                    notifier.reset()
+                    self.refresh()
+        finally:
+            notifier.close()
@@ -0,0 +1,308 @@
+"""Compact, typed tasks for processes that keep a project in memory (`todo board`).
+
+A task read from the YAML file is a dict that repeats its keys, with a dict
+per work session and per status change and a fresh string for every type,
+priority, status and tag. A Task keeps the known fields in __slots__, its
+work sessions as parallel arrays (start in microseconds since the epoch,
+duration, interrupted flag; see WorkSessions) and its status changes as
+slotted StatusChange objects, and interns the strings that repeat across
+tasks. benchmarks/bench_memory.py measures the difference.
+
+Conversion is lossless: Task.from_dict(task).to_dict() == task, key order
+included. Unknown fields are kept aside, and a session or status change that
+does not have the shape todo writes (e.g. one edited by hand) is kept as it
+is rather than normalized.
+
+A Task can also be read like the dict it comes from (task["title"],
+task.get("tags", [])), so code written for dicts works on it unchanged;
+hot paths use the attributes instead.
+"""
+
+from array import array
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from sys import intern
+from typing import Dict, Iterator, List, Optional
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Keys of a work session, in the order todo writes them
+SESSION_KEYS = ("started_at", "duration", "interrupted")
+
+# Known priorities, from the most urgent
+PRIORITIES = ["high", "medium", "low"]
+PRIORITY_CODES = {name: code for code, name in enumerate(PRIORITIES)}
+
+# Fields of a task kept in slots; any other key is kept in Task.extra
+FIELDS = (
+    "task_id",
+    "title",
+    "description",
+    "type",
+    "priority",
+    "status",
+    "completed",
+    "created_at",
+    "due_date",
+    "repeat",
+    "tags",
+    "notes",
+    "work_sessions",
+    "status_history",
+)
+_FIELD_SET = frozenset(FIELDS)
+
+# Key orders seen so far: tasks written by todo share a handful of them
+_LAYOUTS: Dict[tuple, tuple] = {}
+
+
+def _micros(text) -> Optional[int]:
+    """Microseconds since the epoch of a naive ISO timestamp that isoformat() writes back unchanged, else None"""
+    if type(text) is not str:
+        return None
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if moment.tzinfo is not None or moment.isoformat() != text:
+        return None
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _iso(micros: int) -> str:
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
+
+
+def _interned(value):
+    return intern(value) if type(value) is str else value
+
+
+class WorkSession:
+    """One work session: start time (ISO string, as stored), minutes worked and whether it was interrupted"""
+
+    __slots__ = ("started_at", "duration", "interrupted")
+
+    def __init__(self, started_at: Optional[str], duration: int, interrupted: bool):
+        self.started_at = started_at
+        self.duration = duration
+        self.interrupted = interrupted
+
+    def to_dict(self) -> Dict:
+        return {"started_at": self.started_at, "duration": self.duration, "interrupted": self.interrupted}
+
+
+class WorkSessions:
+    """
+    The work sessions of a task as parallel arrays. A session that does
+    not have the shape todo writes is kept verbatim in `irregular`, by
+    position, with zeros in the arrays.
+    """
+
+    __slots__ = ("start", "duration", "interrupted", "irregular")
+
+    def __init__(self):
+        self.start = array("q")
+        self.duration = array("q")
+        self.interrupted = array("b")
+        self.irregular: Optional[Dict[int, object]] = None
+
+    @classmethod
+    def from_dicts(cls, sessions: List) -> "WorkSessions":
+        result = cls()
+        for session in sessions:
+            result.append(session)
+        return result
+
+    def append(self, session):
+        start = None
+        if (
+            type(session) is dict
+            and tuple(session) == SESSION_KEYS
+            and type(session["duration"]) is int
+            and type(session["interrupted"]) is bool
+        ):
+            start = _micros(session["started_at"])
+        if start is None:
+            if self.irregular is None:
+                self.irregular = {}
+            self.irregular[len(self.start)] = session
+            start, duration, interrupted = 0, 0, False
+        else:
+            duration, interrupted = session["duration"], session["interrupted"]
+        self.start.append(start)
+        self.duration.append(duration)
+        self.interrupted.append(interrupted)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __iter__(self) -> Iterator[WorkSession]:
+        """The sessions as WorkSession objects (irregular ones read leniently)"""
+        irregular = self.irregular or {}
+        for position in range(len(self.start)):
+            session = irregular.get(position)
+            if session is None:
+                yield WorkSession(_iso(self.start[position]), self.duration[position], bool(self.interrupted[position]))
+            else:
+                session = session if isinstance(session, dict) else {}
+                yield WorkSession(
+                    session.get("started_at"),
+                    int(session.get("duration") or 0),
+                    bool(session.get("interrupted", False)),
+                )
+
+    def total_duration(self) -> int:
+        """Minutes worked over every session"""
+        total = sum(self.duration)
+        for session in (self.irregular or {}).values():
+            if isinstance(session, dict):
+                total += int(session.get("duration") or 0)
+        return total
+
+    def interrupted_count(self) -> int:
+        count = sum(self.interrupted)
+        for session in (self.irregular or {}).values():
+            if isinstance(session, dict):
+                count += bool(session.get("interrupted", False))
+        return count
+
+    def to_dicts(self) -> List:
+        """The sessions in the YAML schema"""
+        irregular = self.irregular or {}
+        return [
+            irregular[position] if position in irregular else {
+                "started_at": _iso(self.start[position]),
+                "duration": self.duration[position],
+                "interrupted": bool(self.interrupted[position]),
+            }
+            for position in range(len(self.start))
+        ]
+
+
+class StatusChange:
+    """One entry of a task's status history; keys other than status and timestamp are kept in `extra`"""
+
+    __slots__ = ("status", "timestamp", "extra")
+
+    def __init__(self, status: str, timestamp: Optional[str], extra: Optional[Dict] = None):
+        self.status = status
+        self.timestamp = timestamp
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, entry: Dict) -> "StatusChange":
+        extra = {key: value for key, value in entry.items() if key not in ("status", "timestamp")}
+        return cls(_interned(entry["status"]), entry["timestamp"], extra or None)
+
+    def to_dict(self) -> Dict:
+        entry = {"status": self.status, "timestamp": self.timestamp}
+        if self.extra:
+            entry.update(self.extra)
+        return entry
+
+
+def _history(entries: List) -> List:
+    # Entries that do not start with status and timestamp are kept as they are
+    return [
+        StatusChange.from_dict(entry) if type(entry) is dict and tuple(entry)[:2] == ("status", "timestamp") else entry
+        for entry in entries
+    ]
+
+
+class Task(Mapping):
+    """
+    A task with its fields as attributes (None when the task lacks the
+    field). Read-only when used as a mapping: `task["work_sessions"]` and
+    `task["status_history"]` build the YAML form on every access, so hot
+    paths should use `task.work_sessions` and `task.status_history`.
+    """
+
+    __slots__ = FIELDS + ("layout", "extra")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Task":
+        task = cls.__new__(cls)
+        for name in FIELDS:
+            setattr(task, name, None)
+        extra = None
+        for key, value in data.items():
+            if key not in _FIELD_SET:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif key in ("type", "priority", "status"):
+                setattr(task, key, _interned(value))
+            elif key == "tags" and type(value) is list:
+                task.tags = [_interned(tag) for tag in value]
+            elif key == "work_sessions" and type(value) is list:
+                task.work_sessions = WorkSessions.from_dicts(value)
+            elif key == "status_history" and type(value) is list:
+                task.status_history = _history(value)
+            else:
+                setattr(task, key, value)
+        layout = tuple(data)
+        task.layout = _LAYOUTS.setdefault(layout, layout)
+        task.extra = extra
+        return task
+
+    def _export(self, key: str):
+        if key not in _FIELD_SET:
+            return self.extra[key]
+        value = getattr(self, key)
+        if isinstance(value, WorkSessions):
+            return value.to_dicts()
+        if key == "status_history" and type(value) is list:
+            return [entry.to_dict() if isinstance(entry, StatusChange) else entry for entry in value]
+        if type(value) is list:
+            # A copy, so that the mapping view stays read-only
+            return list(value)
+        return value
+
+    def to_dict(self) -> Dict:
+        """The task in the YAML schema, with its original key order"""
+        return {key: self._export(key) for key in self.layout}
+
+    def __getitem__(self, key: str):
+        if key not in self.layout:
+            raise KeyError(key)
+        return self._export(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.layout
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.layout)
+
+    def __len__(self) -> int:
+        return len(self.layout)
+
+    def __repr__(self) -> str:
+        return f"Task({self.task_id!r}, {self.title!r})"
+
+    @property
+    def sessions(self) -> WorkSessions:
+        """The work sessions, empty if the task has none"""
+        sessions = self.work_sessions
+        if isinstance(sessions, WorkSessions):
+            return sessions
+        return WorkSessions.from_dicts(sessions if type(sessions) is list else [])
+
+    @property
+    def state(self) -> str:
+        """Board column of the task: completed, cancelled, doing or pending"""
+        if self.completed:
+            return "completed"
+        if self.status in ("cancelled", "doing"):
+            return self.status
+        return "pending"
+
+
+def load_tasks(tasks: List[Dict]) -> List[Task]:
+    """Convert the tasks of a document to the compact model"""
+    return [Task.from_dict(task) for task in tasks]
+
+
+def dump_tasks(tasks: List[Task]) -> List[Dict]:
+    """Convert tasks back to the YAML schema"""
+    return [task.to_dict() for task in tasks]
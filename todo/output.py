@@ -0,0 +1,112 @@
+"""Machine-readable output (`--format json|ndjson|csv|tsv`).
+
+Records are written to stdout one at a time as they are produced, without
+Rich: nothing is buffered or measured, so `todo list -a --format ndjson |
+jq` starts printing at once and uses the same memory for any number of
+tasks. Field names are stable (see TASK_FIELDS) so scripts can rely on
+them.
+"""
+
+import csv
+import json
+import os
+import sys
+from typing import Dict, Iterable, List, Optional
+
+# Values of --format; "table" is the Rich output
+FORMATS = ["table", "json", "ndjson", "csv", "tsv"]
+
+# Fields of a task record, in column order
+TASK_FIELDS = [
+    "task_id",
+    "title",
+    "type",
+    "priority",
+    "status",
+    "completed",
+    "due_date",
+    "tags",
+    "time_worked",
+    "sessions",
+    "notes",
+]
+
+
+def check_format(name: str) -> Optional[str]:
+    """An error message if `name` is not a known format"""
+    if name not in FORMATS:
+        return f"Unknown format '{name}'. Choose from: {', '.join(FORMATS)}"
+    return None
+
+
+def task_record(task: Dict) -> Dict:
+    """
+    The stable record of a task: time worked in minutes, due date as
+    stored, tags sorted and notes counted.
+    """
+    sessions = task.get("work_sessions") or []
+    return {
+        "task_id": task["task_id"],
+        "title": task.get("title"),
+        "type": task.get("type"),
+        "priority": task.get("priority"),
+        "status": task.get("status"),
+        "completed": bool(task.get("completed", False)),
+        "due_date": task.get("due_date") or None,
+        "tags": sorted(task.get("tags") or []),
+        "time_worked": sum(int(session.get("duration") or 0) for session in sessions),
+        "sessions": len(sessions),
+        "notes": len(task.get("notes") or []),
+    }
+
+
+def _cell(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def _json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def write_records(records: Iterable[Dict], name: str, fields: List[str]):
+    """
+    Stream records to stdout: a JSON array, one JSON object per line, or
+    CSV/TSV rows under a header of `fields` (lists joined with commas).
+    """
+    stream = sys.stdout
+    try:
+        if name == "json":
+            separator = "[\n"
+            for record in records:
+                stream.write(separator + _json(record))
+                separator = ",\n"
+            stream.write("[]\n" if separator == "[\n" else "\n]\n")
+        elif name == "ndjson":
+            for record in records:
+                stream.write(_json(record) + "\n")
+        else:
+            writer = csv.writer(stream, delimiter="\t" if name == "tsv" else ",", lineterminator="\n")
+            writer.writerow(fields)
+            for record in records:
+                writer.writerow([_cell(record.get(field)) for field in fields])
+        stream.flush()
+    except BrokenPipeError:
+        # The reader went away (e.g. `| head`): stop quietly, like other command-line tools
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        raise SystemExit(0)
+
+
+def write_object(value: Dict, name: str):
+    """Write a single object (e.g. statistics): JSON, one NDJSON line, or a CSV/TSV header and row"""
+    if name == "json":
+        sys.stdout.write(json.dumps(value, ensure_ascii=False, indent=2, default=str) + "\n")
+        sys.stdout.flush()
+    else:
+        write_records([value], name, list(value))
@@ -0,0 +1,196 @@
+"""Natural-language due dates and repeat rules.
+
+dateparser reads almost any phrase, but importing it and loading its
+language data takes seconds, and every call tries a chain of parsers. The
+phrases people actually type are a handful of forms ("tomorrow", "in 3
+days", "next friday", "2025-07-01"), which a small grammar reads directly;
+dateparser is only imported for the others. Compiled phrases are memoized
+by their text, and resolved dates by phrase and base date.
+
+Repeat rules ("every week", "every 2 months", "every monday") are compiled
+once, when they are set, into a recurrence stored on the task next to the
+rule (see compile_rule()), so completing a repeating task computes its next
+due date without parsing anything.
+"""
+
+import calendar
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+# Distinct (phrase, base date) pairs kept resolved
+CACHE_SIZE = 4096
+
+UNITS = ["minutes", "hours", "days", "weeks", "months", "years"]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+_UNIT = r"(minute|hour|day|week|month|year)s?"
+_COUNT = r"(a|an|\d+)"
+_WEEKDAY = f"({'|'.join(WEEKDAYS)})"
+
+# Relative phrases: pattern -> compiled form, from the match
+_DATE_GRAMMAR = [
+    (re.compile(r"(today|now)"), lambda m: ("shift", "days", 0)),
+    (re.compile(r"tomorrow"), lambda m: ("shift", "days", 1)),
+    (re.compile(r"yesterday"), lambda m: ("shift", "days", -1)),
+    (re.compile(r"(the )?day after tomorrow"), lambda m: ("shift", "days", 2)),
+    (re.compile(r"(the )?day before yesterday"), lambda m: ("shift", "days", -2)),
+    (re.compile(f"in {_COUNT} {_UNIT}"), lambda m: ("shift", m[2] + "s", _count(m[1]))),
+    (re.compile(f"{_COUNT} {_UNIT} ago"), lambda m: ("shift", m[2] + "s", -_count(m[1]))),
+    (re.compile(r"next (week|month|year)"), lambda m: ("shift", m[1] + "s", 1)),
+    (re.compile(f"next {_WEEKDAY}"), lambda m: ("weekday", WEEKDAYS.index(m[1]), 1)),
+]
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}([T ][\d:.]+)?")
+
+_ADVERBS = {"daily": "days", "weekly": "weeks", "monthly": "months", "yearly": "years"}
+
+# Repeat rules: pattern -> (unit or weekday, interval), from the match
+_RULE_GRAMMAR = [
+    (re.compile(r"(daily|weekly|monthly|yearly)"), lambda m: (_ADVERBS[m[1]], 1)),
+    (re.compile(r"annually"), lambda m: ("years", 1)),
+    (re.compile(r"(biweekly|fortnightly)"), lambda m: ("weeks", 2)),
+    (re.compile(r"every fortnight"), lambda m: ("weeks", 2)),
+    (re.compile(r"every (day|week|month|year)"), lambda m: (m[1] + "s", 1)),
+    (re.compile(r"every other (day|week|month|year)"), lambda m: (m[1] + "s", 2)),
+    (re.compile(r"every (\d+) (day|week|month|year)s?"), lambda m: (m[2] + "s", int(m[1]))),
+    (re.compile(f"every {_WEEKDAY}s?"), lambda m: (m[1], 1)),
+    (re.compile(f"every other {_WEEKDAY}"), lambda m: (m[1], 2)),
+]
+
+
+def _count(text: str) -> int:
+    return 1 if text in ("a", "an") else int(text)
+
+
+def normalize(phrase: str) -> str:
+    """Lower case, single spaces: the form phrases are matched and cached under"""
+    return " ".join(str(phrase).lower().split())
+
+
+def add_months(moment: datetime, months: int) -> datetime:
+    """The same day `months` later, clamped to the end of shorter months (Jan 31 -> Feb 28)"""
+    month = moment.month - 1 + months
+    year, month = moment.year + month // 12, month % 12 + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, calendar.monthrange(year, month)[1]))
+
+
+def shift(moment: datetime, unit: str, count: int) -> datetime:
+    """`moment` moved by `count` units (see UNITS)"""
+    if unit == "months":
+        return add_months(moment, count)
+    if unit == "years":
+        return add_months(moment, 12 * count)
+    return moment + timedelta(**{unit: count})
+
+
+def _next_weekday(moment: datetime, weekday: int, weeks: int = 1) -> datetime:
+    # The first such weekday strictly after `moment`, then every `weeks` weeks
+    days = (weekday - moment.weekday() - 1) % 7 + 1
+    return moment + timedelta(days=days + 7 * (weeks - 1))
+
+
+@lru_cache(maxsize=1024)
+def compile_phrase(text: str) -> Optional[Tuple]:
+    """
+    The compiled form of a normalized date phrase, or None if the grammar
+    does not cover it: ("absolute", datetime), ("shift", unit, count) or
+    ("weekday", weekday, weeks).
+    """
+    if _ISO_DATE.fullmatch(text):
+        try:
+            return ("absolute", datetime.fromisoformat(text))
+        except ValueError:
+            return None
+    for pattern, build in _DATE_GRAMMAR:
+        match = pattern.fullmatch(text)
+        if match:
+            return build(match)
+    return None
+
+
+def _apply(compiled: Tuple, base: datetime) -> datetime:
+    kind = compiled[0]
+    if kind == "absolute":
+        return compiled[1]
+    if kind == "shift":
+        return shift(base, compiled[1], compiled[2])
+    return _next_weekday(base, compiled[1], compiled[2])
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _resolve(text: str, base: datetime) -> Optional[datetime]:
+    compiled = compile_phrase(text)
+    if compiled is not None:
+        return _apply(compiled, base)
+    import dateparser
+
+    return dateparser.parse(text, settings={"RELATIVE_BASE": base})
+
+
+def parse_date(phrase: str, base: Optional[datetime] = None) -> Optional[datetime]:
+    """
+    The date a phrase such as "tomorrow" or "in 2 weeks" refers to, counted
+    from `base` (by default the current minute), or None if it is not
+    understood.
+    """
+    if not phrase or not str(phrase).strip():
+        return None
+    if base is None:
+        # Truncated so that repeated calls within a minute share a cache entry
+        base = datetime.now().replace(second=0, microsecond=0)
+    return _resolve(normalize(phrase), base)
+
+
+@lru_cache(maxsize=1024)
+def _compile_rule(text: str) -> Optional[Tuple[str, int]]:
+    for pattern, build in _RULE_GRAMMAR:
+        match = pattern.fullmatch(text)
+        if match:
+            return build(match)
+    return None
+
+
+def compile_rule(rule: Optional[str]) -> Optional[Dict]:
+    """
+    The recurrence of a repeat rule, to be stored on the task, or None if
+    the rule is not one of the recurring forms (it is then read as a date
+    phrase relative to the due date, see next_due()). For example "every 2
+    weeks" gives {"rule": "every 2 weeks", "unit": "weeks", "interval": 2}
+    and "every monday" gives {"rule": ..., "weekday": "monday", "interval": 1}.
+    """
+    if not rule:
+        return None
+    compiled = _compile_rule(normalize(rule))
+    if compiled is None:
+        return None
+    unit, interval = compiled
+    key = "weekday" if unit in WEEKDAYS else "unit"
+    return {"rule": rule, key: unit, "interval": interval}
+
+
+def recurrence_of(task: Dict) -> Optional[Dict]:
+    """The stored recurrence of a task if it matches its repeat rule, else the rule compiled afresh"""
+    recurrence = task.get("recurrence")
+    if recurrence and recurrence.get("rule") == task.get("repeat"):
+        return recurrence
+    return compile_rule(task.get("repeat"))
+
+
+def advance(recurrence: Dict, base: datetime) -> Optional[datetime]:
+    """The occurrence of a recurrence after `base`, or None if it is malformed"""
+    interval = recurrence.get("interval") or 1
+    if recurrence.get("weekday") in WEEKDAYS:
+        return _next_weekday(base, WEEKDAYS.index(recurrence["weekday"]), interval)
+    if recurrence.get("unit") in UNITS:
+        return shift(base, recurrence["unit"], interval)
+    return None
+
+
+def next_due(task: Dict, base: datetime) -> Optional[datetime]:
+    """The next due date of a repeating task after `base`, or None if its rule is not understood"""
+    recurrence = recurrence_of(task)
+    if recurrence is not None:
+        return advance(recurrence, base)
+    return parse_date(task.get("repeat"), base)
@@ -0,0 +1,148 @@
+"""Sorting and paging of task listings (`--sort`, `--limit`, `--offset`, `--page`).
+
+A sort specification such as `due,priority,-created` is turned into one
+key per task, computed once before sorting: dates are parsed a single
+time instead of at every comparison. When only a page of the result is
+shown, the tasks before its end are picked with a heap (top-k selection)
+rather than by sorting every task, and without --sort the listing is
+sliced lazily, so streamed output stays streamed.
+"""
+
+import heapq
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from todo import dates
+from todo.dates import MISSING, timestamp
+from todo.model import PRIORITY_CODES
+
+# Tasks per page when --page is given without --limit
+PAGE_SIZE = 50
+
+
+def _date(field: str) -> Callable[[Dict], Optional[int]]:
+    def key(task: Dict) -> Optional[int]:
+        value = task.get(field)
+        if not value:
+            return None
+        moment = timestamp(value)
+        if moment == MISSING:
+            # Not ISO: fall back to the lenient parser the table uses
+            parsed = dates.parse(value)
+            moment = MISSING if parsed is None else timestamp(parsed.isoformat())
+        return None if moment == MISSING else moment
+
+    return key
+
+
+def _task_number(task: Dict) -> Tuple:
+    task_id = str(task["task_id"])
+    prefix, _, number = task_id.rpartition("-")
+    return (prefix.lower(), int(number)) if number.isdigit() else (task_id.lower(), -1)
+
+
+def _status(task: Dict) -> str:
+    if task.get("completed"):
+        return "completed"
+    return task.get("status") or "pending"
+
+
+# Sort fields: name -> key of a task (None when the task has no value)
+SORT_FIELDS: Dict[str, Callable[[Dict], object]] = {
+    "due": _date("due_date"),
+    "priority": lambda task: PRIORITY_CODES.get(task.get("priority")),
+    "created": _date("created_at"),
+    "id": _task_number,
+    "title": lambda task: (task.get("title") or "").lower() or None,
+    "type": lambda task: task.get("type") or None,
+    "status": _status,
+    "worked": lambda task: sum(int(session.get("duration") or 0) for session in task.get("work_sessions") or ()),
+}
+
+
+class _Descending:
+    """Wraps a key so that it sorts in reverse order"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other) -> bool:
+        return self.value == other.value
+
+
+def parse_sort(spec: str) -> List[Tuple[str, bool]]:
+    """
+    Parse `due,priority,-created` into (field, descending) pairs. Raises
+    ValueError for an unknown field.
+    """
+    fields = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        descending = item.startswith("-")
+        name = item.lstrip("+-")
+        if name not in SORT_FIELDS:
+            raise ValueError(f"unknown sort field '{name}'. Choose from: {', '.join(SORT_FIELDS)}")
+        fields.append((name, descending))
+    return fields
+
+
+def sort_key(fields: List[Tuple[str, bool]]) -> Callable[[Dict], Tuple]:
+    """Key function for a parsed sort; tasks without a value come last in either direction"""
+    getters = [(SORT_FIELDS[name], descending) for name, descending in fields]
+
+    def key(task: Dict) -> Tuple:
+        parts = []
+        for getter, descending in getters:
+            value = getter(task)
+            if value is None:
+                parts.append((1, 0))
+            else:
+                parts.append((0, _Descending(value) if descending else value))
+        return tuple(parts)
+
+    return key
+
+
+def select(
+    tasks: Iterable[Dict],
+    sort: Optional[List[Tuple[str, bool]]] = None,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Iterable[Dict]:
+    """
+    The tasks from `offset` on, at most `limit` of them, ordered by `sort`
+    (ties keep their original order) or in their original order, in which
+    case they are consumed lazily.
+    """
+    end = None if limit is None else offset + limit
+    if not sort:
+        return islice(tasks, offset, end)
+    key = sort_key(sort)
+    # Keys are computed once per task; the position keeps the sort stable
+    decorated = [(key(task), position, task) for position, task in enumerate(tasks)]
+    if end is not None and end < len(decorated):
+        chosen = heapq.nsmallest(end, decorated)
+    else:
+        chosen = sorted(decorated)
+    return [task for _, _, task in chosen[offset:end]]
+
+
+def page_bounds(limit: Optional[int], offset: Optional[int], page: Optional[int]) -> Tuple[Optional[int], int]:
+    """
+    (limit, offset) from the paging options: --page N shows the Nth page of
+    --limit tasks (PAGE_SIZE by default). Raises ValueError if --page and
+    --offset are combined.
+    """
+    if page is None:
+        return limit, offset or 0
+    if offset:
+        raise ValueError("--page and --offset cannot be combined")
+    limit = limit or PAGE_SIZE
+    return limit, (page - 1) * limit
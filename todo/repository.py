@@ -0,0 +1,61 @@
+"""In-memory access to the tasks of a project by task id."""
+
+from typing import Dict, Iterator, List, Optional
+
+
+def task_key(task_id) -> str:
+    """Normalized form of a task id: ids are matched case-insensitively"""
+    return str(task_id).lower()
+
+
+class TaskRepository:
+    """
+    The tasks of a document, indexed by case-folded task id.
+
+    The index is built once when the repository is created and kept up to
+    date by `add()` and `delete()`, so looking a task up is O(1) instead of
+    a scan over every task. Tasks must be added and removed through the
+    repository for the index to stay valid; changing the fields of a task
+    in place is fine, except for its task_id.
+    """
+
+    def __init__(self, todos: Dict):
+        self.todos = todos
+        self._index: Dict[str, Dict] = {}
+        for task in todos["tasks"]:
+            # Like a scan, the first task with a given id wins
+            self._index.setdefault(task_key(task["task_id"]), task)
+
+    @classmethod
+    def from_tasks(cls, tasks: List[Dict]) -> "TaskRepository":
+        return cls({"tasks": tasks})
+
+    @property
+    def tasks(self) -> List[Dict]:
+        return self.todos["tasks"]
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.todos["tasks"])
+
+    def __len__(self) -> int:
+        return len(self.todos["tasks"])
+
+    def __contains__(self, task_id) -> bool:
+        return task_key(task_id) in self._index
+
+    def get(self, task_id) -> Optional[Dict]:
+        """Return the task with this id (case-insensitive), or None"""
+        return self._index.get(task_key(task_id))
+
+    def add(self, task: Dict):
+        """Append a task to the project"""
+        self.todos["tasks"].append(task)
+        self._index.setdefault(task_key(task["task_id"]), task)
+
+    def delete(self, task_id) -> Optional[Dict]:
+        """Remove every task with this id and return the first one, or None"""
+        key = task_key(task_id)
+        task = self._index.pop(key, None)
+        if task is not None:
+            self.todos["tasks"] = [t for t in self.todos["tasks"] if task_key(t["task_id"]) != key]
+        return task
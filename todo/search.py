@@ -0,0 +1,272 @@
+"""Ranked full-text search over tasks (`todo search`).
+
+Tasks are tokenized into an inverted index over their title, tags,
+description and notes, persisted as a sidecar index (see todo.indexes)
+and updated incrementally as tasks change. Results are ranked with BM25F:
+BM25 over a boosted, length-normalized combination of the fields. Each
+posting stores that combined term frequency, saturated and computed
+against the average field lengths of the last full build, so scoring a
+query only touches the postings of its terms.
+
+Query syntax:
+    deploy api        tasks matching every word
+    "release notes"   an exact phrase
+    deplo*            any word starting with a prefix
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from todo import indexes
+from todo.repository import task_key
+
+# Indexed fields and their boosts
+FIELDS = {"title": 3.0, "tags": 2.5, "description": 1.5, "notes": 1.0}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"\w+")
+_CLAUSE = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def tokenize(text) -> List[str]:
+    return _TOKEN.findall(str(text).casefold()) if text else []
+
+
+def field_tokens(task: Dict, field: str) -> List[str]:
+    """Tokens of a field; list items are separated by "" so phrases never span two notes"""
+    value = task.get(field)
+    if field not in ("notes", "tags"):
+        return tokenize(value)
+    tokens: List[str] = []
+    for item in value or []:
+        if tokens:
+            tokens.append("")
+        tokens.extend(tokenize(item))
+    return tokens
+
+
+def _weights(state: Dict, task: Dict) -> Dict[str, float]:
+    """Saturated BM25F weight of every term of a task; the score is the weight times the idf"""
+    weights: Dict[str, float] = {}
+    for field, boost in FIELDS.items():
+        counts = Counter(token for token in field_tokens(task, field) if token)
+        if not counts:
+            continue
+        norm = 1 - B + B * sum(counts.values()) / (state["average_lengths"][field] or 1)
+        for term, tf in counts.items():
+            weights[term] = weights.get(term, 0.0) + boost * tf / norm
+    return {term: weight * (K1 + 1) / (K1 + weight) for term, weight in weights.items()}
+
+
+def _add(state: Dict, task: Dict):
+    key = task_key(task["task_id"])
+    if key in state["keys"]:
+        # Like TaskRepository, the first task with a given id wins
+        return
+    number = state["next_number"]
+    state["next_number"] += 1
+    state["keys"][key] = number
+    weights = _weights(state, task)
+    state["docs"][number] = (task["task_id"], tuple(weights))
+    postings = state["postings"]
+    for term, weight in weights.items():
+        if term not in postings:
+            postings[term] = {}
+            insort(state["vocabulary"], term)
+        postings[term][number] = weight
+
+
+def _remove(state: Dict, key: str):
+    number = state["keys"].pop(key, None)
+    if number is None:
+        return
+    _, terms = state["docs"].pop(number)
+    postings = state["postings"]
+    for term in terms:
+        del postings[term][number]
+        if not postings[term]:
+            del postings[term]
+            vocabulary = state["vocabulary"]
+            del vocabulary[bisect_left(vocabulary, term)]
+
+
+class SearchIndex(indexes.SidecarIndex):
+    name = "search"
+    version = 1
+
+    def build(self, todos: Dict) -> Dict:
+        tasks = todos["tasks"]
+        totals = dict.fromkeys(FIELDS, 0)
+        for task in tasks:
+            for field in FIELDS:
+                totals[field] += sum(1 for token in field_tokens(task, field) if token)
+        state = {
+            "average_lengths": {field: total / (len(tasks) or 1) for field, total in totals.items()},
+            "keys": {},
+            "docs": {},
+            "postings": {},
+            "vocabulary": [],
+            "next_number": 0,
+        }
+        for task in tasks:
+            _add(state, task)
+        return state
+
+    def apply(self, state: Dict, todos: Optional[Dict], changes: List[Dict]):
+        deleted, changed = indexes.changed_tasks(changes, FIELDS)
+        for key in deleted:
+            _remove(state, key)
+        if not changed:
+            return
+        if todos is None:
+            raise ValueError("the search index needs the document to re-index tasks")
+        # Re-index changed tasks as a whole (they now lose score ties to unchanged tasks)
+        for task in todos["tasks"]:
+            key = task_key(task["task_id"])
+            if key in changed:
+                changed.discard(key)
+                _remove(state, key)
+                _add(state, task)
+
+
+INDEX = indexes.register(SearchIndex())
+
+
+def parse_query(query: str) -> List[Tuple[str, object]]:
+    """Split a query into ("term", word), ("prefix", start) and ("phrase", [words]) clauses"""
+    clauses: List[Tuple[str, object]] = []
+    for match in _CLAUSE.finditer(query):
+        phrase, word = match.groups()
+        if phrase is not None:
+            tokens = tokenize(phrase)
+        elif word.endswith("*") and len(tokenize(word)) == 1:
+            clauses.append(("prefix", tokenize(word)[0]))
+            continue
+        else:
+            # "foo-bar" behaves like the phrase "foo bar"
+            tokens = tokenize(word)
+        if len(tokens) == 1:
+            clauses.append(("term", tokens[0]))
+        elif tokens:
+            clauses.append(("phrase", tokens))
+    return clauses
+
+
+def _expand(state: Dict, prefix: str) -> List[str]:
+    vocabulary = state["vocabulary"]
+    terms = []
+    for position in range(bisect_left(vocabulary, prefix), len(vocabulary)):
+        if not vocabulary[position].startswith(prefix):
+            break
+        terms.append(vocabulary[position])
+    return terms
+
+
+def has_phrase(task: Dict, phrase: List[str]) -> bool:
+    size = len(phrase)
+    for field in FIELDS:
+        tokens = field_tokens(task, field)
+        for position, token in enumerate(tokens):
+            if token == phrase[0] and tokens[position:position + size] == phrase:
+                return True
+    return False
+
+
+def search(
+    state: Dict,
+    query: str,
+    limit: Optional[int] = None,
+    get_task: Optional[Callable[[str], Optional[Dict]]] = None,
+) -> List[Tuple[str, float]]:
+    """
+    Return (task id, score) for the tasks matching every clause of the
+    query, best first; ties go to the task indexed first. Phrases are checked against
+    the tasks returned by `get_task`; without it they match their words anywhere.
+    """
+    clauses = parse_query(query)
+    if not clauses:
+        return []
+    postings = state["postings"]
+    count = len(state["docs"])
+    docs = state["docs"]
+    if limit is not None and len(clauses) == 1 and clauses[0][0] == "term":
+        # A single word ranks like its weights: no need to score every posting
+        term = clauses[0][1]
+        if term not in postings:
+            return []
+        term_postings = postings[term]
+        idf = math.log(1 + (count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+        ranked = heapq.nlargest(limit, term_postings.items(), key=itemgetter(1))
+        return [(docs[number][0], idf * weight) for number, weight in ranked]
+    scores: Optional[Dict[int, float]] = None
+    phrases = []
+    # Start with the rarest clause so the candidate set shrinks as fast as possible
+    for kind, value in sorted(clauses, key=lambda clause: _clause_size(state, clause)):
+        if kind == "term":
+            terms = [value] if value in postings else []
+        elif kind == "prefix":
+            terms = _expand(state, value)
+        else:
+            terms = value if all(term in postings for term in value) else []
+            phrases.append(value)
+        if not terms:
+            return []
+        clause_scores: Dict[int, float] = {}
+        for position, term in enumerate(terms):
+            term_postings = postings[term]
+            idf = math.log(1 + (count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+            if kind == "phrase" and position > 0:
+                # Every word of a phrase is required
+                clause_scores = {n: s for n, s in clause_scores.items() if n in term_postings}
+                candidates = clause_scores
+            else:
+                candidates = scores
+            if candidates is None:
+                for number, weight in term_postings.items():
+                    clause_scores[number] = clause_scores.get(number, 0.0) + idf * weight
+            else:
+                for number, weight in term_postings.items():
+                    if number in candidates:
+                        clause_scores[number] = clause_scores.get(number, 0.0) + idf * weight
+        if scores is None:
+            scores = clause_scores
+        else:
+            scores = {number: scores[number] + score for number, score in clause_scores.items()}
+        if not scores:
+            return []
+
+    # Postings are kept in indexing order, which the stable ordering keeps for ties
+    if limit is not None and not phrases:
+        ranked = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+    else:
+        ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)
+    results = []
+    for number, score in ranked:
+        task_id = docs[number][0]
+        if phrases and get_task is not None:
+            task = get_task(task_id)
+            if task is None or not all(has_phrase(task, phrase) for phrase in phrases):
+                continue
+        results.append((task_id, score))
+        if limit is not None and len(results) >= limit:
+            break
+    return results
+
+
+def _clause_size(state: Dict, clause: Tuple[str, object]) -> int:
+    kind, value = clause
+    postings = state["postings"]
+    if kind == "term":
+        return len(postings.get(value, ()))
+    if kind == "phrase":
+        return min(len(postings.get(term, ())) for term in value)
+    # Prefixes can expand to many terms: resolve them last
+    return len(state["docs"]) + 1
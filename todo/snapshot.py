@@ -0,0 +1,303 @@
+"""A static HTML snapshot of the board, written without running a server.
+
+`todo board --export DIR` writes:
+
+- index.html: the board, every card of every column (the browser opens and
+  closes the columns itself);
+- statistics.html: the statistics, with the figures embedded as Plotly
+  JSON and drawn by plotly.js;
+- task/<id>.html: the details of each task.
+
+The pages are built from the board's own layouts (board.create_app(...).
+renderers) and converted from Dash components to HTML here, so they look
+like the board. Exports are incremental: manifest.json records a hash of
+what each page was rendered from, and the next export only renders and
+rewrites the pages whose task changed (the board and statistics when any
+task did), and removes the pages of deleted tasks. Task pages are rendered
+by a pool of worker processes when there are enough of them.
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote
+
+import plotly.io
+import plotly.offline
+from dash.development.base_component import Component
+
+from todo.model import load_tasks
+
+# Bump when the pages change, so the next export rewrites them all
+EXPORT_FORMAT = 1
+MANIFEST = "manifest.json"
+# Below this many task pages to render, a worker pool costs more than it saves
+POOL_THRESHOLD = 200
+
+BOOTSTRAP_CSS = "https://cdn.jsdelivr.net/npm/bootstrap@5.3.6/dist/css/bootstrap.min.css"
+FONTS_CSS = "https://fonts.googleapis.com/css?family=Montserrat:600,700|Segoe+UI:400,700&display=swap"
+
+# Style properties React leaves without a unit
+UNITLESS = {"fontWeight", "zIndex", "opacity", "lineHeight", "flex", "flexGrow", "flexShrink", "order"}
+# Attributes copied as they are from html.* components
+ATTRIBUTES = {"href": "href", "title": "title", "target": "target", "colSpan": "colspan", "rowSpan": "rowspan"}
+
+
+@lru_cache(maxsize=None)
+def kebab(name: str) -> str:
+    """fontWeight -> font-weight"""
+    return re.sub("([A-Z])", r"-\1", name).lower().lstrip("-")
+
+
+def page_file(task_id: str) -> str:
+    return f"task/{quote(str(task_id), safe='')}.html"
+
+
+def is_page_file(name: str) -> bool:
+    """Whether `name` is what page_file() returns for some task id"""
+    return (
+        name.startswith("task/") and name.endswith(".html")
+        and page_file(unquote(name[len("task/"):-len(".html")])) == name
+    )
+
+
+def task_hash(task: Dict) -> str:
+    """What a task page is rendered from"""
+    return hashlib.sha256(json.dumps(task, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class Converter:
+    """
+    Dash components to HTML. Links to the board's routes become links
+    between the exported files, relative to the page at `depth`.
+    """
+
+    def __init__(self, depth: int = 0):
+        self.prefix = "../" * depth
+        self.figures: List[str] = []
+
+    def href(self, target: str) -> str:
+        if target == "/":
+            return self.prefix + "index.html"
+        if target == "/statistics":
+            return self.prefix + "statistics.html"
+        match = re.match(r"/task/(.+)", target)
+        if match:
+            return self.prefix + page_file(match.group(1))
+        return target
+
+    def style(self, style: Optional[Dict]) -> str:
+        rules = []
+        for name, value in (style or {}).items():
+            if isinstance(value, (int, float)) and value and name not in UNITLESS:
+                value = f"{value}px"
+            rules.append(f"{kebab(name)}: {value}")
+        return "; ".join(rules)
+
+    def element(self, tag: str, props: Dict, classes: List[Optional[str]], attributes: Optional[Dict] = None) -> str:
+        attributes = dict(attributes or {})
+        if isinstance(props.get("id"), str):
+            attributes["id"] = props["id"]
+        classes = " ".join(c for c in [*classes, props.get("className"), props.get("class_name")] if c)
+        if classes:
+            attributes["class"] = classes
+        style = self.style(props.get("style"))
+        if style:
+            attributes["style"] = style
+        text = "".join(
+            f' {name}' if value is True else f' {name}="{html.escape(str(value))}"'
+            for name, value in attributes.items() if value is not None and value is not False
+        )
+        return f"<{tag}{text}>{self.convert(props.get('children'))}</{tag}>"
+
+    def graph(self, props: Dict) -> str:
+        number = len(self.figures)
+        # "</" would end the script element early
+        self.figures.append(plotly.io.to_json(props.get("figure") or {}).replace("</", "<\\/"))
+        return self.element("div", {**props, "children": None}, ["static-graph"], {"data-figure": number})
+
+    def convert(self, node) -> str:
+        if node is None:
+            return ""
+        if isinstance(node, (list, tuple)):
+            return "".join(self.convert(child) for child in node)
+        if not isinstance(node, Component):
+            return html.escape(str(node))
+        # The props that were set (to_plotly_json() builds the same, much slower)
+        props = vars(node)
+        kind, namespace = node._type, node._namespace
+        if namespace == "dash_html_components":
+            attributes = {ATTRIBUTES[name]: value for name, value in props.items() if name in ATTRIBUTES}
+            if kind == "Details":
+                attributes["open"] = bool(props.get("open"))
+            if "href" in attributes:
+                attributes["href"] = self.href(attributes["href"])
+            return self.element(kind.lower(), props, [], attributes)
+        if namespace == "dash_core_components":
+            if kind == "Link":
+                return self.element("a", props, [], {"href": self.href(props.get("href", "/"))})
+            if kind == "Graph":
+                return self.graph(props)
+            # Inputs need callbacks to do anything
+            return ""
+        if namespace == "dash_bootstrap_components":
+            return self.bootstrap(kind, props)
+        return self.element("div", props, [])
+
+    def bootstrap(self, kind: str, props: Dict) -> str:
+        color = props.get("color")
+        if kind == "Container":
+            return self.element("div", props, ["container-fluid" if props.get("fluid") else "container"])
+        if kind == "Row":
+            return self.element("div", props, ["row"])
+        if kind == "Col":
+            width = props.get("width")
+            return self.element("div", props, [f"col-{width}" if isinstance(width, int) else "col"])
+        if kind in ("Card", "CardHeader", "CardBody"):
+            return self.element("div", props, [kebab(kind)])
+        if kind == "Badge":
+            return self.element("span", props, ["badge", f"text-bg-{color or 'primary'}", "rounded-pill" if props.get("pill") else None])
+        if kind == "Alert":
+            return self.element("div", props, ["alert", f"alert-{color or 'primary'}"])
+        if kind == "Nav":
+            return self.element("nav", props, ["nav", "flex-column" if props.get("vertical") else None, "nav-pills" if props.get("pills") else None])
+        if kind == "NavLink":
+            return self.element("a", props, ["nav-link"], {"href": self.href(props.get("href", "/"))})
+        if kind == "Button":
+            return self.element("button", props, ["btn", f"btn-{'outline-' if props.get('outline') else ''}{color or 'primary'}"], {"type": "button"})
+        return self.element("div", props, [])
+
+
+def document(renderers: Dict, content, depth: int = 0, title: str = "Flowistic Task Board") -> str:
+    """A whole page: the sidebar, then `content`"""
+    converter = Converter(depth)
+    body = converter.convert(renderers["sidebar"]) + converter.element(
+        "div", {"children": content, "style": {"marginLeft": "240px", "padding": "2rem 2rem 2rem 2rem"}}, []
+    )
+    scripts = ""
+    if converter.figures:
+        figures = ",".join(converter.figures)
+        scripts = (
+            f'<script src="https://cdn.plot.ly/plotly-{plotly.offline.get_plotlyjs_version()}.min.js"></script>\n'
+            f'<script type="application/json" id="figures">[{figures}]</script>\n'
+            "<script>\n"
+            'const figures = JSON.parse(document.getElementById("figures").textContent);\n'
+            'document.querySelectorAll(".static-graph").forEach(function (div) {\n'
+            "  const figure = figures[div.dataset.figure];\n"
+            "  Plotly.newPlot(div, figure.data, figure.layout, {responsive: true});\n"
+            "});\n"
+            "</script>\n"
+        )
+    return (
+        "<!DOCTYPE html>\n"
+        '<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{html.escape(title)}</title>\n"
+        f'<link rel="stylesheet" href="{BOOTSTRAP_CSS}">\n<link rel="stylesheet" href="{FONTS_CSS}">\n'
+        f"</head>\n<body>\n{body}\n{scripts}</body>\n</html>\n"
+    )
+
+
+# The renderers of a worker process (see _start_worker)
+_renderers = None
+
+
+def _renderers_for(tasks: List[Dict]) -> Dict:
+    from todo import board
+
+    return board.create_app(tasks).renderers
+
+
+def _start_worker(tasks: List[Dict]):
+    global _renderers
+    _renderers = _renderers_for(tasks)
+
+
+def _render_task(task: Dict) -> str:
+    (model,) = load_tasks([task])
+    return document(_renderers, _renderers["task"](model), depth=1, title=f"{model.task_id}: {model.title}")
+
+
+def export_board(tasks: List[Dict], out_dir: Path, workers: Optional[int] = None) -> Dict[str, int]:
+    """
+    Write the snapshot of `tasks` to `out_dir`, rewriting only the pages
+    whose source changed since the last export there. Returns the number of
+    pages written, unchanged and removed.
+    """
+    global _renderers
+    out_dir = Path(out_dir)
+    (out_dir / "task").mkdir(parents=True, exist_ok=True)
+    manifest_file = out_dir / MANIFEST
+    try:
+        manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    previous = manifest.get("pages", {}) if manifest.get("format") == EXPORT_FORMAT else {}
+
+    pages: Dict[str, str] = {}
+    stale_tasks: List[Dict] = []
+    for task in tasks:
+        name = page_file(task["task_id"])
+        if name in pages:
+            # Like the board, the first task with an id wins
+            continue
+        pages[name] = task_hash(task)
+        if previous.get(name) != pages[name] or not (out_dir / name).exists():
+            stale_tasks.append(task)
+    # The board and statistics show every task; the board also what is overdue today
+    summary = hashlib.sha256("".join(pages.values()).encode()).hexdigest()
+    pages["index.html"] = hashlib.sha256(f"{summary}{date.today()}".encode()).hexdigest()
+    pages["statistics.html"] = summary
+
+    def write(name: str, text: str):
+        # Through a temporary file, so an interrupted export never leaves a truncated page
+        path = out_dir / name
+        temporary = path.with_name(path.name + ".tmp")
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+    renderers = _renderers_for(tasks)
+    models = load_tasks(tasks)
+    written = len(stale_tasks)
+    for name, render in [
+        ("index.html", lambda: renderers["board"](models)),
+        ("statistics.html", lambda: renderers["statistics"](models)),
+    ]:
+        if previous.get(name) != pages[name] or not (out_dir / name).exists():
+            written += 1
+            write(name, document(renderers, render()))
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(stale_tasks) >= POOL_THRESHOLD:
+        with ProcessPoolExecutor(workers, initializer=_start_worker, initargs=(tasks,)) as pool:
+            chunk = max(1, len(stale_tasks) // (workers * 4))
+            for task, text in zip(stale_tasks, pool.map(_render_task, stale_tasks, chunksize=chunk)):
+                write(page_file(task["task_id"]), text)
+    else:
+        _renderers = renderers
+        for task in stale_tasks:
+            write(page_file(task["task_id"]), _render_task(task))
+
+    # Only the pages of deleted tasks: the manifest is read from disk and could name any file
+    root = out_dir.resolve()
+    removed = [
+        name for name in previous
+        if name not in pages and is_page_file(name) and (out_dir / name).resolve().parent == root / "task"
+    ]
+    for name in removed:
+        try:
+            os.remove(out_dir / name)
+        except FileNotFoundError:
+            pass
+    # Written last: an interrupted export is redone from the previous manifest
+    temporary = manifest_file.with_suffix(".tmp")
+    temporary.write_text(json.dumps({"format": EXPORT_FORMAT, "pages": pages}, indent=1, sort_keys=True), encoding="utf-8")
+    os.replace(temporary, manifest_file)
+    return {"written": written, "unchanged": len(pages) - written, "removed": len(removed)}
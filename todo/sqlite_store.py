@@ -0,0 +1,436 @@
+"""SQLite storage backend for large projects.
+
+A project created with `todo init --backend sqlite` (or converted with
+`todo migrate --to sqlite`) keeps its tasks in `todo.db` instead of
+`todo.yaml`. The document returned by `load()` has exactly the same shape
+as the YAML one, so every command keeps working unchanged, while the hot
+paths (`list`, `tag_tasks`, `status`, `complete`) query the database
+directly instead of loading the whole project.
+"""
+
+import json
+import sqlite3
+from collections import defaultdict
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from todo import storage
+from todo.model import PRIORITY_CODES
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    task_id TEXT NOT NULL,
+    task_key TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    type TEXT,
+    priority TEXT,
+    created_at TEXT,
+    due_date TEXT,
+    completed INTEGER,
+    status TEXT,
+    repeat TEXT,
+    extra TEXT,
+    layout TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    task INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT
+);
+CREATE TABLE IF NOT EXISTS notes (
+    task INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    text TEXT
+);
+CREATE TABLE IF NOT EXISTS work_sessions (
+    task INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    started_at TEXT,
+    duration INTEGER,
+    interrupted INTEGER,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS status_history (
+    task INTEGER NOT NULL REFERENCES tasks(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    status TEXT,
+    timestamp TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_key ON tasks(task_key);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+CREATE INDEX IF NOT EXISTS idx_tags_tag ON tags(tag);
+CREATE INDEX IF NOT EXISTS idx_tags_task ON tags(task);
+CREATE INDEX IF NOT EXISTS idx_notes_task ON notes(task);
+CREATE INDEX IF NOT EXISTS idx_work_sessions_task ON work_sessions(task);
+CREATE INDEX IF NOT EXISTS idx_status_history_task ON status_history(task);
+"""
+
+# Task fields stored as columns of the tasks table
+COLUMNS = [
+    "task_id", "title", "description", "type", "priority",
+    "created_at", "due_date", "completed", "status", "repeat",
+]
+# List fields stored as rows of their own table
+LIST_FIELDS = ["tags", "notes", "work_sessions", "status_history"]
+
+# Tasks that still count towards the project statistics (see calculate_project_stats)
+COUNTED = "(coalesce({t}completed, 0) OR coalesce({t}status, '') != 'cancelled')"
+OPEN = "(NOT coalesce(completed, 0) AND coalesce(status, '') != 'cancelled')"
+
+
+def database_file(todo_file: Path) -> Path:
+    """Path of the SQLite database belonging to a todo file"""
+    return storage.database_file(todo_file)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    """Open the project database, creating the schema if needed"""
+    conn = sqlite3.connect(str(path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _json(value) -> Optional[str]:
+    return json.dumps(value, default=str) if value else None
+
+
+def _text(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _insert_children(conn: sqlite3.Connection, row_id: int, field: str, values: Iterable, start: int = 0):
+    values = list(values or [])
+    if field == "tags":
+        conn.executemany(
+            "INSERT INTO tags (task, position, tag) VALUES (?, ?, ?)",
+            [(row_id, start + i, tag) for i, tag in enumerate(values)],
+        )
+    elif field == "notes":
+        conn.executemany(
+            "INSERT INTO notes (task, position, text) VALUES (?, ?, ?)",
+            [(row_id, start + i, note) for i, note in enumerate(values)],
+        )
+    elif field == "work_sessions":
+        conn.executemany(
+            "INSERT INTO work_sessions (task, position, started_at, duration, interrupted, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    row_id, start + i, _text(s.get("started_at")), s.get("duration"), s.get("interrupted"),
+                    _json({k: v for k, v in s.items() if k not in ("started_at", "duration", "interrupted")}),
+                )
+                for i, s in enumerate(values)
+            ],
+        )
+    elif field == "status_history":
+        conn.executemany(
+            "INSERT INTO status_history (task, position, status, timestamp, extra) VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    row_id, start + i, h.get("status"), _text(h.get("timestamp")),
+                    _json({k: v for k, v in h.items() if k not in ("status", "timestamp")}),
+                )
+                for i, h in enumerate(values)
+            ],
+        )
+
+
+def _insert_task(conn: sqlite3.Connection, task: Dict):
+    extra = {k: v for k, v in task.items() if k not in COLUMNS and k not in LIST_FIELDS}
+    cur = conn.execute(
+        f"INSERT INTO tasks (task_key, {', '.join(COLUMNS)}, extra, layout) "
+        f"VALUES ({', '.join('?' * (len(COLUMNS) + 3))})",
+        [str(task["task_id"]).lower()] + [_text(task.get(c)) for c in COLUMNS] + [_json(extra), json.dumps(list(task))],
+    )
+    for field in LIST_FIELDS:
+        if task.get(field):
+            _insert_children(conn, cur.lastrowid, field, task[field])
+
+
+def _children(conn: sqlite3.Connection, where: str, params: List) -> Dict[str, Dict[int, List]]:
+    """Fetch the list fields of every task matching `where`, in order"""
+    subquery = f"SELECT id FROM tasks WHERE {where}"
+    children = {field: defaultdict(list) for field in LIST_FIELDS}
+    for row in conn.execute(f"SELECT task, tag FROM tags WHERE task IN ({subquery}) ORDER BY task, position", params):
+        children["tags"][row[0]].append(row[1])
+    for row in conn.execute(f"SELECT task, text FROM notes WHERE task IN ({subquery}) ORDER BY task, position", params):
+        children["notes"][row[0]].append(row[1])
+    for row in conn.execute(
+        f"SELECT task, started_at, duration, interrupted, extra FROM work_sessions "
+        f"WHERE task IN ({subquery}) ORDER BY task, position",
+        params,
+    ):
+        session = {"started_at": row[1], "duration": row[2], "interrupted": bool(row[3])}
+        session.update(json.loads(row[4]) if row[4] else {})
+        children["work_sessions"][row[0]].append(session)
+    for row in conn.execute(
+        f"SELECT task, status, timestamp, extra FROM status_history "
+        f"WHERE task IN ({subquery}) ORDER BY task, position",
+        params,
+    ):
+        entry = {"status": row[1], "timestamp": row[2]}
+        entry.update(json.loads(row[3]) if row[3] else {})
+        children["status_history"][row[0]].append(entry)
+    return children
+
+
+def select_tasks(conn: sqlite3.Connection, where: str = "1", params: Optional[List] = None) -> List[Dict]:
+    """Return the tasks matching a SQL condition on the tasks table, in project order"""
+    params = params or []
+    children = _children(conn, where, params)
+    tasks = []
+    for row in conn.execute(f"SELECT * FROM tasks WHERE {where} ORDER BY id", params):
+        values = json.loads(row["extra"]) if row["extra"] else {}
+        for column in COLUMNS:
+            values[column] = row[column]
+        if values["completed"] is not None:
+            values["completed"] = bool(values["completed"])
+        for field in LIST_FIELDS:
+            values[field] = children[field].get(row["id"], [])
+        tasks.append({key: values.get(key) for key in json.loads(row["layout"])})
+    return tasks
+
+
+def _get_meta(conn: sqlite3.Connection, key: str, default=None):
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value):
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value, default=str)))
+
+
+def load_project(path: Path) -> Dict:
+    """Load only the project settings"""
+    with closing(connect(path)) as conn:
+        return _get_meta(conn, "project", {})
+
+
+def load(path: Path) -> Dict:
+    """Load the whole document"""
+    with closing(connect(path)) as conn:
+        document = {"project": _get_meta(conn, "project", {}), "tasks": select_tasks(conn)}
+        document.update(_get_meta(conn, "document", {}))
+        return document
+
+
+def save(path: Path, todos: Dict, changes: Optional[List[Dict]] = None):
+    """
+    Save the document. With `changes` (journal records, see todo.journal)
+    only the affected rows are touched; otherwise every table is rewritten.
+    """
+    with closing(connect(path)) as conn, conn:
+        if changes is None:
+            for table in ["tags", "notes", "work_sessions", "status_history", "tasks"]:
+                conn.execute(f"DELETE FROM {table}")
+            for task in todos["tasks"]:
+                _insert_task(conn, task)
+            _set_meta(conn, "schema_version", SCHEMA_VERSION)
+            _set_meta(conn, "project", todos["project"])
+            _set_meta(conn, "document", {k: v for k, v in todos.items() if k not in ("project", "tasks")})
+            return
+        for record in changes:
+            _apply(conn, record)
+
+
+def _apply(conn: sqlite3.Connection, record: Dict):
+    op = record["op"]
+    if op == "add":
+        _insert_task(conn, record["task"])
+    elif op == "delete":
+        conn.execute("DELETE FROM tasks WHERE task_key = ?", (record["task_id"].lower(),))
+    elif op == "project":
+        project = _get_meta(conn, "project", {})
+        project.update(record["values"])
+        _set_meta(conn, "project", project)
+    elif op == "document":
+        document = _get_meta(conn, "document", {})
+        document.update(record["values"])
+        _set_meta(conn, "document", document)
+    elif op in ("set", "append"):
+        row = conn.execute(
+            "SELECT id, extra, layout FROM tasks WHERE task_key = ? ORDER BY id LIMIT 1",
+            (record["task_id"].lower(),),
+        ).fetchone()
+        if row is None:
+            return
+        layout = json.loads(row["layout"])
+        extra = json.loads(row["extra"]) if row["extra"] else {}
+        values = record["values"] if op == "set" else {record["field"]: record["values"]}
+        for field, value in values.items():
+            if field not in layout:
+                layout.append(field)
+            if field in LIST_FIELDS:
+                table = field
+                if op == "set":
+                    conn.execute(f"DELETE FROM {table} WHERE task = ?", (row["id"],))
+                    start = 0
+                else:
+                    start = conn.execute(
+                        f"SELECT coalesce(max(position) + 1, 0) FROM {table} WHERE task = ?", (row["id"],)
+                    ).fetchone()[0]
+                _insert_children(conn, row["id"], field, value, start)
+            elif field in COLUMNS:
+                conn.execute(f"UPDATE tasks SET {field} = ? WHERE id = ?", (_text(value), row["id"]))
+            elif op == "set":
+                extra[field] = value
+            else:
+                extra.setdefault(field, []).extend(value)
+        conn.execute(
+            "UPDATE tasks SET extra = ?, layout = ? WHERE id = ?",
+            (_json(extra), json.dumps(layout), row["id"]),
+        )
+
+
+def query_tasks(
+    path: Path,
+    include_closed: bool = True,
+    tag: Optional[str] = None,
+    where: Optional[str] = None,
+    where_params: Iterable = (),
+) -> List[Dict]:
+    """
+    Tasks filtered by completion state, tag and/or a SQL condition on the
+    tasks table (see todo.filters), using the status, tag and due date indexes
+    """
+    conditions, params = [], []
+    if not include_closed:
+        conditions.append(OPEN)
+    if tag is not None:
+        conditions.append("id IN (SELECT task FROM tags WHERE tag = ?)")
+        params.append(tag)
+    if where is not None:
+        conditions.append(where)
+        params.extend(where_params)
+    with closing(connect(path)) as conn:
+        return select_tasks(conn, " AND ".join(conditions) or "1", params)
+
+
+def iter_tasks(
+    path: Path,
+    include_closed: bool = True,
+    batch: int = 1000,
+    where: Optional[str] = None,
+    where_params: Iterable = (),
+) -> Iterator[Dict]:
+    """Like query_tasks, but reading `batch` tasks at a time so that memory stays constant"""
+    condition = "1" if include_closed else OPEN
+    if where is not None:
+        condition = f"{condition} AND {where}"
+    last = 0
+    with closing(connect(path)) as conn:
+        while True:
+            # Keyset pagination: each batch starts after the last row id seen
+            rows = conn.execute(
+                f"SELECT id FROM tasks WHERE {condition} AND id > ? ORDER BY id LIMIT ?",
+                [*where_params, last, batch],
+            ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield from select_tasks(conn, f"id IN ({', '.join(str(row[0]) for row in rows)})")
+
+
+def get_tasks(path: Path, task_ids: List[str]) -> List[Dict]:
+    """Tasks with these ids (case-insensitive) in the given order; unknown ids are skipped"""
+    keys = [str(task_id).lower() for task_id in task_ids]
+    found: Dict[str, Dict] = {}
+    with closing(connect(path)) as conn:
+        # Stay below SQLite's limit on the number of query parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            for task in select_tasks(conn, f"task_key IN ({', '.join('?' * len(chunk))})", chunk):
+                found.setdefault(str(task["task_id"]).lower(), task)
+    return [found[key] for key in keys if key in found]
+
+
+def complete_task(path: Path, task_id: str) -> bool:
+    """Mark the first task with this id as completed; False if there is none"""
+    with closing(connect(path)) as conn, conn:
+        row = conn.execute(
+            "SELECT id, layout FROM tasks WHERE task_key = ? ORDER BY id LIMIT 1", (task_id.lower(),)
+        ).fetchone()
+        if row is None:
+            return False
+        layout = json.loads(row["layout"])
+        if "completed" not in layout:
+            layout.append("completed")
+        conn.execute("UPDATE tasks SET completed = 1, layout = ? WHERE id = ?", (json.dumps(layout), row["id"]))
+        return True
+
+
+def project_stats(path: Path) -> Dict:
+    """Same statistics as cli.calculate_project_stats, aggregated in SQL"""
+    now = datetime.now()
+    counted = COUNTED.format(t="")
+    with closing(connect(path)) as conn:
+        row = conn.execute(
+            f"""
+            SELECT
+                count(*),
+                coalesce(sum(completed = 1), 0),
+                coalesce(sum({OPEN}), 0),
+                coalesce(sum({counted} AND coalesce(due_date, '') != '' AND substr(due_date, 1, 10) = :today), 0),
+                coalesce(sum({counted} AND coalesce(due_date, '') != '' AND substr(due_date, 1, 10) != :today
+                             AND due_date < :now), 0),
+                coalesce(sum({counted} AND coalesce(due_date, '') = ''), 0)
+            FROM tasks
+            """,
+            {"today": now.date().isoformat(), "now": now.isoformat()},
+        ).fetchone()
+        stats = {
+            "total_tasks": row[0],
+            "completed_tasks": row[1],
+            "pending_tasks": row[2],
+            # In the order of columns.summary, which the YAML backend prints
+            "high_priority": 0,
+            "medium_priority": 0,
+            "low_priority": 0,
+            "no_due_date": row[5],
+            "total_work_time": 0,
+            "completed_work_time": 0,
+            "pending_work_time": 0,
+            "interrupted_sessions": 0,
+            "total_sessions": 0,
+            "overdue_tasks": row[4],
+            "due_today": row[3],
+        }
+        for priority, count in conn.execute(
+            f"SELECT priority, count(*) FROM tasks WHERE {counted} GROUP BY priority"
+        ):
+            # Unknown priorities are not counted, as in columns.summary
+            if priority in PRIORITY_CODES:
+                stats[f"{priority}_priority"] = count
+        row = conn.execute(
+            f"""
+            SELECT
+                coalesce(sum(s.duration), 0),
+                coalesce(sum(CASE WHEN t.completed THEN s.duration ELSE 0 END), 0),
+                coalesce(sum(CASE WHEN t.completed THEN 0 ELSE s.duration END), 0),
+                coalesce(sum(s.interrupted = 1), 0),
+                count(s.task)
+            FROM work_sessions s JOIN tasks t ON t.id = s.task
+            WHERE {COUNTED.format(t='t.')}
+            """
+        ).fetchone()
+        stats["total_work_time"] = row[0]
+        stats["completed_work_time"] = row[1]
+        stats["pending_work_time"] = row[2]
+        stats["interrupted_sessions"] = row[3]
+        stats["total_sessions"] = row[4]
+        return stats
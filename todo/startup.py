@@ -0,0 +1,38 @@
+"""Import-time profiling for the CLI entry point."""
+
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Packages that must never be imported just to start the CLI. They are only
+# needed by `todo board`, `todo checklist export`, `todo status` and
+# natural-language dates.
+HEAVY_MODULES = ["dash", "dash_bootstrap_components", "plotly", "pandas", "numpy", "dateparser"]
+
+
+def measure_import_times(module: str = "todo.cli") -> List[Tuple[str, int, int]]:
+    """
+    Import `module` in a fresh interpreter with `-X importtime` and return
+    (module name, self time in µs, cumulative time in µs) for every import.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    return timings
+
+
+def summarize_by_package(timings: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Sum the self time of each import per top-level package (in µs)."""
+    totals: Dict[str, int] = {}
+    for name, self_us, _ in timings:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
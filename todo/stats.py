@@ -0,0 +1,143 @@
+"""Vectorized project statistics (`todo status`).
+
+The statistics are computed with NumPy from the project columns (see
+todo.columns): counters are sums of boolean masks and breakdowns are
+`bincount`s over category codes, so no Python code runs per task.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from todo.model import PRIORITIES
+
+# Number of most recent weeks shown in the per-week breakdown
+WEEKS = 12
+
+
+def _column(state: Dict, name: str, dtype) -> np.ndarray:
+    # A copy, so that the array can keep growing while the result is in use
+    return np.frombuffer(state[name], dtype=dtype).copy()
+
+
+def arrays(state: Dict) -> Dict[str, np.ndarray]:
+    """NumPy arrays of the live tasks and of their sessions and tags"""
+    alive = _column(state, "alive", np.int8).astype(bool)
+    rows = np.cumsum(alive) - 1  # row -> index among live tasks
+    completed = _column(state, "completed", np.int8).astype(bool)
+    session_row = _column(state, "session_row", np.int64)
+    tag_row = _column(state, "tag_row", np.int64)
+    live_sessions = alive[session_row]
+    live_tags = _column(state, "tag_alive", np.int8).astype(bool)
+    live_tags &= alive[tag_row]
+    return {
+        "completed": completed[alive],
+        "cancelled": (_column(state, "cancelled", np.int8).astype(bool) & ~completed)[alive],
+        "priority": _column(state, "priority", np.int8)[alive],
+        "type": _column(state, "type", np.int64)[alive],
+        "due": _column(state, "due", np.int64).view("datetime64[us]")[alive],
+        "session_task": rows[session_row[live_sessions]],
+        "duration": _column(state, "duration", np.int64)[live_sessions],
+        "interrupted": _column(state, "interrupted", np.int8).astype(bool)[live_sessions],
+        "started": _column(state, "started", np.int64).view("datetime64[us]")[live_sessions],
+        "tag_task": rows[tag_row[live_tags]],
+        "tag": _column(state, "tag", np.int64)[live_tags],
+    }
+
+
+def summarize(state: Dict, now: Optional[datetime] = None) -> Dict:
+    """The statistics of cli.calculate_project_stats"""
+    now = now or datetime.now()
+    columns = arrays(state)
+    counted = ~columns["cancelled"]
+    completed = columns["completed"]
+    due = columns["due"]
+    has_due = ~np.isnat(due)
+    due_today = has_due & (due.astype("datetime64[D]") == np.datetime64(now.date(), "D"))
+    overdue = has_due & ~due_today & (due < np.datetime64(now, "us"))
+    priority = columns["priority"]
+    priorities = np.bincount(priority[counted & (priority >= 0)], minlength=len(PRIORITIES))
+
+    session_task = columns["session_task"]
+    duration = columns["duration"]
+    session_counted = counted[session_task]
+    session_completed = session_counted & completed[session_task]
+    total_work_time = int(duration[session_counted].sum())
+    completed_work_time = int(duration[session_completed].sum())
+
+    stats = {
+        "total_tasks": len(completed),
+        "completed_tasks": int(completed.sum()),
+        "pending_tasks": int((counted & ~completed).sum()),
+        "overdue_tasks": int((counted & overdue).sum()),
+        "due_today": int((counted & due_today).sum()),
+        "no_due_date": int((counted & ~has_due).sum()),
+        "total_work_time": total_work_time,
+        "completed_work_time": completed_work_time,
+        "pending_work_time": total_work_time - completed_work_time,
+        "interrupted_sessions": int((session_counted & columns["interrupted"]).sum()),
+        "total_sessions": int(session_counted.sum()),
+    }
+    for code, name in enumerate(PRIORITIES):
+        stats[f"{name}_priority"] = int(priorities[code])
+    return stats
+
+
+def _group(columns: Dict, codes: np.ndarray, tasks: np.ndarray, names: List) -> List[Dict]:
+    """Per-category task counts and time worked; `tasks` maps entries to tasks"""
+    size = len(names)
+    worked_per_task = np.bincount(
+        columns["session_task"], weights=columns["duration"], minlength=len(columns["completed"])
+    )
+    total = np.bincount(codes, minlength=size)
+    done = np.bincount(codes[columns["completed"][tasks]], minlength=size)
+    dropped = np.bincount(codes[columns["cancelled"][tasks]], minlength=size)
+    worked = np.bincount(codes, weights=worked_per_task[tasks], minlength=size)
+    rows = [
+        {
+            "name": names[code],
+            "tasks": int(total[code]),
+            "open": int(total[code] - done[code] - dropped[code]),
+            "completed": int(done[code]),
+            "cancelled": int(dropped[code]),
+            "work_time": int(worked[code]),
+        }
+        for code in range(size)
+        if total[code]
+    ]
+    return sorted(rows, key=lambda row: (-row["tasks"], str(row["name"])))
+
+
+def by_type(state: Dict) -> List[Dict]:
+    """Task counts and time worked per task type, most common first"""
+    columns = arrays(state)
+    return _group(columns, columns["type"], np.arange(len(columns["completed"])), list(state["types"]))
+
+
+def by_tag(state: Dict) -> List[Dict]:
+    """Task counts and time worked per tag, most common first"""
+    columns = arrays(state)
+    return _group(columns, columns["tag"], columns["tag_task"], list(state["tags"]))
+
+
+def by_week(state: Dict, weeks: int = WEEKS) -> List[Dict]:
+    """Work sessions and time worked per week (starting on Monday) of the latest `weeks` weeks with work"""
+    columns = arrays(state)
+    started = columns["started"]
+    valid = ~np.isnat(started)
+    days = started[valid].astype("datetime64[D]").astype(np.int64)
+    # Day 0 (1970-01-01) is a Thursday: shift by 3 days so that weeks start on Monday
+    mondays, codes = np.unique((days + 3) // 7 * 7 - 3, return_inverse=True)
+    sessions = np.bincount(codes, minlength=len(mondays))
+    interrupted = np.bincount(codes[columns["interrupted"][valid]], minlength=len(mondays))
+    worked = np.bincount(codes, weights=columns["duration"][valid], minlength=len(mondays))
+    return [
+        {
+            "week": np.datetime64(int(monday), "D").item(),
+            "sessions": int(sessions[code]),
+            "interrupted": int(interrupted[code]),
+            "work_time": int(worked[code]),
+        }
+        for code, monday in enumerate(mondays)
+    ][-weeks:]
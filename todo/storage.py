@@ -0,0 +1,447 @@
+"""Reading and writing the project file.
+
+`todo.yaml` is the source of truth, unless the project uses the SQLite
+backend (see todo.sqlite_store), in which case `todo.db` is. Next to it, a `.todo/` directory
+holds derived data that can be thrown away at any time, starting with a
+binary snapshot of the parsed document so that commands don't have to run
+the YAML parser on every invocation.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from todo import journal
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Bump whenever the layout of anything written to the sidecar directory changes.
+CACHE_VERSION = 1
+
+# Prefer the libyaml bindings when PyYAML was built with them; they are an
+# order of magnitude faster than the pure-Python loader and emitter.
+PURE_LOADER = yaml.SafeLoader
+PURE_DUMPER = yaml.SafeDumper
+LOADER = getattr(yaml, "CSafeLoader", PURE_LOADER)
+DUMPER = getattr(yaml, "CSafeDumper", PURE_DUMPER)
+
+# Number of list items emitted per libyaml call when serializing long lists
+CHUNK_SIZE = 256
+
+_PLAIN_KEY = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Seconds to wait for another todo process to release the project lock
+DEFAULT_LOCK_TIMEOUT = float(os.environ.get("TODO_LOCK_TIMEOUT", "10"))
+
+
+class LockTimeout(Exception):
+    """Raised when the project lock could not be acquired in time"""
+
+
+def empty_document() -> Dict:
+    """Return the document used when there is no todo file yet"""
+    return {
+        "project": {
+            "name": "",
+            "description": "",
+            "prefix": "",
+            "next_task_number": 1,
+        },
+        "tasks": [],
+    }
+
+
+BACKENDS = ["yaml", "sqlite"]
+
+
+def database_file(todo_file: Path) -> Path:
+    """Path of the SQLite database belonging to a todo file (see todo.sqlite_store)"""
+    return todo_file.with_suffix(".db")
+
+
+def backend(todo_file: Path) -> str:
+    """Storage backend used by the project: sqlite when todo.db exists, else yaml"""
+    return "sqlite" if database_file(todo_file).exists() else "yaml"
+
+
+def active_file(todo_file: Path) -> Path:
+    """File actually holding the project data"""
+    return database_file(todo_file) if backend(todo_file) == "sqlite" else todo_file
+
+
+def project_exists(todo_file: Path) -> bool:
+    """Whether a project was initialized, whatever its backend"""
+    return todo_file.exists() or database_file(todo_file).exists()
+
+
+def sidecar_dir(todo_file: Path) -> Path:
+    """Directory holding caches and indexes derived from the todo file"""
+    return todo_file.parent / ".todo"
+
+
+def cache_file(todo_file: Path) -> Path:
+    """Path of the binary snapshot of the parsed todo file"""
+    return sidecar_dir(todo_file) / "snapshot.pickle"
+
+
+def ensure_sidecar_dir(todo_file: Path) -> Path:
+    """Create the sidecar directory, keeping it out of git on its own"""
+    directory = sidecar_dir(todo_file)
+    if not directory.is_dir():
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / ".gitignore").write_text("# Created by todo, safe to delete\n*\n")
+    return directory
+
+
+def parse(data, loader=None) -> Optional[Dict]:
+    """Parse YAML text or bytes into a document"""
+    return yaml.load(data, Loader=loader or LOADER)
+
+
+def _dump(value, dumper) -> str:
+    text = yaml.dump(value, Dumper=dumper, sort_keys=False)
+    if dumper is not PURE_DUMPER and "\\" in text:
+        # libyaml folds long double-quoted scalars (strings with escaped
+        # characters such as tabs or non-ASCII text) differently from the
+        # pure-Python emitter. Re-emit those parts to keep the file layout
+        # byte-for-byte identical whichever emitter is available.
+        text = yaml.dump(value, Dumper=PURE_DUMPER, sort_keys=False)
+    return text
+
+
+def serialize(document: Dict, dumper=None) -> str:
+    """Serialize a document to YAML text, in the layout of `yaml.dump(sort_keys=False)`"""
+    dumper = dumper or DUMPER
+    if dumper is PURE_DUMPER or not isinstance(document, dict):
+        return yaml.dump(document, Dumper=dumper, sort_keys=False)
+    parts = []
+    for key, value in document.items():
+        if isinstance(key, str) and _PLAIN_KEY.match(key) and isinstance(value, list) and value:
+            # Block sequences under a mapping key are not indented, so a long
+            # list can be emitted chunk by chunk; this confines the fallback
+            # to the pure-Python emitter to the chunks that actually need it.
+            parts.append(f"{key}:\n")
+            for start in range(0, len(value), CHUNK_SIZE):
+                parts.append(_dump(value[start:start + CHUNK_SIZE], dumper))
+        else:
+            parts.append(_dump({key: value}, dumper))
+    return "".join(parts)
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _fingerprint(stat: os.stat_result, data: bytes) -> Dict:
+    return {
+        "version": CACHE_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "digest": _digest(data),
+    }
+
+
+def _read_cache(todo_file: Path, fingerprint: Dict) -> Optional[Dict]:
+    """Return the cached document if it was taken from exactly this file"""
+    try:
+        with open(cache_file(todo_file), "rb") as f:
+            if pickle.load(f) != fingerprint:
+                return None
+            return pickle.load(f)
+    except Exception:
+        # Missing, stale or corrupt cache: fall back to parsing the YAML
+        return None
+
+
+def _write_cache(todo_file: Path, fingerprint: Dict, document: Dict):
+    """Store a snapshot of the document, ignoring any failure to do so"""
+    try:
+        ensure_sidecar_dir(todo_file)
+        data = pickle.dumps(fingerprint, protocol=pickle.HIGHEST_PROTOCOL)
+        data += pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+        atomic_write(cache_file(todo_file), data, durable=False)
+    except Exception:
+        pass
+
+
+def _default_mode() -> int:
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write(path: Path, data: bytes, durable: bool = True) -> os.stat_result:
+    """
+    Replace `path` with `data` so that readers only ever see the old or the
+    new content, even if the process is killed halfway through.
+
+    The data goes to a temporary file in the same directory, which is
+    fsynced and then renamed over the target. Returns the stat of the new file.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        mode = _default_mode()
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+            os.chmod(tmp, mode)
+            stat = os.fstat(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    if durable and fcntl is not None:
+        # Make the rename itself durable
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return stat
+
+
+def lock_file(todo_file: Path) -> Path:
+    """Path of the file used to lock the project against concurrent writers"""
+    return sidecar_dir(todo_file) / "lock"
+
+
+# Locks held by this process: resolved todo file -> [file descriptor, depth]
+_held_locks: Dict[Path, List] = {}
+
+
+def _try_lock(fd: int, shared: bool) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, (fcntl.LOCK_SH if shared else fcntl.LOCK_EX) | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd: int):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def lock(todo_file: Path, timeout: float = DEFAULT_LOCK_TIMEOUT, shared: bool = False):
+    """
+    Hold the advisory project lock for the duration of the block.
+
+    Writers take it exclusively around their whole load -> modify -> save
+    cycle; readers may take it shared. The lock is reentrant within a
+    process (a nested acquisition keeps the mode of the outer one). Raises
+    LockTimeout if it cannot be acquired within `timeout` seconds.
+    """
+    key = todo_file.resolve()
+    held = _held_locks.get(key)
+    if held is not None:
+        held[1] += 1
+        try:
+            yield
+        finally:
+            held[1] -= 1
+        return
+
+    ensure_sidecar_dir(todo_file)
+    fd = os.open(lock_file(todo_file), os.O_RDWR | os.O_CREAT, 0o666)
+    deadline = time.monotonic() + timeout
+    while not _try_lock(fd, shared):
+        if time.monotonic() >= deadline:
+            os.close(fd)
+            raise LockTimeout(f"{todo_file} is locked by another todo process (waited {timeout:g}s)")
+        time.sleep(0.05)
+    _held_locks[key] = [fd, 1]
+    try:
+        yield
+    finally:
+        held = _held_locks[key]
+        held[1] -= 1
+        if held[1] == 0:
+            del _held_locks[key]
+            _unlock(fd)
+            os.close(fd)
+
+
+def _with_defaults(document: Optional[Dict]) -> Dict:
+    if not document:
+        return empty_document()
+    document.setdefault("project", empty_document()["project"])
+    document.setdefault("tasks", [])
+    return document
+
+
+def load_document(todo_file: Path) -> Dict:
+    """
+    Load the document from the todo file, using the snapshot when valid,
+    and replay any pending journal records on top of it.
+    """
+    if backend(todo_file) == "sqlite":
+        from todo import sqlite_store
+
+        return _with_defaults(sqlite_store.load(database_file(todo_file)))
+    try:
+        with open(todo_file, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+    except FileNotFoundError:
+        return empty_document()
+
+    fingerprint = _fingerprint(stat, data)
+    document = _read_cache(todo_file, fingerprint)
+    if document is None:
+        document = parse(data)
+        _write_cache(todo_file, fingerprint, document)
+    document = _with_defaults(document)
+
+    records = journal.pending(journal.read_records(journal.journal_file(todo_file)), fingerprint["digest"])
+    if records:
+        journal.replay(document, records)
+    return document
+
+
+def load_project(todo_file: Path) -> Dict:
+    """Load only the project settings (cheap with the SQLite backend)"""
+    if backend(todo_file) == "sqlite":
+        from todo import sqlite_store
+
+        return sqlite_store.load_project(database_file(todo_file)) or empty_document()["project"]
+    return load_document(todo_file)["project"]
+
+
+def _append_to_journal(todo_file: Path, todos: Dict, changes: Optional[List[Dict]]) -> bool:
+    """Record changes in the journal when journal mode allows it"""
+    if changes is None or not todos["project"].get("journal") or not todo_file.exists():
+        return False
+    path = journal.journal_file(todo_file)
+    try:
+        if path.stat().st_size >= journal.MAX_BYTES:
+            # Large enough: fold everything back into todo.yaml instead
+            return False
+    except FileNotFoundError:
+        pass
+    if changes:
+        journal.append_records(path, changes)
+    return True
+
+
+def save_document(todo_file: Path, todos: Dict, changes: Optional[List[Dict]] = None):
+    """
+    Save the document.
+
+    `changes` lists journal records describing what the caller modified.
+    In journal mode they are appended to the journal; otherwise, or when
+    the caller could not describe its changes, the whole document is
+    written to the todo file and the snapshot is refreshed.
+    With the SQLite backend they are applied to the affected rows only.
+    Sidecar indexes are then updated from the same records.
+    """
+    from todo import indexes
+
+    before = indexes.signature(todo_file)
+    _write_document(todo_file, todos, changes)
+    indexes.after_save(todo_file, todos, changes, before)
+
+
+def _write_document(todo_file: Path, todos: Dict, changes: Optional[List[Dict]]):
+    if backend(todo_file) == "sqlite":
+        from todo import sqlite_store
+
+        sqlite_store.save(database_file(todo_file), todos, changes)
+        return
+    if _append_to_journal(todo_file, todos, changes):
+        return
+
+    # Ensure the directory exists for the todo file
+    todo_file.parent.mkdir(parents=True, exist_ok=True)
+    data = serialize(todos).encode("utf-8")
+    journal_path = journal.journal_file(todo_file)
+    has_journal = journal_path.exists()
+    if has_journal:
+        journal.mark_compacted(journal_path, _digest(data))
+    stat = atomic_write(todo_file, data)
+    _write_cache(todo_file, _fingerprint(stat, data), todos)
+    if has_journal:
+        journal_path.unlink()
+
+
+def _discard(*paths: Path):
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _write_database(todo_file: Path, todos: Dict):
+    """Build todo.db next to the todo file, atomically replacing any existing one"""
+    from todo import sqlite_store
+
+    database = database_file(todo_file)
+    database.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=database.parent, prefix=f".{database.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        sqlite_store.save(Path(tmp), todos)
+        os.replace(tmp, database)
+    except BaseException:
+        _discard(Path(tmp))
+        raise
+
+
+def create_document(todo_file: Path, todos: Dict, backend_name: str = "yaml"):
+    """Start a new project on the given backend, replacing any existing one"""
+    if backend_name == "sqlite":
+        _write_database(todo_file, todos)
+        _discard(todo_file, journal.journal_file(todo_file), cache_file(todo_file))
+    else:
+        _discard(database_file(todo_file))
+        save_document(todo_file, todos)
+
+
+def migrate(todo_file: Path, target: str) -> Path:
+    """
+    Convert the project to another backend.
+
+    The new file is fully written before the old one is renamed to a `.bak`
+    file, so an interrupted migration leaves the project usable. Returns
+    the path of the backup.
+    """
+    todos = load_document(todo_file)
+    if target == "sqlite":
+        _write_database(todo_file, todos)
+        backup = todo_file.with_name(todo_file.name + ".bak")
+        os.replace(todo_file, backup)
+        _discard(journal.journal_file(todo_file), cache_file(todo_file))
+    else:
+        database = database_file(todo_file)
+        data = serialize(todos).encode("utf-8")
+        atomic_write(todo_file, data)
+        backup = database.with_name(database.name + ".bak")
+        os.replace(database, backup)
+    return backup
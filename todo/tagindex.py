@@ -0,0 +1,224 @@
+"""Tag postings and boolean tag queries (`list --tag`, `tag-tasks`, `tags`).
+
+Tasks are numbered in project order and every tag maps to a bitset (a
+Python int) of the tasks carrying it, so a query such as
+`infra & !blocked | urgent` is evaluated with a few integer operations
+instead of walking every task, and tag counts are bit counts. The index
+is persisted as a sidecar index (see todo.indexes) and updated from the
+change records alone, which is also what the SQLite backend provides.
+
+Query syntax, from loosest to tightest binding:
+    a | b     tasks with tag a or tag b
+    a & b     tasks with both tags
+    !a        tasks without tag a
+    (a | b)   grouping
+
+A query that is the name of an existing tag selects that tag, even if the
+name contains spaces or operators (tags such as "needs review").
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+from todo import indexes
+from todo.repository import task_key
+
+# Fields the index depends on
+FIELDS = ("tags", "completed", "status")
+
+_TOKEN = re.compile(r"\s*(?:([&|!()])|([^\s&|!()]+))")
+
+
+def _is_open(task: Dict) -> bool:
+    return not task.get("completed", False) and task.get("status", "") != "cancelled"
+
+
+def _bitset(numbers: List[int], size: int) -> int:
+    bits = bytearray(b"0" * size)
+    for number in numbers:
+        bits[size - 1 - number] = ord("1")
+    return int(bits, 2) if size else 0
+
+
+def _set_bit(state: Dict, name: str, tag, number: int, value: bool):
+    masks = state[name]
+    mask = masks.get(tag, 0)
+    mask = mask | (1 << number) if value else mask & ~(1 << number)
+    if mask:
+        masks[tag] = mask
+    else:
+        masks.pop(tag, None)
+
+
+def _update(state: Dict, number: int, values: Dict):
+    """Set the tags, completed and/or status of an indexed task"""
+    task = state["docs"][number]
+    if "tags" in values:
+        for tag in task["tags"]:
+            _set_bit(state, "tags", tag, number, False)
+        task["tags"] = tuple(dict.fromkeys(values["tags"] or []))
+        for tag in task["tags"]:
+            _set_bit(state, "tags", tag, number, True)
+    for field in ("completed", "status"):
+        if field in values:
+            task[field] = values[field]
+    state["open"] = state["open"] | (1 << number) if _is_open(task) else state["open"] & ~(1 << number)
+
+
+def _add(state: Dict, task: Dict):
+    key = task_key(task["task_id"])
+    if key in state["keys"]:
+        # Like TaskRepository, the first task with a given id wins
+        return
+    number = state["next_number"]
+    state["next_number"] += 1
+    state["keys"][key] = number
+    state["docs"][number] = {"task_id": task["task_id"], "tags": ()}
+    state["all"] |= 1 << number
+    _update(state, number, {field: task.get(field) for field in FIELDS})
+
+
+def _remove(state: Dict, key: str):
+    number = state["keys"].pop(key, None)
+    if number is None:
+        return
+    _update(state, number, {"tags": [], "completed": True})
+    state["all"] &= ~(1 << number)
+    del state["docs"][number]
+
+
+class TagIndex(indexes.SidecarIndex):
+    name = "tags"
+    version = 1
+
+    def build(self, todos: Dict) -> Dict:
+        state = {"keys": {}, "docs": {}, "tags": {}, "all": 0, "open": 0, "next_number": 0}
+        members: Dict[str, List[int]] = {"": []}
+        for task in todos["tasks"]:
+            key = task_key(task["task_id"])
+            if key in state["keys"]:
+                continue
+            number = state["next_number"]
+            state["next_number"] += 1
+            state["keys"][key] = number
+            doc = {"task_id": task["task_id"], "tags": tuple(dict.fromkeys(task.get("tags") or []))}
+            doc.update({field: task.get(field) for field in ("completed", "status")})
+            state["docs"][number] = doc
+            for tag in doc["tags"]:
+                members.setdefault(tag, []).append(number)
+            if _is_open(doc):
+                members[""].append(number)
+        # Setting bits one at a time copies the growing int each time: build each bitset at once
+        size = state["next_number"]
+        state["all"] = (1 << size) - 1
+        state["open"] = _bitset(members.pop(""), size)
+        state["tags"] = {tag: _bitset(numbers, size) for tag, numbers in members.items()}
+        return state
+
+    def apply(self, state: Dict, todos: Optional[Dict], changes: List[Dict]):
+        for record in changes:
+            op = record["op"]
+            if op == "add":
+                _add(state, record["task"])
+            elif op == "delete":
+                _remove(state, task_key(record["task_id"]))
+            elif op == "set" and any(field in FIELDS for field in record["values"]):
+                number = state["keys"].get(task_key(record["task_id"]))
+                if number is not None:
+                    _update(state, number, record["values"])
+            elif op == "append" and record["field"] == "tags":
+                number = state["keys"].get(task_key(record["task_id"]))
+                if number is not None:
+                    tags = state["docs"][number]["tags"] + tuple(record["values"])
+                    _update(state, number, {"tags": tags})
+
+
+INDEX = indexes.register(TagIndex())
+
+
+def parse_query(query: str):
+    """
+    Parse a tag query into a tree of ("tag", name), ("not", node) and
+    ("and" / "or", [nodes]) tuples. Raises ValueError on syntax errors.
+    """
+    tokens: List[Tuple[str, str]] = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        operator, tag = match.groups()
+        tokens.append(("op", operator) if operator else ("tag", tag))
+        position = match.end()
+    tokens.append(("end", ""))
+    position = 0
+
+    def peek() -> Tuple[str, str]:
+        return tokens[position]
+
+    def take() -> Tuple[str, str]:
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def expression(operator: str):
+        # "|" binds loosest, then "&"
+        operand = (lambda: expression("&")) if operator == "|" else unary
+        nodes = [operand()]
+        while peek() == ("op", operator):
+            take()
+            nodes.append(operand())
+        return nodes[0] if len(nodes) == 1 else ("or" if operator == "|" else "and", nodes)
+
+    def unary():
+        kind, value = take()
+        if (kind, value) == ("op", "!"):
+            return ("not", unary())
+        if (kind, value) == ("op", "("):
+            node = expression("|")
+            if take() != ("op", ")"):
+                raise ValueError("missing ')'")
+            return node
+        if kind == "tag":
+            return ("tag", value)
+        raise ValueError(f"expected a tag, got {value!r}" if value else "expected a tag at the end")
+
+    tree = expression("|")
+    if peek()[0] != "end":
+        raise ValueError(f"unexpected {peek()[1]!r}")
+    return tree
+
+
+def evaluate(state: Dict, tree) -> int:
+    """Bitset of the tasks matching a parsed query"""
+    kind, value = tree
+    if kind == "tag":
+        return state["tags"].get(value, 0)
+    if kind == "not":
+        return state["all"] & ~evaluate(state, value)
+    masks = [evaluate(state, node) for node in value]
+    result = masks[0]
+    for mask in masks[1:]:
+        result = result & mask if kind == "and" else result | mask
+    return result
+
+
+def task_ids(state: Dict, mask: int) -> List[str]:
+    """Ids of the tasks in a bitset, in project order"""
+    docs = state["docs"]
+    bits = bin(mask)[:1:-1]
+    return [docs[number]["task_id"] for number, bit in enumerate(bits) if bit == "1"]
+
+
+def select(state: Dict, query: str, include_closed: bool = True) -> List[str]:
+    """Ids of the tasks matching a tag query, in project order"""
+    name = query.strip()
+    tree = ("tag", name) if name in state["tags"] else parse_query(query)
+    mask = evaluate(state, tree)
+    if not include_closed:
+        mask &= state["open"]
+    return task_ids(state, mask)
+
+
+def counts(state: Dict) -> Dict[str, int]:
+    """Number of tasks carrying each tag"""
+    return {tag: bin(mask).count("1") for tag, mask in state["tags"].items()}
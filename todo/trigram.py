@@ -0,0 +1,235 @@
+"""Typo-tolerant matching backed by a character-trigram index.
+
+`todo search --fuzzy` compares the words of a query with the words of
+task titles, descriptions and notes by trigram similarity (shared
+trigrams over all distinct trigrams of both words, like PostgreSQL's
+pg_trgm). The index maps every trigram to the words containing it and
+every word to the tasks using it, so a lookup only scores the words that
+share a trigram with the query. Task ids are indexed too, which lets
+commands accept partially typed ids such as `12` or `px-12` for PX-012.
+
+The index is persisted as a sidecar index (see todo.indexes) and updated
+incrementally as tasks change.
+"""
+
+import heapq
+import re
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from todo import indexes
+from todo.repository import task_key
+from todo.search import tokenize
+
+# Indexed fields
+FIELDS = ("title", "description", "notes")
+
+# Default minimum similarity, between 0 and 1
+THRESHOLD = 0.3
+
+_DIGITS = re.compile(r"\d+")
+
+
+@lru_cache(maxsize=4096)
+def trigrams(word: str) -> FrozenSet[str]:
+    """Trigrams of a word padded like pg_trgm, so short words and word starts count"""
+    padded = f"  {word} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(first: str, second: str) -> float:
+    first_grams, second_grams = trigrams(first), trigrams(second)
+    shared = len(first_grams & second_grams)
+    return shared / (len(first_grams) + len(second_grams) - shared)
+
+
+def canonical_id(task_id) -> str:
+    """Lowercase letters and digits of an id, without leading zeros: PX-012 -> px12"""
+    text = "".join(char for char in str(task_id).lower() if char.isalnum())
+    return _DIGITS.sub(lambda match: str(int(match.group())), text)
+
+
+def _id_grams(canonical: str) -> FrozenSet[str]:
+    # Ids are short: index pairs too, and mark the ends so prefixes and suffixes have their own grams
+    marked = f"^{canonical}$"
+    return frozenset(marked[i:i + size] for size in (2, 3) for i in range(len(marked) - size + 1))
+
+
+def _number(canonical: str) -> Optional[int]:
+    match = re.search(r"(\d+)$", canonical)
+    return int(match.group(1)) if match else None
+
+
+def _words(task: Dict) -> Tuple[str, ...]:
+    words = set()
+    for field in FIELDS:
+        value = task.get(field)
+        for item in value if isinstance(value, (list, tuple)) else [value]:
+            words.update(tokenize(item))
+    return tuple(words)
+
+
+def _link(mapping: Dict, key, member):
+    if key not in mapping:
+        mapping[key] = set()
+    mapping[key].add(member)
+
+
+def _unlink(mapping: Dict, key, member) -> bool:
+    """Remove a member; True if the key has none left"""
+    members = mapping[key]
+    members.discard(member)
+    if members:
+        return False
+    del mapping[key]
+    return True
+
+
+def _add(state: Dict, task: Dict):
+    key = task_key(task["task_id"])
+    if key in state["keys"]:
+        # Like TaskRepository, the first task with a given id wins
+        return
+    number = state["next_number"]
+    state["next_number"] += 1
+    state["keys"][key] = number
+    words = _words(task)
+    canonical = canonical_id(task["task_id"])
+    state["docs"][number] = (task["task_id"], words, canonical)
+    for word in words:
+        if word not in state["words"]:
+            for gram in trigrams(word):
+                _link(state["grams"], gram, word)
+        _link(state["words"], word, number)
+    for gram in _id_grams(canonical):
+        _link(state["id_grams"], gram, number)
+    _link(state["numbers"], _number(canonical), number)
+
+
+def _remove(state: Dict, key: str):
+    number = state["keys"].pop(key, None)
+    if number is None:
+        return
+    _, words, canonical = state["docs"].pop(number)
+    for word in words:
+        if _unlink(state["words"], word, number):
+            for gram in trigrams(word):
+                _unlink(state["grams"], gram, word)
+    for gram in _id_grams(canonical):
+        _unlink(state["id_grams"], gram, number)
+    _unlink(state["numbers"], _number(canonical), number)
+
+
+class TrigramIndex(indexes.SidecarIndex):
+    name = "trigram"
+    version = 1
+
+    def build(self, todos: Dict) -> Dict:
+        state = {
+            "keys": {},
+            "docs": {},
+            "words": {},
+            "grams": {},
+            "id_grams": {},
+            "numbers": {},
+            "next_number": 0,
+        }
+        for task in todos["tasks"]:
+            _add(state, task)
+        return state
+
+    def apply(self, state: Dict, todos: Optional[Dict], changes: List[Dict]):
+        deleted, changed = indexes.changed_tasks(changes, FIELDS)
+        for key in deleted:
+            _remove(state, key)
+        if not changed:
+            return
+        if todos is None:
+            raise ValueError("the trigram index needs the document to re-index tasks")
+        for task in todos["tasks"]:
+            key = task_key(task["task_id"])
+            if key in changed:
+                changed.discard(key)
+                _remove(state, key)
+                _add(state, task)
+
+
+INDEX = indexes.register(TrigramIndex())
+
+
+def similar_words(state: Dict, word: str, threshold: float = THRESHOLD) -> Dict[str, float]:
+    """Indexed words at least `threshold` similar to a word, with their similarity"""
+    query_grams = trigrams(word)
+    shared = Counter()
+    grams = state["grams"]
+    for gram in query_grams:
+        shared.update(grams.get(gram, ()))
+    matches = {}
+    for candidate, count in shared.items():
+        score = count / (len(query_grams) + len(trigrams(candidate)) - count)
+        if score >= threshold:
+            matches[candidate] = score
+    return matches
+
+
+def fuzzy_search(
+    state: Dict, query: str, limit: Optional[int] = None, threshold: float = THRESHOLD
+) -> List[Tuple[str, float]]:
+    """
+    Return (task id, similarity) for the tasks resembling the query, best
+    first. The similarity of a task is the average, over the words of the
+    query, of the best similarity with one of its words.
+    """
+    words = list(dict.fromkeys(tokenize(query)))
+    if not words:
+        return []
+    totals: Dict[int, float] = {}
+    for word in words:
+        best: Dict[int, float] = {}
+        for candidate, score in similar_words(state, word, threshold).items():
+            for number in state["words"][candidate]:
+                if score > best.get(number, 0.0):
+                    best[number] = score
+        for number, score in best.items():
+            totals[number] = totals.get(number, 0.0) + score
+    scores = [(number, total / len(words)) for number, total in totals.items()]
+    scores = [item for item in scores if item[1] >= threshold]
+    # Ties go to the task indexed first
+    scores.sort(key=itemgetter(0))
+    if limit is not None:
+        ranked = heapq.nlargest(limit, scores, key=itemgetter(1))
+    else:
+        ranked = sorted(scores, key=itemgetter(1), reverse=True)
+    docs = state["docs"]
+    return [(docs[number][0], score) for number, score in ranked]
+
+
+def resolve_id(state: Dict, typed: str) -> List[str]:
+    """
+    Ids of the tasks a partially typed id may refer to: a number is the
+    task number (`12` for PX-012); otherwise the tasks whose id contains
+    the typed letters and digits, an exact match winning.
+    """
+    canonical = canonical_id(typed)
+    if not canonical:
+        return []
+    docs = state["docs"]
+    if canonical.isdigit():
+        numbers = state["numbers"].get(int(canonical), ())
+        return [docs[number][0] for number in sorted(numbers)]
+    # The typed text may sit anywhere in the id
+    size = min(len(canonical), 3)
+    grams = {canonical[i:i + size] for i in range(len(canonical) - size + 1)}
+    if size < 2:
+        return []
+    candidates = None
+    for gram in sorted(grams, key=lambda gram: len(state["id_grams"].get(gram, ()))):
+        members = state["id_grams"].get(gram, set())
+        candidates = set(members) if candidates is None else candidates & members
+        if not candidates:
+            return []
+    matches = sorted(number for number in candidates if canonical in docs[number][2])
+    exact = [number for number in matches if docs[number][2] == canonical]
+    return [docs[number][0] for number in exact or matches]
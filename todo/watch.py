@@ -0,0 +1,133 @@
+"""Detecting changes made to the project files by other processes.
+
+FileWatcher compares cheap stat fingerprints when asked. Notifier blocks
+until the files change: on Linux it sleeps on inotify events for their
+directory (through libc, no extra dependency) and falls back to polling
+the fingerprints elsewhere. Either way a change is only reported once the
+fingerprints differ, so unrelated events in the directory are ignored.
+"""
+
+import ctypes
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from todo import journal, storage
+
+# Seconds between fingerprint checks when inotify is not available
+POLL_INTERVAL = 1.0
+# Seconds between fingerprint checks with inotify, in case an event is missed (e.g. network file systems)
+SAFETY_INTERVAL = 5.0
+
+# inotify event mask: any write, rename, creation or removal in the directory
+_IN_MODIFY, _IN_ATTRIB, _IN_CLOSE_WRITE = 0x2, 0x4, 0x8
+_IN_MOVED_FROM, _IN_MOVED_TO, _IN_CREATE, _IN_DELETE = 0x40, 0x80, 0x100, 0x200
+_IN_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+
+
+def project_files(todo_file: Path) -> List[Path]:
+    """Every file whose content makes up the project, whatever its backend"""
+    return [todo_file, journal.journal_file(todo_file), storage.database_file(todo_file)]
+
+
+def signature(paths: Sequence[Path]) -> Tuple[Optional[Tuple[int, int, int]], ...]:
+    """
+    Cheap fingerprint of a set of files. Saves replace todo.yaml with a new
+    file (new inode) and always change the size or mtime of the journal and
+    the database, so any write shows up here.
+    """
+    result = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            result.append(None)
+            continue
+        result.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+    return tuple(result)
+
+
+class FileWatcher:
+    """Polls a set of files and reports when any of them changed"""
+
+    def __init__(self, paths: Sequence[Path]):
+        self.paths = [Path(p) for p in paths]
+        self.last = signature(self.paths)
+
+    def changed(self) -> bool:
+        """Whether the files changed since the last call (or reset())"""
+        current = signature(self.paths)
+        if current == self.last:
+            return False
+        self.last = current
+        return True
+
+    def reset(self):
+        """Accept the current state of the files, e.g. after writing them ourselves"""
+        self.last = signature(self.paths)
+
+
+def _inotify(directories: Sequence[Path]) -> Optional[int]:
+    """A non-blocking inotify descriptor watching these directories, or None if unavailable"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    for directory in directories:
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), _IN_MASK) < 0:
+            os.close(fd)
+            return None
+    return fd
+
+
+class Notifier:
+    """Waits until any of a set of files changes"""
+
+    def __init__(self, paths: Sequence[Path], interval: float = POLL_INTERVAL):
+        self.watcher = FileWatcher(paths)
+        self.interval = interval
+        self.fd = _inotify(sorted({path.parent for path in self.watcher.paths}))
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self.fd is not None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the files change (True) or `timeout` seconds pass (False)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.watcher.changed():
+            pause = self.interval if self.fd is None else SAFETY_INTERVAL
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                pause = min(pause, remaining)
+            if self.fd is None:
+                time.sleep(pause)
+            elif select.select([self.fd], [], [], pause)[0]:
+                self._drain()
+        return True
+
+    def reset(self):
+        """Accept the current state of the files"""
+        self.watcher.reset()
+
+    def _drain(self):
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None